@@ -1,31 +1,43 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.db.database import get_db
-from app.core.security import verify_token
+from app.db.database import async_session
+from app.core.principal_cache import principal_cache
+from app.core.security import decode_token
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-):
+async def load_principal(token: str):
+    """
+    JWT 를 검증하고 사용자를 조회합니다. 캐시에 없을 때만 호출되므로 DB 세션도 이때만 엽니다.
+
+    Returns:
+        tuple: (클레임, User) 또는 None (토큰이 잘못되었거나 사용자가 없는 경우)
+    """
+    claims = decode_token(token)
+    if claims is None:
+        return None
+
+    async with async_session() as session:
+        result = await session.execute(select(User).where(User.email == claims["sub"]))
+        user = result.scalar_one_or_none()
+        if user is None:
+            return None
+        # 세션이 닫힌 뒤에도 캐시에서 읽을 수 있도록 분리 (expire_on_commit=False 로 값은 로드된 상태)
+        session.expunge(user)
+    return claims, user
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    email = verify_token(token)
-    if email is None:
-        raise credentials_exception
-        
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
-    
-    if user is None:
+    # 같은 토큰의 요청은 캐시된 사용자를 사용 (Postgres 커넥션을 쓰지 않음)
+    principal = await principal_cache.get_or_load(token, load_principal)
+    if principal is None:
         raise credentials_exception
         
-    return user
\ No newline at end of file
+    return principal[1]
@@ -1,11 +1,17 @@
 # 캘린더 관련 API 모음
 # calender.py
 from datetime import datetime, timedelta
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request, Response
 from pydantic import BaseModel
 import pytz
 from app.api.v1.endpoints import login, users, google, calendar 
 from app.api.deps import get_current_user
+from app.core.google_auth import GOOGLE_TOKEN_URL, access_token_cache, get_client_config
+from app.core.http_client import shared_http_client
+from app.core.logging_config import log_payload
+from app.core.security import verify_channel_token
+from app.core.sync_jobs import SyncJob, sync_jobs
+from app.core.sync_scheduler import load_refresh_token
 from app.db.dynamo import *
 from app.models.user import User
 import httpx
@@ -13,68 +19,60 @@ import json
 import logging
 import traceback
 
-# calendar.py 전용 로거 설정
+# calendar.py 전용 로거 (출력은 app.core.logging_config 의 큐 핸들러가 담당)
 calendar_logger = logging.getLogger('calendar')
 calendar_logger.setLevel(logging.INFO)
 
-# 파일 핸들러 추가
-file_handler = logging.FileHandler('calendar.log')
-file_handler.setLevel(logging.INFO)
-
-# 스트림 핸들러 추가 
-stream_handler = logging.StreamHandler()
-stream_handler.setLevel(logging.INFO)
-
-# 포맷터 설정 - calendar.py용 특별 포맷
-formatter = logging.Formatter('[캘린더 API] %(asctime)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(formatter)
-stream_handler.setFormatter(formatter)
-
-calendar_logger.addHandler(file_handler)
-calendar_logger.addHandler(stream_handler)
-
 # API 라우터 설정
 
 router = APIRouter()
 
-async def refresh_google_token(refresh_token: str):
-   calendar_logger.info("구글 토큰 갱신 프로세스 시작")
+async def request_google_token(refresh_token: str) -> dict:
+   """
+   refresh token으로 구글에 새 액세스 토큰을 요청합니다.
+
+   Returns:
+       dict: 토큰 응답 (access_token, expires_in 등)
+   """
+   client_config = get_client_config()
    
-   try:
-       # client secrets 파일 읽기
-       calendar_logger.info("클라이언트 설정 파일 읽기 시작")
-       with open("client_secret_639048076528-0mqbo91cf5t0fq5604u0tblqnaka8thp.apps.googleusercontent.com.json", "r") as f:
-           client_config = json.load(f)["web"]
-       calendar_logger.info("클라이언트 설정 파일 읽기 완료")
-
-       # 요청 데이터 준비
-       token_data = {
-           "client_id": client_config["client_id"],
-           "client_secret": client_config["client_secret"],
-           "refresh_token": refresh_token,
-           "grant_type": "refresh_token"
-       }
-       calendar_logger.info("토큰 갱신 요청 데이터 준비 완료")
-
-       async with httpx.AsyncClient() as client:
-           calendar_logger.info("구글 토큰 갱신 요청 시작")
-           response = await client.post("https://oauth2.googleapis.com/token", data=token_data)
-           response.raise_for_status()
-           
-           token_info = response.json()
-           calendar_logger.info("구글 토큰 갱신 응답 수신 완료")
+   # 요청 데이터 준비
+   token_data = {
+       "client_id": client_config["client_id"],
+       "client_secret": client_config["client_secret"],
+       "refresh_token": refresh_token,
+       "grant_type": "refresh_token"
+   }
+
+   async with shared_http_client() as client:
+       calendar_logger.info("구글 토큰 갱신 요청 시작")
+       response = await client.post(GOOGLE_TOKEN_URL, data=token_data)
+       response.raise_for_status()
+       
+       token_info = response.json()
+       calendar_logger.info("구글 토큰 갱신 응답 수신 완료")
+       
+       if "access_token" not in token_info:
+           calendar_logger.error("응답에 access_token이 없음")
+           raise HTTPException(
+               status_code=400,
+               detail="액세스 토큰 갱신 실패"
+           )
            
-           if "access_token" not in token_info:
-               calendar_logger.error("응답에 access_token이 없음")
-               raise HTTPException(
-                   status_code=400,
-                   detail="액세스 토큰 갱신 실패"
-               )
-               
-           calendar_logger.info("새로운 액세스 토큰 발급 성공")
-           return token_info["access_token"]
+       calendar_logger.info("새로운 액세스 토큰 발급 성공")
+       return token_info
+
+async def refresh_google_token(refresh_token: str):
+   """
+   사용자의 구글 액세스 토큰을 반환합니다.
+   이전에 받은 토큰이 아직 유효하면 캐시에서 돌려주고, 만료가 가까우면 갱신합니다.
+   같은 사용자의 동시 요청은 하나의 갱신 요청을 함께 기다립니다.
+   """
+   try:
+       return await access_token_cache.get(refresh_token, request_google_token)
            
    except httpx.HTTPError as e:
+       access_token_cache.invalidate(refresh_token)
        calendar_logger.error(f"구글 토큰 갱신 중 HTTP 에러 발생: {str(e)}")
        calendar_logger.error(f"상세 에러: {traceback.format_exc()}")
        raise HTTPException(
@@ -82,6 +80,7 @@ async def refresh_google_token(refresh_token: str):
            detail="구글 액세스 토큰 갱신 실패"
        )
    except Exception as e:
+       access_token_cache.invalidate(refresh_token)
        calendar_logger.error(f"토큰 갱신 중 예상치 못한 에러 발생: {str(e)}")
        calendar_logger.error(f"상세 에러: {traceback.format_exc()}")
        raise HTTPException(
@@ -89,62 +88,208 @@ async def refresh_google_token(refresh_token: str):
            detail="토큰 갱신 중 내부 서버 오류 발생"
        )
 
-@router.post("/sync-calendar")
-async def sync_calendar(current_user: User = Depends(get_current_user)):
-   calendar_logger.info("캘린더 동기화 시작")
-   try:
-       calendar_logger.info(f"사용자 {current_user.email}의 캘린더 동기화 요청")
-       
-       # refresh token으로 새 access token 획득
-       calendar_logger.info("새로운 액세스 토큰 요청")
-       new_access_token = await refresh_google_token(current_user.refresh_token)
-       calendar_logger.info("새로운 액세스 토큰 발급 완료")
-       
-       # 캘린더 동기화
-       calendar_logger.info("DynamoDB에 캘린더 데이터 동기화 시작")
-       await put_calendar_list(new_access_token)
-       calendar_logger.info("캘린더 데이터 동기화 완료")
-       
-       return {
-           "success": True,
-           "message": "캘린더 동기화가 성공적으로 완료되었습니다"
-       }
-   except Exception as e:
-       calendar_logger.error(f"캘린더 동기화 중 오류 발생: {str(e)}")
-       calendar_logger.error(f"상세 에러 정보: {traceback.format_exc()}")
-       raise HTTPException(
-           status_code=500, 
-           detail=f"캘린더 동기화 실패: {str(e)}"
-       )
+async def run_with_google_token(refresh_token: str, work):
+   """
+   사용자의 액세스 토큰으로 work(access_token)를 실행합니다.
+   캐시된 토큰을 구글이 거부(401)하면 (만료 전에 취소된 경우 등) 캐시에서 버리고 새로 발급받은 토큰으로 한 번 다시 시도합니다.
 
-@router.post("/sync-events")
-async def sync_events(current_user: User = Depends(get_current_user)):
-    calendar_logger.info("이벤트 동기화 시작")
-    try:
-        calendar_logger.info(f"사용자 {current_user.email}의 이벤트 동기화 요청")
-        
-        # refresh token으로 새 access token 획득
-        calendar_logger.info("새로운 액세스 토큰 요청")
-        new_access_token = await refresh_google_token(current_user.refresh_token)
-        calendar_logger.info("새로운 액세스 토큰 발급 완료")
+   Args:
+       refresh_token (str): 사용자의 구글 refresh token
+       work: 액세스 토큰을 받아 실행하는 코루틴 함수
+
+   Returns:
+       work 의 반환값
+   """
+   access_token = await refresh_google_token(refresh_token)
+   try:
+       return await work(access_token)
+   except google.GoogleAuthError:
+       calendar_logger.info("구글이 액세스 토큰을 거부하여 새 토큰으로 다시 시도합니다")
+       access_token_cache.invalidate(refresh_token)
+       return await work(await refresh_google_token(refresh_token))
+
+### 동기화 작업
+# 동기화는 요청 안에서 하지 않고 작업 큐(app.core.sync_jobs)에 넣은 뒤 작업 ID를 돌려줍니다.
+# 진행 상황은 GET /sync-jobs/{job_id} 로 조회합니다.
+# 저장 단계에서 발생한 예외와 모든 캘린더가 실패한 동기화는 작업 실패(FAILED)로 기록되어
+# 주기 동기화(app.core.sync_scheduler)가 다음 시도를 늦춥니다.
+
+def check_sync_stats(sync_stats: dict):
+    """동기화할 캘린더가 있었는데 하나도 반영하지 못했으면 작업을 실패로 기록하도록 예외를 발생시킵니다."""
+    if sync_stats['failed_calendars'] and not sync_stats['calendars']:
+        raise RuntimeError(f"모든 캘린더 동기화 실패: {sync_stats['failed_calendars']}")
+
+async def run_calendar_sync_job(job: SyncJob) -> dict:
+    calendar_logger.info("사용자 %s의 캘린더 데이터 동기화 시작", job.user_email)
+    # refresh token으로 얻은 access token으로 동기화 (토큰이 거부되면 새 토큰으로 한 번 더)
+    calendars = await run_with_google_token(job.credentials['refresh_token'], put_calendar_list)
+    job.progress['calendars_total'] = job.progress['calendars_done'] = calendars
+    calendar_logger.info("캘린더 데이터 동기화 완료")
+    
+    return {"calendars": calendars}
+
+async def run_events_sync_job(job: SyncJob) -> dict:
+    async def sync(access_token: str) -> dict:
+        calendar_logger.info("사용자 %s의 이벤트 데이터 동기화 시작", job.user_email)
+        sync_stats = await store_calendar_events(
+            job.user_email, access_token,
+            full_sync=job.options.get('full_sync', False),
+            progress=job.progress
+        )
+        calendar_logger.info("이벤트 데이터 동기화 완료: %s", sync_stats)
+        check_sync_stats(sync_stats)
         
-        # 이벤트 동기화 (기존에 만든 함수 사용)
-        calendar_logger.info("DynamoDB에 이벤트 데이터 동기화 시작")
-        await store_calendar_events(current_user.email, new_access_token)
-        calendar_logger.info("이벤트 데이터 동기화 완료")
+        # 주기 동기화 때마다 만료가 가까운 푸시 알림 채널 갱신
+        await renew_watch_channels(job.user_email, access_token)
+        return sync_stats
+    
+    return await run_with_google_token(job.credentials['refresh_token'], sync)
+
+async def run_calendar_events_sync_job(job: SyncJob) -> dict:
+    # 푸시 알림으로 시작된 작업은 사용자 요청이 없으므로 refresh token을 DB에서 읽음
+    refresh_token = job.credentials.get('refresh_token') or await load_refresh_token(job.user_email)
+    if not refresh_token:
+        raise ValueError(f"사용자 {job.user_email}의 refresh token이 없습니다")
+    calendar_ids = job.options.get('calendar_ids', [])
+    
+    async def sync(access_token: str) -> dict:
+        calendar_logger.info("사용자 %s의 캘린더 %s 이벤트 동기화 시작", job.user_email, calendar_ids)
+        sync_stats = await sync_calendar_events(job.user_email, access_token, calendar_ids, progress=job.progress)
+        calendar_logger.info("캘린더 이벤트 동기화 완료: %s", sync_stats)
+        check_sync_stats(sync_stats)
         
-        return {
-            "success": True,
-            "message": "이벤트 동기화가 성공적으로 완료되었습니다"
-        }
-    except Exception as e:
-        calendar_logger.error(f"이벤트 동기화 중 오류 발생: {str(e)}")
-        calendar_logger.error(f"상세 에러 정보: {traceback.format_exc()}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"이벤트 동기화 실패: {str(e)}"
+        # 목록에서 빠진 캘린더의 알림이면 채널 정리
+        if sync_stats['unknown_calendars']:
+            await renew_watch_channels(job.user_email, access_token)
+        return sync_stats
+    
+    return await run_with_google_token(refresh_token, sync)
+
+sync_jobs.register('calendar', run_calendar_sync_job)
+sync_jobs.register('events', run_events_sync_job)
+sync_jobs.register('calendar_events', run_calendar_events_sync_job)
+
+@router.post("/sync-calendar", status_code=202)
+async def sync_calendar(current_user: User = Depends(get_current_user)):
+   """
+   캘린더 리스트 동기화 작업을 등록합니다. 같은 사용자의 작업이 대기 중이면 그 작업 ID를 돌려줍니다.
+   """
+   calendar_logger.info("사용자 %s의 캘린더 동기화 요청", current_user.email)
+   job = await sync_jobs.submit(
+       'calendar', current_user.email,
+       credentials={'refresh_token': current_user.refresh_token}
+   )
+   
+   return {
+       "success": True,
+       "message": "캘린더 동기화 작업이 등록되었습니다",
+       "job_id": job.id,
+       "status": job.status
+   }
+
+@router.post("/sync-events", status_code=202)
+async def sync_events(full_sync: bool = False, current_user: User = Depends(get_current_user)):
+    """
+    구글 캘린더 이벤트 동기화 작업을 등록합니다.
+    기본은 syncToken 기반 증분 동기화이며, full_sync=true이면 전체를 다시 저장합니다.
+    같은 사용자의 작업이 대기 중이면 그 작업 ID를 돌려줍니다 (full_sync 요청은 대기 중인 작업에 합쳐짐).
+    """
+    calendar_logger.info("사용자 %s의 이벤트 동기화 요청", current_user.email)
+    job = await sync_jobs.submit(
+        'events', current_user.email,
+        options={'full_sync': full_sync},
+        credentials={'refresh_token': current_user.refresh_token}
+    )
+    
+    return {
+        "success": True,
+        "message": "이벤트 동기화 작업이 등록되었습니다",
+        "job_id": job.id,
+        "status": job.status
+    }
+
+@router.post("/webhook")
+async def google_calendar_webhook(request: Request, background_tasks: BackgroundTasks):
+    """
+    구글 캘린더 푸시 알림(events.watch)을 받습니다.
+    채널 토큰을 검증한 뒤 바뀐 캘린더의 증분 동기화 작업 등록은 응답 후 백그라운드로 넘기고 바로 200을 돌려줍니다.
+    (구글은 응답이 늦거나 실패하면 알림을 지수 백오프로 다시 보냄)
+    """
+    channel_id = request.headers.get('X-Goog-Channel-ID')
+    calendar_id = google.calendar_id_from_resource_uri(request.headers.get('X-Goog-Resource-URI'))
+    user_email = None
+    if channel_id and calendar_id:
+        user_email = verify_channel_token(request.headers.get('X-Goog-Channel-Token'), channel_id, calendar_id)
+    if user_email is None:
+        calendar_logger.error("검증되지 않은 푸시 알림 (채널 %s)", channel_id)
+        raise HTTPException(status_code=403, detail="잘못된 채널 토큰입니다")
+    
+    # 'sync' 는 채널 등록 직후 한 번 오는 확인 알림
+    if request.headers.get('X-Goog-Resource-State') != 'sync':
+        background_tasks.add_task(
+            sync_jobs.submit, 'calendar_events', user_email, options={'calendar_ids': [calendar_id]}
         )
+    return Response(status_code=200)
+
+@router.get("/sync-jobs/{job_id}")
+async def get_sync_job(job_id: str, current_user: User = Depends(get_current_user)):
+    """
+    동기화 작업의 상태(queued, running, succeeded, failed)와 진행 상황을 조회합니다.
+    """
+    job = await sync_jobs.get(job_id)
+    # 다른 사용자의 작업은 없는 작업과 같게 응답
+    if job is None or job.user_email != current_user.email:
+        raise HTTPException(status_code=404, detail="동기화 작업을 찾을 수 없습니다")
+    
+    return {"success": True, "job": job.to_dict()}
     
+### 대시보드 조건부 요청 (ETag / If-None-Match)
+# 대시보드 데이터는 동기화가 끝나야 바뀌므로 응답에 동기화 세대와 기간 키로 만든 ETag 를 붙이고,
+# 같은 ETag 로 다시 요청하면 DynamoDB 를 읽지 않고 304 를 돌려줍니다.
+# 다른 프로세스에서 일어난 동기화는 이 프로세스의 세대에 반영되지 않으므로, 이벤트 캐시에
+# 현재 세대 항목이 남아 있을 때(TTL 이내)만 304 로 응답합니다.
+# 각 엔드포인트는 DashboardETag 를 주입받아 응답 본문을 만드는 함수를 respond() 에 넘깁니다.
+
+def etag_headers(etag: str) -> dict:
+    # 사용자별 응답이므로 공유 캐시에 저장하지 않고, 매번 재검증하도록 설정
+    return {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더 값이 etag 와 일치하는지 (약한 비교)"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(',')]
+    return '*' in candidates or etag in [value[2:] if value.startswith('W/') else value for value in candidates]
+
+class DashboardETag:
+    """
+    대시보드 엔드포인트의 조건부 요청 처리 (Depends() 로 주입)
+    """
+
+    def __init__(self, request: Request, response: Response, current_user: User = Depends(get_current_user)):
+        self.request = request
+        self.response = response
+        self.user_email = current_user.email
+
+    async def respond(self, widgets: list, variant: tuple, load):
+        """
+        같은 ETag 로 다시 요청했으면 load 를 호출하지 않고 304 를 반환하고,
+        아니면 load() 결과를 반환하면서 응답에 ETag 헤더를 붙입니다 (load 가 예외를 발생시키면 헤더 없이 전파).
+
+        Args:
+            widgets (list): 응답에 쓰이는 DASHBOARD_WIDGETS 위젯 이름 목록
+            variant (tuple): 응답을 바꾸는 그 밖의 값 (엔드포인트 이름, 요청 파라미터 등)
+            load: 응답 본문을 만드는 코루틴 함수
+        """
+        etag = dashboard_etag(self.user_email, widgets, *variant)
+        if etag_matches(self.request.headers.get('if-none-match'), etag) and event_cache.contains(self.user_email):
+            return Response(status_code=304, headers=etag_headers(etag))
+
+        body = await load()
+        self.response.headers.update(etag_headers(etag))
+        return body
+
+
 ### 캘린더 API
 # 1. 캘린더 데이터 요청
 # 2. 전처리
@@ -171,76 +316,91 @@ async def get_dashboard_data(code):
     # 향후 프론트에서 이 데이터 받아서 알아서 잘 각 시각화 component에 잘 매핑
 
 #캘린더 별 활동 시간 API
+@router.get("/dashboard-spendingTime")
 @router.post("/dashboard-spendingTime")
-async def get_spending_time_of_sum(current_user: User = Depends(get_current_user)):
+async def get_spending_time_of_sum(etag: DashboardETag = Depends()):
 
-    duration_by_calendar = await sum_time_by_calendar(current_user.email)
-    
-    calendar_logger.info(f"캘린더별 활동 시간 확인 완료:{duration_by_calendar}")
+    async def load():
+        duration_by_calendar = await get_dashboard_widget(etag.user_email, 'spending_time')
+        
+        log_payload(calendar_logger, "캘린더별 활동 시간 확인 완료", duration_by_calendar)
 
-    return {"success": True, "spendingTime": duration_by_calendar}
+        return {"success": True, "spendingTime": duration_by_calendar}
 
-async def sum_time_by_calendar(user):
-    
-    user_duration_time = {}
-    
-    # 사용자 캘린더 리스트 가져오기 
-    user_cal_list = await get_calendar_list_by_user(user)
-    
-    calendar_logger.info(f"사용자 캘린더 리스트 가져오기 성공: {user_cal_list}")
-    
-    for calendar in user_cal_list:
-        summary = calendar['summary']
-        cal_id = calendar['id']
-        user_duration_time[summary] = await get_user_event(user, cal_id)
-    
-    return user_duration_time
+    return await etag.respond(['spending_time'], ('spendingTime',), load)
 
 #요일별 일정 개수API
+@router.get('/dashboard-by-day-events')
 @router.post('/dashboard-by-day-events')
-async def user_by_day_event(current_user: User = Depends(get_current_user)):
-    
-    user_day_event_count = await find_one_week_event(current_user.email)
-    
-    calendar_logger.info(f'사용자 요일별 일정 개수:{user_day_event_count}')
+async def user_by_day_event(etag: DashboardETag = Depends()):
     
-    return {"success": True, "user_day_event_count": user_day_event_count}
+    async def load():
+        user_day_event_count = await get_dashboard_widget(etag.user_email, 'day_event_count')
+        
+        log_payload(calendar_logger, "사용자 요일별 일정 개수", user_day_event_count)
+        
+        return {"success": True, "user_day_event_count": user_day_event_count}
+
+    return await etag.respond(['day_event_count'], ('by-day-events',), load)
+
+# 다가오는 일정 API 에서 한 번에 요청할 수 있는 최대 개수
+UPCOMING_MAX_K = 50
 
 #upcomming scheduleAPI
+@router.get('/dashboard-upcomming-schedule')
 @router.post('/dashboard-upcomming-schedule')
-async def user_upcomming_events(current_user: User = Depends(get_current_user)):
-    
-    user_upcomming_evnets_list = await upcomming_event_dict(current_user.email)
-    
-    calendar_logger.info(f"곧 다가오는 스케줄: {user_upcomming_evnets_list}")
+async def user_upcomming_events(etag: DashboardETag = Depends(), k: int = UPCOMING_DEFAULT_K, horizon: int = None):
+    """
+    지금 이후 가장 먼저 시작하는 일정을 반환합니다.
+
+    Args:
+        k (int, optional): 반환할 일정 수 (기본값 5, 최대 50)
+        horizon (int, optional): 지금부터 며칠 안에 시작하는 일정만 볼지 (기본값: 제한 없음)
+    """
+    if not 1 <= k <= UPCOMING_MAX_K:
+        raise HTTPException(status_code=400, detail=f"k는 1 이상 {UPCOMING_MAX_K} 이하여야 합니다")
+    if horizon is not None and horizon < 1:
+        raise HTTPException(status_code=400, detail="horizon은 1일 이상이어야 합니다")
     
-    return {"success": True, "upcommingList": user_upcomming_evnets_list}
+    async def load():
+        user_upcomming_evnets_list = await upcomming_event_dict(
+            etag.user_email,
+            k,
+            timedelta(days=horizon) if horizon is not None else None
+        )
+        
+        log_payload(calendar_logger, "곧 다가오는 스케줄", user_upcomming_evnets_list)
+        
+        return {"success": True, "upcommingList": user_upcomming_evnets_list}
+
+    return await etag.respond(['upcoming'], ('upcomming-schedule', k, horizon), load)
     
 
 # 갓생지수 API
+@router.get("/dashboard-godLifeBar")
 @router.post("/dashboard-godLifeBar")
-async def get_godLife_bar(current_user: User = Depends(get_current_user)):
-    calendar_logger.info("갓생지수 데이터 로딩 시작...")
-    
-    # 활동 데이터 가져오기
-    processed_data = await get_weekly_activity(current_user)
-    if not processed_data.get("success"):
-        calendar_logger.error("갓생지수를 가져오는데 실패했습니다.")
-        return {"success": False, "message": "Failed to fetch godLife data"}
-
-    calendar_logger.info("갓생지수 데이터 로딩 완료...")
-
-    # 갓생지수 계산    
-    godLifeidx = godLifeIndex(processed_data.get("data", []))
-    calendar_logger.info(f"갓생지수: {godLifeidx}")
-    if godLifeidx < 4:
-        calendar_logger.info("갓생이 아닙니다.")
-        return {"success": True, "godLifeBar": 0}
-
-    calendar_logger.info("갓생지수 데이터 전송 완료...")
-    
-    # 갓생지수 퍼센트 반환
-    return {"success": True, "godLifeBar": godLifeidx}
+async def get_godLife_bar(etag: DashboardETag = Depends()):
+    async def load():
+        calendar_logger.info("갓생지수 데이터 로딩 시작...")
+        
+        # 활동 데이터 가져오기
+        weekly_data = await load_weekly_activity(etag.user_email)
+
+        calendar_logger.info("갓생지수 데이터 로딩 완료...")
+
+        # 갓생지수 계산    
+        godLifeidx = godLifeIndex(weekly_data)
+        calendar_logger.info("갓생지수: %s", godLifeidx)
+        if godLifeidx < 4:
+            calendar_logger.info("갓생이 아닙니다.")
+            return {"success": True, "godLifeBar": 0}
+
+        calendar_logger.info("갓생지수 데이터 전송 완료...")
+        
+        # 갓생지수 퍼센트 반환
+        return {"success": True, "godLifeBar": godLifeidx}
+
+    return await etag.respond(['weekly_activity'], ('godLifeBar',), load)
 
 
 ## 갓생지수 판정 함수
@@ -249,7 +409,7 @@ def godLifeIndex(weekly_data: dict) -> int:
     일주일 중 하루의 총 이벤트 시간이 6시간 이상인 요일 횟수를 반환, 4번 이상일 경우 갓생
     
     Args:
-        weekly_data (dict): process_weekly_activity_data 함수의 결과 데이터.
+        weekly_data (dict): summarize_weekly_activity 함수의 결과 데이터.
     
     Returns:
         bool: 조건을 만족하면 True, 아니면 False.
@@ -265,11 +425,12 @@ def godLifeIndex(weekly_data: dict) -> int:
         
         return days_with_long_events
     except Exception as e:
-        print(f"Error processing workload: {e}")
+        calendar_logger.error("Error processing workload: %s", e)
         return False
 
+@router.get("/dashboard-category-dist")
 @router.post("/dashboard-category-dist")
-async def get_category(current_user: User = Depends(get_current_user)):
+async def get_category(etag: DashboardETag = Depends()):
     """
     내 캘린더의 이벤트 수가 가장 많은 순으로 상위 6개의 캘린더 나열
 
@@ -288,64 +449,23 @@ async def get_category(current_user: User = Depends(get_current_user)):
 
     """
     
-    try:
+    async def load():
         calendar_logger.info("카테고리 분포 데이터 로딩 시작...")
 
-        # 1. 캘린더 리스트 가져오기
-        cal_list = await get_calendar_list_by_user(current_user.email)
-        calendar_logger.info(f"cal_list 구조: {cal_list}")
-
-        # 캘린더 리스트에서 id와 summary 추출하여 calendar_ids 딕셔너리 생성
-        calendar_ids = {item['id']: item['summary'] for item in cal_list}
-        # 각 calendar_id는 처음에 0으로 카운트를 설정
-        event_count = {item['id']: 0 for item in cal_list}
-        calendar_logger.info(f"`cal_list`의 ID와 summary 추출 결과: {calendar_ids}")
-
-        # 2. 이벤트 데이터 가져오기
-        processed_data = await get_weekly_activity_data_per_user(current_user.email)
-        events = processed_data.get('events', [])
-        calendar_logger.info(f"주간 활동 데이터: {len(events)}개의 이벤트")
-
-        if not events:
-            calendar_logger.info("주간 활동 데이터가 없습니다.")
-
-        # 3. 이벤트 데이터에서 캘린더별로 개수 세기
-        for event in events:
-            try:
-                event_id = event['organizer']['email']  # event에서 직접 email 접근
-                if event_id in event_count:
-                    event_count[event_id] += 1
-                else:
-                    # 존재하지 않는 이벤트가 있을 경우, 추가하여 카운트 시작
-                    event_count[event_id] = 1
-            except KeyError as e:
-                calendar_logger.error(f"이벤트 처리 중 KeyError 발생: {str(e)}")
-                continue
-            except Exception as e:
-                calendar_logger.error(f"이벤트 처리 중 예기치 않은 오류 발생: {str(e)}")
-                continue
-
-        # 4. 데이터 정리 (상위 6개 추출)
-        sorted_categories = sorted(event_count.items(), key=lambda x: x[1], reverse=True)[:6]
-
-        # 5. 카테고리 분포 데이터 구성 (cal_id, summary, entry_number 포함)
-        category_distribution = [
-            {
-                "category": cal_id,
-                "summary": calendar_ids.get(cal_id, ""),  # summary가 없을 경우 '' (빈칸)으로 처리
-                "entry_number": count
-            }
-            for cal_id, count in sorted_categories
-        ]
+        # 동기화 때 미리 계산해 둔 집계 조회 (없으면 캘린더 리스트와 이번주 이벤트로 계산)
+        category_distribution = await get_dashboard_widget(etag.user_email, 'categories')
 
-        calendar_logger.info(f"카테고리 분포 데이터: {json.dumps(category_distribution, ensure_ascii=False)}")
+        log_payload(calendar_logger, "카테고리 분포 데이터", category_distribution)
 
-        # 6. 최종 데이터 반환
+        # 최종 데이터 반환
         return {
             "success": True,
             "categories": category_distribution
         }
 
+    try:
+        return await etag.respond(['categories'], ('category-dist',), load)
+
     except Exception as e:
         calendar_logger.error(f"카테고리 분포 데이터 로딩 중 예기치 않은 오류 발생: {str(e)}")
         return {
@@ -354,14 +474,17 @@ async def get_category(current_user: User = Depends(get_current_user)):
         }
 
 
+@router.get("/dashboard-calendar-schedule")
 @router.post("/dashboard-calendar-schedule")
-async def get_calendar_schedule(current_user: User = Depends(get_current_user)):
-    try:
+async def get_calendar_schedule(etag: DashboardETag = Depends()):
+    async def load():
         calendar_logger.info("월간 일정 데이터 로딩 시작...")
-        calendar_logger.info(f"사용자 {current_user.email}의 월간 활동 데이터 요청")
+        calendar_logger.info("사용자 %s의 월간 활동 데이터 요청", etag.user_email)
 
-        data = await get_monthly_activity_data_per_user(current_user.email)
-        return data
+        return await get_dashboard_widget(etag.user_email, 'calendar_schedule')
+
+    try:
+        return await etag.respond(['calendar_schedule'], ('calendar-schedule',), load)
 
     except Exception as e:
         calendar_logger.error(f"월간 일정 데이터 로딩 중 예기치 않은 오류 발생: {str(e)}")
@@ -372,89 +495,18 @@ async def get_calendar_schedule(current_user: User = Depends(get_current_user)):
 
 
 
-#### 켈린더 데이터 전처리 함수
-async def process_weekly_activity_data(data: dict, user_email: str) -> dict:  # user_email 파라미터 추가
-    calendar_logger.info("주간 이벤트 데이터 전처리 시작")
-    
-    try:
-        events = data.get('events', [])
-        calendar_logger.info(f"총 이벤트 수: {len(events)}")
-        
-        # 현재 로그인한 사용자의 일정만 필터링
-        current_user_events = [
-            event for event in events 
-            if event.get('creator', {}).get('email') == user_email
-        ]
-        calendar_logger.info(f"현재 사용자의 이벤트 수: {len(current_user_events)}")
-        
-        # 요일별 시작/종료 시간을 저장할 딕셔너리
-        daily_times = {
-            0: {'start': 24, 'end': 0},  # 월요일
-            1: {'start': 24, 'end': 0},  # 화요일
-            2: {'start': 24, 'end': 0},  # 수요일
-            3: {'start': 24, 'end': 0},  # 목요일
-            4: {'start': 24, 'end': 0},  # 금요일
-            5: {'start': 24, 'end': 0},  # 토요일
-            6: {'start': 24, 'end': 0}   # 일요일
-        }
-
-        kst = pytz.timezone('Asia/Seoul')
-        
-        for event in current_user_events:
-            try:
-                start = event['start'].get('dateTime')
-                end = event['end'].get('dateTime')
-                
-                if not start or not end:
-                    continue
-                
-                # 시간 변환 및 KST 적용
-                start_dt = datetime.fromisoformat(start.replace('Z', '+00:00')).astimezone(kst)
-                end_dt = datetime.fromisoformat(end.replace('Z', '+00:00')).astimezone(kst)
-                
-                weekday = start_dt.weekday()
-                start_time = start_dt.hour + start_dt.minute / 60
-                end_time = end_dt.hour + end_dt.minute / 60
-                
-                # 해당 요일의 최소 시작 시간과 최대 종료 시간 업데이트
-                daily_times[weekday]['start'] = min(daily_times[weekday]['start'], start_time)
-                daily_times[weekday]['end'] = max(daily_times[weekday]['end'], end_time)
-                
-            except Exception as e:
-                calendar_logger.error(f"이벤트 처리 중 오류 발생: {e}")
-                continue
-        
-        # 최종 데이터 형식으로 변환
-        this_week_events = [
-            {
-                'day': day,
-                'startTime': times['start'] if times['start'] < 24 else 0,
-                'endTime': times['end'] if times['end'] > 0 else 0
-            }
-            for day, times in daily_times.items()
-            if times['start'] < 24 or times['end'] > 0  # 이벤트가 있는 날만 포함
-        ]
-        
-        calendar_logger.info(f"최종 처리 결과: {this_week_events}")
-        return {'this_week': this_week_events}
-        
-    except Exception as e:
-        calendar_logger.error(f"데이터 전처리 중 오류 발생: {str(e)}")
-        calendar_logger.error(f"상세 오류 내용: {traceback.format_exc()}")
-        return {'this_week': []}
+async def load_weekly_activity(user_email: str) -> dict:
+    """
+    사용자가 만든 이번주 일정의 요일별 첫 시작/마지막 종료 시각을 조회합니다 (/weekly-activity, /dashboard-godLifeBar 공용).
 
-@router.get("/weekly-activity")
-async def get_weekly_activity(current_user: User = Depends(get_current_user)):
-    calendar_logger.info(f"사용자 {current_user.email}의 주간 활동 데이터 요청")
+    Returns:
+        dict: {'this_week': [{'day', 'startTime', 'endTime'}, ...]}
+    """
+    calendar_logger.info("사용자 %s의 주간 활동 데이터 요청", user_email)
     try:
-        raw_data = await get_weekly_activity_data(current_user.email)
-        processed_data = await process_weekly_activity_data(raw_data, current_user.email)
-        calendar_logger.info(f"전처리된 주간 활동 데이터: {processed_data}")  # logger를 calendar_logger로 변경
-        
-        return {
-            "success": True,
-            "data": processed_data
-        }
+        processed_data = await get_dashboard_widget(user_email, 'weekly_activity')
+        log_payload(calendar_logger, "전처리된 주간 활동 데이터", processed_data)
+        return processed_data
         
     except Exception as e:
         calendar_logger.error(f"주간 활동 데이터 조회 중 오류 발생: {str(e)}")
@@ -463,5 +515,75 @@ async def get_weekly_activity(current_user: User = Depends(get_current_user)):
             status_code=500,
             detail="주간 활동 데이터 조회 실패"
         )
+
+@router.get("/weekly-activity")
+async def get_weekly_activity(etag: DashboardETag = Depends()):
+    async def load():
+        return {
+            "success": True,
+            "data": await load_weekly_activity(etag.user_email)
+        }
+
+    return await etag.respond(['weekly_activity'], ('weekly-activity',), load)
     
 
+
+
+# /dashboard 에서 선택할 수 있는 위젯 -> 계산에 쓰는 DASHBOARD_WIDGETS 위젯
+DASHBOARD_SELECTABLE_WIDGETS = {
+    'spending_time': 'spending_time',
+    'day_event_count': 'day_event_count',
+    'upcoming': 'upcoming',
+    'god_life_bar': 'weekly_activity',
+    'categories': 'categories',
+    'calendar_schedule': 'calendar_schedule',
+    'weekly_activity': 'weekly_activity',
+}
+
+@router.get("/dashboard")
+@router.post("/dashboard")
+async def get_dashboard(widgets: str = None, etag: DashboardETag = Depends()):
+    """
+    대시보드 위젯들을 한 번의 요청으로 반환합니다.
+    사용자 이벤트는 한 번만 읽어 선택한 위젯을 모두 계산합니다 (집계가 있는 위젯은 집계 사용).
+
+    Args:
+        widgets (str, optional): 쉼표로 구분한 위젯 이름 (기본값: 전체)
+            spending_time, day_event_count, upcoming, god_life_bar, categories, calendar_schedule, weekly_activity
+    """
+    if widgets:
+        selected = [name.strip() for name in widgets.split(',') if name.strip()]
+    else:
+        selected = list(DASHBOARD_SELECTABLE_WIDGETS)
+    
+    unknown = [name for name in selected if name not in DASHBOARD_SELECTABLE_WIDGETS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 위젯: {', '.join(unknown)}")
+    
+    calendar_logger.info("사용자 %s의 대시보드 데이터 요청: %s", etag.user_email, selected)
+    
+    required = list(dict.fromkeys(DASHBOARD_SELECTABLE_WIDGETS[name] for name in selected))
+    
+    async def load():
+        try:
+            data = await load_dashboard(etag.user_email, required)
+        except Exception as e:
+            calendar_logger.error(f"대시보드 데이터 로딩 중 오류 발생: {str(e)}")
+            calendar_logger.error(f"상세 에러: {traceback.format_exc()}")
+            raise HTTPException(
+                status_code=500,
+                detail="대시보드 데이터 조회 실패"
+            )
+        
+        result = {}
+        for name in selected:
+            if name == 'god_life_bar':
+                # /dashboard-godLifeBar 와 같은 기준 (4일 미만이면 0)
+                godLifeidx = godLifeIndex(data['weekly_activity'])
+                result[name] = godLifeidx if godLifeidx >= 4 else 0
+            else:
+                result[name] = data[DASHBOARD_SELECTABLE_WIDGETS[name]]
+        
+        return {"success": True, "widgets": result}
+
+    return await etag.respond(required, ('dashboard', ','.join(selected)), load)
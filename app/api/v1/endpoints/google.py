@@ -1,12 +1,18 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import Union
+from urllib.parse import quote, unquote, urlparse
+from app.core.config import settings
+from app.core.google_auth import GOOGLE_TOKEN_URL, get_client_config
+from app.core.http_client import shared_http_client
+from app.core.rate_limit import google_rate_limiter
+from contextlib import asynccontextmanager
+import asyncio
 import httpx
 import json
 import logging
 
 router = APIRouter()
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 async def get_access_token(code: str) -> dict:
@@ -20,10 +26,7 @@ async def get_access_token(code: str) -> dict:
        dict: 액세스 토큰 정보가 포함된 딕셔너리
              (access_token, token_type, expires_in 등의 키를 포함)
    """
-   token_url = "https://oauth2.googleapis.com/token"
-   
-   with open("client_secret_639048076528-0mqbo91cf5t0fq5604u0tblqnaka8thp.apps.googleusercontent.com.json", "r") as f:
-       client_config = json.load(f)["web"]
+   client_config = get_client_config()
 
    token_data = {
        "code": code,
@@ -33,10 +36,28 @@ async def get_access_token(code: str) -> dict:
        "grant_type": "authorization_code",
    }
 
-   async with httpx.AsyncClient() as client:
-       response = await client.post(token_url, data=token_data)
+   async with shared_http_client() as client:
+       response = await client.post(GOOGLE_TOKEN_URL, data=token_data)
        return response.json()
 
+class GoogleAuthError(httpx.HTTPStatusError):
+   """
+   구글이 액세스 토큰을 거부(HTTP 401)한 경우 발생합니다.
+   만료 전에 취소된 토큰이 캐시에 남아 있을 수 있으므로 호출한 쪽에서 캐시된 토큰을 버리고 새 토큰으로 다시 시도합니다.
+   """
+
+def raise_for_status(response: httpx.Response):
+   """
+   구글 API 응답이 오류이면 예외를 발생시킵니다.
+
+   Raises:
+       GoogleAuthError: 액세스 토큰이 거부된 경우 (HTTP 401)
+       httpx.HTTPStatusError: 그 외 오류
+   """
+   if response.status_code == 401:
+       raise GoogleAuthError("구글이 액세스 토큰을 거부했습니다", request=response.request, response=response)
+   response.raise_for_status()
+
 @router.get("/calendar-list")
 async def get_calendar_data(token_info: dict) -> dict:
    """
@@ -48,50 +69,170 @@ async def get_calendar_data(token_info: dict) -> dict:
    Returns:
        dict: 사용자의 캘린더 목록 정보
    """
-   async with httpx.AsyncClient() as client:
-       response = await client.get(
-           "https://www.googleapis.com/calendar/v3/users/me/calendarList",
+   async with shared_http_client() as client:
+       response = await google_rate_limiter.request(
+           client, "GET", f"{settings.GOOGLE_CALENDAR_API_BASE}/users/me/calendarList",
            headers={"Authorization": f"Bearer {token_info['access_token']}"}
        )
-       response.raise_for_status()
+       raise_for_status(response)
        return response.json()
 
-async def get_calendar_events(access_token: str, calendar_ids: Union[str, list]) -> list:
+class SyncTokenExpiredError(Exception):
+   """
+   구글이 syncToken을 더 이상 사용할 수 없다고 응답(HTTP 410 Gone)한 경우 발생합니다.
+   이 경우 해당 캘린더는 syncToken 없이 전체 동기화해야 합니다.
+   """
+
+async def iter_event_pages(client: httpx.AsyncClient, access_token: str, calendar_id: str, sync_token: str = None):
+   """
+   캘린더 하나의 이벤트를 nextPageToken을 따라가며 페이지 단위로 yield 합니다.
+   현재 페이지를 넘겨주는 동안 다음 페이지를 미리 요청하므로 저장과 다운로드가 겹치고,
+   메모리에는 최대 두 페이지만 올라옵니다.
+
+   Args:
+       client (httpx.AsyncClient): HTTP 클라이언트
+       access_token (str): Google Calendar API 접근을 위한 액세스 토큰
+       calendar_id (str): 캘린더 ID
+       sync_token (str, optional): 이전 동기화에서 받은 nextSyncToken (있으면 변경분만 조회)
+
+   Yields:
+       dict: {'calendar_id': str, 'events': list, 'next_sync_token': str, 'full_sync': bool}
+             next_sync_token은 마지막 페이지에만 포함되며,
+             증분 조회 시 삭제된 이벤트는 status가 'cancelled'인 항목으로 포함됩니다.
+
+   Raises:
+       SyncTokenExpiredError: syncToken이 만료된 경우 (HTTP 410)
+       GoogleAuthError: 액세스 토큰이 거부된 경우 (HTTP 401)
+       httpx.HTTPStatusError: 그 외 구글 API 오류
+   """
+   url = f"{settings.GOOGLE_CALENDAR_API_BASE}/calendars/{quote(calendar_id, safe='')}/events"
+   headers = {"Authorization": f"Bearer {access_token}"}
+   params = {"maxResults": settings.GOOGLE_EVENTS_PAGE_SIZE}
+   if sync_token:
+       params["syncToken"] = sync_token
+
+   # 속도 제한 응답/일시 오류는 google_rate_limiter 가 백오프 후 재시도
+   pending = asyncio.ensure_future(google_rate_limiter.request(client, "GET", url, headers=headers, params=params))
+   try:
+       while pending is not None:
+           response = await pending
+           pending = None
+           if response.status_code == 410:
+               raise SyncTokenExpiredError(calendar_id)
+           raise_for_status(response)
+
+           data = response.json()
+           if 'nextPageToken' in data:
+               pending = asyncio.ensure_future(
+                   google_rate_limiter.request(
+                       client, "GET", url, headers=headers, params={**params, "pageToken": data['nextPageToken']}
+                   )
+               )
+           yield {
+               'calendar_id': calendar_id,
+               'events': data.get('items', []),
+               'next_sync_token': data.get('nextSyncToken'),
+               'full_sync': sync_token is None
+           }
+   finally:
+       if pending is not None:
+           pending.cancel()
+
+# 프로세스 전체 동시 조회 수 제한 (이벤트 루프별로 생성)
+_global_fetch_limit = None
+
+def get_global_fetch_limit() -> asyncio.Semaphore:
+   """
+   모든 사용자가 공유하는 구글 이벤트 조회 세마포어를 반환합니다.
+   세마포어는 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만듭니다.
+   """
+   global _global_fetch_limit
+   loop = asyncio.get_running_loop()
+   if _global_fetch_limit is None or _global_fetch_limit[0] is not loop:
+       _global_fetch_limit = (loop, asyncio.Semaphore(settings.GOOGLE_FETCH_CONCURRENCY_GLOBAL))
+   return _global_fetch_limit[1]
+
+def create_user_fetch_limit(concurrency: int = None) -> asyncio.Semaphore:
+   """
+   사용자 한 명의 동기화 안에서 공유할 캘린더 동시 조회 세마포어를 만듭니다.
+
+   Args:
+       concurrency (int, optional): 동시 조회 수 (기본값: settings.GOOGLE_FETCH_CONCURRENCY_PER_USER)
+   """
+   return asyncio.Semaphore(concurrency or settings.GOOGLE_FETCH_CONCURRENCY_PER_USER)
+
+@asynccontextmanager
+async def calendar_fetch_slot(user_limit: asyncio.Semaphore):
+   """
+   사용자별 제한과 프로세스 전체 제한을 모두 얻은 동안만 캘린더 하나를 조회/저장하도록 합니다.
+   """
+   async with user_limit, get_global_fetch_limit():
+       yield
+
+# 구글 푸시 알림 채널 (events.watch)
+_RESOURCE_URI_PATH = '/calendars/'
+
+async def watch_calendar_events(client: httpx.AsyncClient, access_token: str, calendar_id: str,
+                                channel_id: str, token: str, address: str, ttl: int) -> dict:
    """
-   지정된 캘린더들의 이벤트를 조회합니다.
+   캘린더 하나의 이벤트 변경 알림을 받을 채널을 등록합니다.
+   이후 이벤트가 바뀌면 구글이 address 로 X-Goog-Channel-* 헤더가 담긴 POST 요청을 보냅니다.
 
    Args:
+       client (httpx.AsyncClient): HTTP 클라이언트
        access_token (str): Google Calendar API 접근을 위한 액세스 토큰
-       calendar_ids (Union[str, list]): 단일 캘린더 ID 또는 캘린더 ID 목록
+       calendar_id (str): 캘린더 ID
+       channel_id (str): 새 채널 ID (채널마다 고유해야 함)
+       token (str): 알림마다 X-Goog-Channel-Token 으로 돌려받을 값 (최대 256자)
+       address (str): 알림을 받을 HTTPS 주소
+       ttl (int): 채널 유효 시간(초), 구글이 더 짧게 정할 수 있음
 
    Returns:
-       list: 각 캘린더의 이벤트 정보를 포함한 리스트
-             [{'calendar_id': str, 'events': list}, ...]
-   """
-   if isinstance(calendar_ids, str):
-       calendar_ids = [calendar_ids]
-   
-   logger.info(f"받은 캘린더 ID 목록: {calendar_ids}")
-   events_all = []
-   
-   async with httpx.AsyncClient() as client:
-       for calendar_id in calendar_ids:
-           logger.info(f"처리 중인 캘린더 ID: {calendar_id}")
-           url = f"https://www.googleapis.com/calendar/v3/calendars/{calendar_id}/events"
-           headers = {"Authorization": f"Bearer {access_token}"}
-           
-           try:
-               response = await client.get(url, headers=headers)
-               if response.status_code == 200:
-                   events = response.json()
-                   events_all.append({
-                       'calendar_id': calendar_id,
-                       'events': events.get('items', [])
-                   })
-               else:
-                   logger.error(f"캘린더 {calendar_id}의 이벤트 가져오기 실패: {response.status_code}")
-           except Exception as e:
-               logger.error(f"캘린더 {calendar_id} 처리 중 오류 발생: {str(e)}")
-               continue
-   
-   return events_all
\ No newline at end of file
+       dict: 구글 채널 정보 (id, resourceId, resourceUri, expiration(ms 문자열) 등)
+
+   Raises:
+       httpx.HTTPStatusError: 구글 API 오류
+   """
+   # 채널 ID가 같은 요청을 다시 보내면 구글이 중복으로 거절하므로 속도 제한 응답만 재시도
+   response = await google_rate_limiter.request(
+       client, "POST", f"{settings.GOOGLE_CALENDAR_API_BASE}/calendars/{quote(calendar_id, safe='')}/events/watch",
+       headers={"Authorization": f"Bearer {access_token}"},
+       json={
+           "id": channel_id,
+           "type": "web_hook",
+           "address": address,
+           "token": token,
+           "params": {"ttl": str(ttl)}
+       }
+   )
+   raise_for_status(response)
+   return response.json()
+
+async def stop_channel(client: httpx.AsyncClient, access_token: str, channel_id: str, resource_id: str):
+   """
+   등록한 알림 채널을 해지합니다.
+
+   Raises:
+       httpx.HTTPStatusError: 구글 API 오류 (이미 만료된 채널은 404)
+   """
+   # 해지는 여러 번 보내도 결과가 같으므로 일시 오류도 재시도
+   response = await google_rate_limiter.request(
+       client, "POST", f"{settings.GOOGLE_CALENDAR_API_BASE}/channels/stop", idempotent=True,
+       headers={"Authorization": f"Bearer {access_token}"},
+       json={"id": channel_id, "resourceId": resource_id}
+   )
+   raise_for_status(response)
+
+def calendar_id_from_resource_uri(resource_uri: str) -> Union[str, None]:
+   """
+   알림의 X-Goog-Resource-URI (".../calendars/{캘린더 ID}/events?...") 에서 캘린더 ID를 꺼냅니다.
+
+   Returns:
+       str: 캘린더 ID (형식이 다르면 None)
+   """
+   path = urlparse(resource_uri or '').path
+   start = path.rfind(_RESOURCE_URI_PATH)
+   if start < 0 or not path.endswith('/events'):
+       return None
+   calendar_id = unquote(path[start + len(_RESOURCE_URI_PATH):-len('/events')])
+   return calendar_id or None
@@ -5,6 +5,9 @@ from pydantic import BaseModel
 import httpx
 import json
 import logging
+from app.core.google_auth import access_token_cache
+from app.core.http_client import shared_http_client
+from app.core.principal_cache import principal_cache
 from app.core.security import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -15,9 +18,6 @@ from app.api.v1.endpoints import google
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
-stream_handler = logging.StreamHandler()
-stream_handler.setLevel(logging.INFO)
-logger.addHandler(stream_handler)
 router = APIRouter()
 
 class GoogleAuthRequest(BaseModel):
@@ -63,12 +63,15 @@ async def get_or_create_user(
        db.add(user)
        await db.commit()
        await db.refresh(user)
+       principal_cache.invalidate_user(email)
        return user, True
 
    if refresh_token:
        user.refresh_token = refresh_token
        await db.commit()
        await db.refresh(user)
+       # 캐시된 인증 사용자가 이전 refresh token 을 들고 있지 않도록 무효화
+       principal_cache.invalidate_user(email)
 
    return user, False
 
@@ -94,8 +97,11 @@ async def google_login(
        logger.info("로그인 프로세스 시작")
        token_info = await google.get_access_token(auth_request.code)
        logger.info("구글 토큰 정보 수신 완료")
+       # 로그인 직후 동기화가 토큰 갱신 없이 바로 이 토큰을 쓰도록 캐시에 저장
+       if token_info.get('refresh_token'):
+           access_token_cache.put(token_info['refresh_token'], token_info)
        
-       async with httpx.AsyncClient() as client:
+       async with shared_http_client() as client:
            logger.info("구글에서 사용자 정보 요청 중")
            user_info_response = await client.get(
                "https://www.googleapis.com/oauth2/v2/userinfo",
@@ -113,7 +119,7 @@ async def google_login(
                    refresh_token=token_info.get('refresh_token')
                )
                logger.info(f"사용자 {'생성' if is_new_user else '조회'} 완료")
-               logger.info(f"사용자 정보: {user}")
+               logger.info("사용자 정보: %s", user)
            except Exception as e:
                logger.error(f"사용자 정보 처리 중 오류 발생: {str(e)}")
                logger.error(f"상세 에러: {traceback.format_exc()}")
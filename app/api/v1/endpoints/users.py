@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from app.api.deps import get_current_user
+from app.core.logging_config import log_payload
+from app.core.principal_cache import principal_cache
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.db.database import get_db
@@ -110,6 +112,8 @@ async def update_profile(
 
        await db.commit()
        await db.refresh(user)
+       # 캐시된 인증 사용자 정보도 버림
+       principal_cache.invalidate_user(user.email)
 
        return {
            "success": True,
@@ -141,7 +145,7 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
    Returns:
        dict: 사용자 이메일 정보
    """
-   logger.info(f"'me' 엔드포인트 호출됨: {current_user.email}")
+   logger.info("'me' 엔드포인트 호출됨: %s", current_user.email)
    return {"email": current_user.email}
 
 @router.get("/get-user-info")
@@ -176,7 +180,7 @@ async def get_user_info(email: str, db: AsyncSession = Depends(get_db)):
        "is_new_user": user.is_new_user,
    }
 
-   logger.info(f"Returning user data: {user_data}")
+   log_payload(logger, "Returning user data", user_data)
    return user_data
 
 @router.post("/update-user-info")
@@ -215,6 +219,7 @@ async def update_user_info(
 
        await db.commit()
        await db.refresh(user)
+       principal_cache.invalidate_user(user.email)
 
        return {
            "success": True,
@@ -11,7 +11,93 @@ class Settings(BaseSettings):
     DB_PWD: str = os.getenv("DB_PWD")
     AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY: str = os.getenv("AWS_SECRET_ACCESS_KEY")
-    
+
+    # DynamoDB 커넥션 풀 / 스레드 풀 설정
+    DYNAMODB_MAX_POOL_CONNECTIONS: int = 32
+    DYNAMODB_MAX_WORKERS: int = 32
+
+    # 구글 캘린더 API 설정 (벤치마크/테스트 시 가짜 서버 주소로 교체 가능)
+    GOOGLE_CALENDAR_API_BASE: str = "https://www.googleapis.com/calendar/v3"
+    # events.list 페이지 크기 (구글 최대값 2500, 기본값 250)
+    GOOGLE_EVENTS_PAGE_SIZE: int = 2500
+
+    # 구글 API 공유 HTTP 커넥션 풀 설정
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 30.0
+    HTTP_POOL_TIMEOUT: float = 10.0
+
+    # 구글 OAuth 클라이언트 설정 파일과 액세스 토큰 캐시
+    GOOGLE_CLIENT_SECRET_FILE: str = "client_secret_639048076528-0mqbo91cf5t0fq5604u0tblqnaka8thp.apps.googleusercontent.com.json"
+    GOOGLE_TOKEN_CACHE_SIZE: int = 10000
+    GOOGLE_TOKEN_EXPIRY_MARGIN: float = 300.0
+    # 캘린더별 이벤트 동시 조회 수 (사용자 한 명 / 프로세스 전체)
+    GOOGLE_FETCH_CONCURRENCY_PER_USER: int = 4
+    GOOGLE_FETCH_CONCURRENCY_GLOBAL: int = 32
+    # 구글 Calendar API 클라이언트 측 속도 제한 (초당 요청 수/버스트 - 프로세스 전체, 사용자별)
+    # 동시 요청 수는 속도 제한 응답에 따라 MIN~MAX 사이에서 조절 (AIMD)
+    GOOGLE_RATE_PROJECT_QPS: float = 50.0
+    GOOGLE_RATE_PROJECT_BURST: int = 100
+    GOOGLE_RATE_USER_QPS: float = 10.0
+    GOOGLE_RATE_USER_BURST: int = 20
+    GOOGLE_CONCURRENCY_INITIAL: int = 16
+    GOOGLE_CONCURRENCY_MIN: int = 1
+    GOOGLE_CONCURRENCY_MAX: int = 64
+    # 속도 제한/일시 오류 재시도 (첫 요청 포함 최대 시도 횟수, 지수 백오프 시작/최대 대기 초)
+    GOOGLE_RETRY_MAX_ATTEMPTS: int = 6
+    GOOGLE_RETRY_BASE_DELAY: float = 0.5
+    GOOGLE_RETRY_MAX_DELAY: float = 32.0
+    # 구글 푸시 알림(events.watch) 웹훅 주소 (예: https://<도메인>/api/v1/calendar/webhook, 없으면 사용 안 함)
+    # 채널 유효 기간(초)과, 만료까지 이 시간보다 적게 남은 채널을 동기화 때 갱신하는 여유(초)
+    GOOGLE_WEBHOOK_URL: str = ""
+    GOOGLE_WATCH_TTL: int = 7 * 24 * 3600
+    GOOGLE_WATCH_RENEW_MARGIN: float = 24 * 3600.0
+
+    # 인증된 사용자 캐시 (JWT 별 클레임 + User, 사용자 정보 변경 시 무효화)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL: float = 60.0
+
+    # 로깅 (큐 기반 비동기 출력, 형식 json/text, LOG_FILE 이 비어 있으면 표준출력만)
+    # 메시지 최대 길이, 큰 데이터(log_payload)의 최대 길이와 기록 비율
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_FILE: str = "app.log"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_MAX_MESSAGE_CHARS: int = 4000
+    LOG_PAYLOAD_MAX_CHARS: int = 1000
+    LOG_PAYLOAD_SAMPLE_RATE: float = 0.1
+    # SQLAlchemy SQL 로그 (echo 는 큐를 거치지 않고 표준출력에 바로 씀)
+    DB_ECHO: bool = False
+
+    # Prometheus 메트릭 (/metrics, 요청/DynamoDB/구글 API/Postgres 지연 히스토그램)
+    # DynamoDB 소비 용량은 요청에 ReturnConsumedCapacity=TOTAL 을 붙여 응답에서 집계
+    METRICS_ENABLED: bool = True
+    METRICS_DYNAMODB_CAPACITY: bool = True
+
+    # 대시보드용 사용자 이벤트 메모리 캐시 (동기화 완료 시 무효화)
+    EVENT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    EVENT_CACHE_TTL: float = 900.0
+
+    # 동기화 작업 큐 워커 수와 완료된 작업 기록 보관 (GET /sync-jobs/{id})
+    SYNC_JOB_WORKERS: int = 4
+    SYNC_JOB_RETENTION: float = 3600.0
+    SYNC_JOB_MAX_RECORDS: int = 10000
+
+    # 주기 동기화 스케줄러 (사용자별 주기는 MIN~MAX 사이에서 변경량에 맞춰 조정)
+    # 앱을 import 하는 스크립트/벤치마크/추가 워커마다 구글 동기화 루프가 돌지 않도록 기본값은 꺼 두고,
+    # 배포 이미지(Dockerfile)에서 한 프로세스만 켭니다
+    SYNC_SCHEDULER_ENABLED: bool = False
+    SYNC_SCHEDULER_MIN_INTERVAL: float = 300.0
+    SYNC_SCHEDULER_MAX_INTERVAL: float = 6 * 3600.0
+    SYNC_SCHEDULER_INITIAL_INTERVAL: float = 1800.0
+    SYNC_SCHEDULER_JITTER: float = 0.2
+    SYNC_SCHEDULER_MAX_INFLIGHT: int = 4
+    SYNC_SCHEDULER_TICK: float = 5.0
+    SYNC_SCHEDULER_USER_REFRESH: float = 600.0
+
     class Config:
         env_file = ".env"  # .env 파일 사용
         env_file_encoding = "utf-8"
@@ -0,0 +1,132 @@
+# google_auth.py
+# 구글 OAuth 클라이언트 설정과 사용자별 액세스 토큰 캐시
+#
+# 동기화 요청마다 client_secret 파일을 읽고 토큰을 갱신하지 않도록
+# - 클라이언트 설정은 앱 시작 시 한 번만 읽고
+# - 액세스 토큰은 refresh token 별로 expires_in 동안 (안전 여유를 두고) 재사용하며
+# - 같은 사용자의 동시 갱신 요청은 하나의 갱신 호출을 함께 기다립니다 (single-flight).
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+from cachetools import TLRUCache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+
+_client_config = None
+
+
+def load_client_config() -> dict:
+    """
+    client_secret 파일에서 OAuth 클라이언트 설정("web")을 읽어 캐시합니다.
+    앱 lifespan 시작 시 호출되며, 파일이 없으면 경고만 남기고 첫 사용 시 다시 시도합니다.
+
+    Returns:
+        dict: client_id, client_secret 등을 포함한 설정 또는 None (파일이 없는 경우)
+    """
+    global _client_config
+
+    try:
+        with open(settings.GOOGLE_CLIENT_SECRET_FILE, "r") as f:
+            _client_config = json.load(f)["web"]
+        logger.info("구글 클라이언트 설정 로드 완료")
+    except FileNotFoundError:
+        logger.warning(f"구글 클라이언트 설정 파일이 없습니다: {settings.GOOGLE_CLIENT_SECRET_FILE}")
+    return _client_config
+
+
+def get_client_config() -> dict:
+    """
+    캐시된 OAuth 클라이언트 설정을 반환합니다.
+
+    Raises:
+        FileNotFoundError: 설정 파일이 없는 경우
+    """
+    if _client_config is None and load_client_config() is None:
+        raise FileNotFoundError(settings.GOOGLE_CLIENT_SECRET_FILE)
+    return _client_config
+
+
+def _token_key(refresh_token: str) -> str:
+    # refresh token 원문을 캐시 키로 들고 있지 않도록 해시 사용
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+class AccessTokenCache:
+    """
+    refresh token 별 구글 액세스 토큰 캐시
+
+    Args:
+        maxsize (int): 캐시할 최대 사용자 수 (넘으면 가장 오래 안 쓴 항목부터 제거)
+        margin (float): expires_in 에서 뺄 안전 여유(초)
+    """
+
+    def __init__(self, maxsize: int, margin: float):
+        self.margin = margin
+        self._tokens = TLRUCache(maxsize=maxsize, ttu=lambda key, value, now: value['expires_at'], timer=time.monotonic)
+        self._inflight = {}
+
+    def put(self, refresh_token: str, token_info: dict):
+        """
+        토큰 응답(access_token, expires_in)을 캐시에 저장합니다. 로그인 시 받은 토큰도 이 메서드로 넣습니다.
+        """
+        ttl = float(token_info.get('expires_in', 0)) - self.margin
+        if not token_info.get('access_token') or ttl <= 0:
+            return
+        self._tokens[_token_key(refresh_token)] = {
+            'access_token': token_info['access_token'],
+            'expires_at': time.monotonic() + ttl
+        }
+
+    def invalidate(self, refresh_token: str):
+        """
+        구글이 토큰을 거부한 경우 등 캐시된 토큰을 버립니다.
+        """
+        self._tokens.pop(_token_key(refresh_token), None)
+
+    async def get(self, refresh_token: str, refresh) -> str:
+        """
+        캐시된 액세스 토큰을 반환하고, 없거나 만료가 가까우면 refresh(refresh_token)로 갱신합니다.
+        같은 refresh token 에 대한 동시 호출은 진행 중인 갱신 하나를 함께 기다립니다.
+
+        Args:
+            refresh_token (str): 사용자의 구글 refresh token
+            refresh: refresh_token을 받아 토큰 응답 dict를 돌려주는 코루틴 함수
+
+        Returns:
+            str: 액세스 토큰
+        """
+        key = _token_key(refresh_token)
+        cached = self._tokens.get(key)
+        if cached is not None:
+            return cached['access_token']
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(key, refresh_token, refresh))
+            self._inflight[key] = task
+        # 기다리던 요청 하나가 취소되어도 다른 요청이 공유하는 갱신은 계속되도록 shield
+        return await asyncio.shield(task)
+
+    async def _refresh(self, key: str, refresh_token: str, refresh) -> str:
+        try:
+            token_info = await refresh(refresh_token)
+            self.put(refresh_token, token_info)
+            return token_info['access_token']
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {'cached': len(self._tokens), 'inflight': len(self._inflight)}
+
+
+access_token_cache = AccessTokenCache(
+    maxsize=settings.GOOGLE_TOKEN_CACHE_SIZE,
+    margin=settings.GOOGLE_TOKEN_EXPIRY_MARGIN
+)
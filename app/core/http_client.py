@@ -0,0 +1,145 @@
+# http_client.py
+# 구글 API 호출에 공유하는 httpx 커넥션 풀 관리
+#
+# 호출마다 httpx.AsyncClient를 새로 만들면 매번 TCP/TLS 핸드셰이크가 일어나므로
+# 앱 lifespan 동안 하나의 클라이언트(HTTP/2, keep-alive)를 만들어 재사용합니다.
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import google_request_started, google_response_received
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401 (httpx HTTP/2 지원에 필요)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_client = None
+_client_loop = None
+
+# 호스트별 커넥션 풀 통계
+_pool_stats = defaultdict(lambda: {'requests': 0, 'connections_created': 0, 'tls_handshakes': 0})
+
+
+async def _trace(host: str, event_name: str, info: dict):
+    # httpcore trace 이벤트로 새 커넥션/핸드셰이크 수 집계
+    if event_name == 'connection.connect_tcp.complete':
+        _pool_stats[host]['connections_created'] += 1
+    elif event_name == 'connection.start_tls.complete':
+        _pool_stats[host]['tls_handshakes'] += 1
+
+
+async def _attach_trace(request: httpx.Request):
+    host = request.url.host
+    _pool_stats[host]['requests'] += 1
+    request.extensions['trace'] = lambda event_name, info: _trace(host, event_name, info)
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def init_http_client():
+    """
+    공유 httpx.AsyncClient를 생성합니다. 앱 lifespan 시작 시 한 번 호출되며,
+    이미 초기화된 경우 아무 것도 하지 않습니다.
+    """
+    global _client, _client_loop
+
+    if _client is not None:
+        return
+
+    http2 = settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+    if settings.HTTP2_ENABLED and not HTTP2_AVAILABLE:
+        logger.warning("h2 패키지가 없어 HTTP/1.1 keep-alive로 동작합니다")
+
+    event_hooks = {'request': [_attach_trace], 'response': []}
+    if settings.METRICS_ENABLED:
+        event_hooks['request'].append(google_request_started)
+        event_hooks['response'].append(google_response_received)
+
+    _client = httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(
+            settings.HTTP_READ_TIMEOUT,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT
+        ),
+        event_hooks=event_hooks
+    )
+    _client_loop = _running_loop()
+    logger.info(
+        "HTTP 클라이언트 초기화 완료 (http2=%s, max_connections=%d, keepalive=%d)",
+        http2,
+        settings.HTTP_MAX_CONNECTIONS,
+        settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+    )
+
+
+async def close_http_client():
+    """
+    공유 클라이언트의 커넥션을 모두 닫습니다. 앱 lifespan 종료 시 호출됩니다.
+    """
+    global _client, _client_loop
+
+    if _client is not None:
+        await _client.aclose()
+        logger.info("HTTP 클라이언트 정리 완료: %s", get_pool_stats())
+    _client = None
+    _client_loop = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    공유 httpx.AsyncClient를 반환합니다.
+    커넥션은 이벤트 루프에 묶이므로 다른 루프에서 호출되면 새 클라이언트를 만듭니다 (스크립트/벤치마크용).
+
+    Returns:
+        httpx.AsyncClient: 공유 클라이언트 (호출한 쪽에서 닫지 않아야 함)
+    """
+    global _client
+    if _client is not None and _client_loop is not None and _client_loop is not _running_loop():
+        _client = None
+    init_http_client()
+    return _client
+
+
+@asynccontextmanager
+async def shared_http_client():
+    """
+    `async with httpx.AsyncClient() as client:` 자리에 쓰는 컨텍스트 매니저입니다.
+    공유 클라이언트를 빌려주기만 하고 블록이 끝나도 닫지 않습니다.
+    """
+    yield get_http_client()
+
+
+def get_pool_stats() -> dict:
+    """
+    호스트별 커넥션 풀 통계를 반환합니다.
+
+    Returns:
+        dict: {호스트: {'requests', 'connections_created', 'connections_reused', 'tls_handshakes'}}
+    """
+    return {
+        host: {**stats, 'connections_reused': stats['requests'] - stats['connections_created']}
+        for host, stats in _pool_stats.items()
+    }
+
+
+def reset_pool_stats():
+    _pool_stats.clear()
@@ -0,0 +1,197 @@
+# logging_config.py
+# 큐 기반 비동기 구조화 로깅
+#
+# 핸들러가 이벤트 루프 스레드에서 파일/표준출력에 바로 쓰면 디스크 I/O 동안 다른 요청이 모두 멈추므로
+# - 모든 로거(루트)는 QueueHandler 로 레코드를 큐에 넣기만 하고
+# - QueueListener 스레드가 JSON(또는 텍스트)으로 포맷해 표준출력과 LOG_FILE 에 씁니다.
+# - 호출한 쪽에서는 메시지 인자만 합치고 LOG_MAX_MESSAGE_CHARS 로 자르며, 큐가 가득 차면 기다리지 않고 버립니다.
+# 큰 데이터(이벤트 리스트, 위젯 결과 등)는 log_payload 로 남깁니다:
+# 로그 레벨이 꺼져 있으면 아무것도 만들지 않고, LOG_PAYLOAD_SAMPLE_RATE 비율만 남기며, 길이가 제한된 repr 로 기록합니다.
+# 메시지는 f-string 대신 logger.info("... %s", value) 형태로 넘겨 레벨이 꺼져 있을 때 포맷하지 않도록 합니다.
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import reprlib
+import sys
+import traceback
+from datetime import datetime, timezone
+
+from app.core.config import settings
+
+# LogRecord 기본 속성 - 나머지(extra 로 넘긴 값)는 JSON 필드로 출력
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+_queue_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    레코드 하나를 JSON 한 줄로 포맷합니다 (ts, level, logger, msg, extra 필드, exc).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    메시지만 합쳐 큐에 넣는 핸들러 (포맷과 출력은 QueueListener 스레드에서)
+
+    Args:
+        log_queue (queue.Queue): 리스너와 공유하는 큐
+        max_chars (int): 메시지 최대 길이 (넘으면 잘라서 기록)
+    """
+
+    def __init__(self, log_queue: queue.Queue, max_chars: int):
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 인자 객체는 나중에 바뀔 수 있으므로 여기서 문자열로 합치고, traceback 도 프레임이 살아 있을 때 문자열로 변환
+        message = record.getMessage()
+        if len(message) > self.max_chars:
+            message = f"{message[:self.max_chars]}... (총 {len(message)}자)"
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # 리스너가 밀려도 이벤트 루프를 막지 않도록 버림
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class Payload:
+    """
+    길이가 제한된 repr 로 출력되는 로그 인자 (출력될 때만 계산)
+
+    Args:
+        value: 기록할 데이터
+        max_chars (int): 최대 길이
+    """
+    __slots__ = ('value', 'max_chars')
+
+    _repr = reprlib.Repr()
+    _repr.maxlevel = 4
+    _repr.maxlist = _repr.maxtuple = _repr.maxset = _repr.maxdict = 20
+    _repr.maxstring = _repr.maxother = 200
+
+    def __init__(self, value, max_chars: int):
+        self.value = value
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        text = self._repr.repr(self.value)
+        if len(text) > self.max_chars:
+            text = f"{text[:self.max_chars]}..."
+        size = len(self.value) if hasattr(self.value, '__len__') else None
+        return text if size is None else f"{text} (len={size})"
+
+    __repr__ = __str__
+
+
+def payload(value, max_chars: int = None) -> Payload:
+    return Payload(value, max_chars or settings.LOG_PAYLOAD_MAX_CHARS)
+
+
+def log_payload(logger: logging.Logger, message: str, value, level: int = logging.INFO, sample_rate: float = None):
+    """
+    큰 데이터를 레벨 확인과 샘플링을 거쳐 기록합니다.
+
+    Args:
+        logger (logging.Logger): 로거
+        message (str): 메시지 (데이터는 뒤에 붙음)
+        value: 기록할 데이터
+        level (int): 로그 레벨
+        sample_rate (float, optional): 기록할 비율 (기본값: settings.LOG_PAYLOAD_SAMPLE_RATE)
+    """
+    if not logger.isEnabledFor(level):
+        return
+    rate = settings.LOG_PAYLOAD_SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate < 1.0 and random.random() >= rate:
+        return
+    logger.log(level, "%s: %s", message, payload(value), extra={'sample_rate': rate}, stacklevel=2)
+
+
+def _build_handlers() -> list:
+    formatter = JsonFormatter() if settings.LOG_FORMAT == 'json' else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if settings.LOG_FILE:
+        # 첫 기록 때 파일을 엶
+        handlers.append(logging.FileHandler(settings.LOG_FILE, encoding='utf-8', delay=True))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging():
+    """
+    루트 로거를 큐 핸들러로 바꾸고 출력 스레드(QueueListener)를 시작합니다.
+    앱 시작 시 한 번 호출하며, 이미 설정되어 있으면 아무 것도 하지 않습니다.
+    """
+    global _listener, _queue_handler
+
+    if _listener is not None:
+        return
+
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _queue_handler = AsyncQueueHandler(log_queue, settings.LOG_MAX_MESSAGE_CHARS)
+    _listener = logging.handlers.QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+    _listener.start()
+    atexit.unregister(shutdown_logging)
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """
+    큐에 남은 레코드를 모두 쓰고 출력 스레드를 멈춥니다. 앱 lifespan 종료 시 호출합니다.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        logging.getLogger().removeHandler(_queue_handler)
+
+
+def get_logging_stats() -> dict:
+    return {
+        'queued': _queue_handler.queue.qsize() if _queue_handler is not None else 0,
+        'dropped': _queue_handler.dropped if _queue_handler is not None else 0
+    }
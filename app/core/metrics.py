@@ -0,0 +1,293 @@
+# metrics.py
+# Prometheus 메트릭 (/metrics)
+#
+# - 요청 지연: MetricsMiddleware 가 라우트 템플릿(/api/v1/calendar/dashboard 등)별로 기록 (실제 경로는 라벨로 쓰지 않음)
+# - DynamoDB: botocore 이벤트(before-parameter-build / after-call)로 테이블/오퍼레이션별 지연과 소비 용량(RCU/WCU)
+# - 구글 API: 공유 httpx 클라이언트의 event hook 으로 엔드포인트/상태 코드별 응답 헤더 수신까지의 지연 (재시도는 시도마다)
+# - Postgres: SQLAlchemy 엔진 cursor 이벤트로 문장 종류(SELECT/INSERT/...)별 지연
+# - 캐시/작업 큐/속도 제한 등 기존 stats() 는 register_stats 로 등록해 수집(scrape) 시점에만 읽음
+# 기록 경로에서는 metric.labels(...) (라벨 검증 + 락) 대신 라벨 값별로 묶어 둔 child 를 dict 에서 꺼내 observe 만 합니다.
+import logging
+import re
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REGISTRY = CollectorRegistry()
+
+# 초 단위 버킷 (대시보드 응답은 수 ms ~ 수 초, 외부 호출은 수십 ms ~ 수 초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+http_request_duration = Histogram(
+    'lookback_http_request_duration_seconds', "API 요청 처리 시간 (응답 본문을 다 보낼 때까지)",
+    ('method', 'route', 'status'), buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+dynamodb_operation_duration = Histogram(
+    'lookback_dynamodb_operation_duration_seconds', "DynamoDB 호출 시간 (botocore 재시도 포함)",
+    ('table', 'operation'), buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+dynamodb_consumed_capacity = Counter(
+    'lookback_dynamodb_consumed_capacity_units', "DynamoDB 소비 용량 (ReturnConsumedCapacity=TOTAL)",
+    ('table', 'operation'), registry=REGISTRY
+)
+google_request_duration = Histogram(
+    'lookback_google_request_duration_seconds', "구글 API 요청 시간 (응답 헤더 수신까지, 시도별)",
+    ('endpoint', 'status'), buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+db_query_duration = Histogram(
+    'lookback_db_query_duration_seconds', "Postgres 쿼리 시간",
+    ('statement',), buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+
+
+class _Children:
+    """
+    라벨 값으로 묶은 metric child 를 중첩 dict 에 보관합니다.
+    처음 보는 조합만 metric.labels() 로 만들고, 이후에는 dict 조회만 합니다.
+
+    Args:
+        metric: 라벨이 있는 Histogram/Counter
+    """
+    __slots__ = ('metric', 'children')
+
+    def __init__(self, metric):
+        self.metric = metric
+        self.children = {}
+
+    def get(self, first, second=None, third=None):
+        try:
+            return self.children[first][second][third]
+        except KeyError:
+            return self._bind(first, second, third)
+
+    def _bind(self, first, second, third):
+        values = [value for value in (first, second, third) if value is not None]
+        child = self.metric.labels(*values)
+        self.children.setdefault(first, {}).setdefault(second, {})[third] = child
+        return child
+
+
+_http_children = _Children(http_request_duration)
+_dynamodb_children = _Children(dynamodb_operation_duration)
+_capacity_children = _Children(dynamodb_consumed_capacity)
+_google_children = _Children(google_request_duration)
+_db_children = _Children(db_query_duration)
+
+
+# --- API 요청 ---
+
+def bind_routes(routes):
+    """
+    라우트별 child 를 미리 만들어 둡니다 (요청이 없었던 라우트도 0 으로 노출). 앱 시작 시 호출합니다.
+    """
+    for route in routes:
+        for method in getattr(route, 'methods', None) or ():
+            _http_children.get(method, route.path, 200)
+
+
+class MetricsMiddleware:
+    """
+    라우트 템플릿별 요청 처리 시간을 기록하는 ASGI 미들웨어
+    응답 본문의 마지막 조각을 보낸 시점에 기록하므로 응답 뒤에 실행되는 BackgroundTasks 시간은 포함하지 않습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        recorded = False
+
+        async def send_with_metrics(message):
+            nonlocal status, recorded
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body' and not message.get('more_body', False) and not recorded:
+                recorded = True
+                _observe_http(scope, status, time.perf_counter() - started)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            if not recorded:
+                _observe_http(scope, status, time.perf_counter() - started)
+
+
+def _observe_http(scope, status: int, seconds: float):
+    # 라우팅이 끝나면 scope['route'] 에 매칭된 라우트가 들어 있음 (404 등은 경로 대신 고정 라벨)
+    route = scope.get('route')
+    path = route.path if route is not None else UNMATCHED_ROUTE
+    _http_children.get(scope['method'], path, status).observe(seconds)
+
+
+# --- DynamoDB ---
+
+def _dynamodb_before(params, model, context, **kwargs):
+    # 연결 오류(after-call-error)에는 model 이 없으므로 오퍼레이션 이름도 context 에 남겨 둠
+    context['metrics_started'] = time.perf_counter()
+    context['metrics_operation'] = model.name
+    table = params.get('TableName')
+    if table is None:
+        # BatchGetItem/BatchWriteItem - 테이블이 하나면 그 이름, 여러 개면 'batch'
+        tables = params.get('RequestItems') or ()
+        table = next(iter(tables)) if len(tables) == 1 else 'batch'
+    context['metrics_table'] = table
+    if settings.METRICS_DYNAMODB_CAPACITY and 'ReturnConsumedCapacity' in model.input_shape.members:
+        params.setdefault('ReturnConsumedCapacity', 'TOTAL')
+
+
+def _dynamodb_after(parsed, model, context, **kwargs):
+    _observe_dynamodb(model.name, context)
+    consumed = parsed.get('ConsumedCapacity')
+    if not consumed:
+        return
+    # 단일 테이블 오퍼레이션은 dict, 배치/트랜잭션은 테이블별 list
+    for capacity in consumed if isinstance(consumed, list) else (consumed,):
+        units = capacity.get('CapacityUnits')
+        if units:
+            _capacity_children.get(capacity.get('TableName', context['metrics_table']), model.name).inc(units)
+
+
+def _dynamodb_after_error(context, **kwargs):
+    _observe_dynamodb(context.get('metrics_operation'), context)
+
+
+def _observe_dynamodb(operation: str, context: dict):
+    started = context.get('metrics_started')
+    if started is not None:
+        _dynamodb_children.get(context['metrics_table'], operation).observe(time.perf_counter() - started)
+
+
+def instrument_dynamodb(client):
+    """
+    DynamoDB 클라이언트(resource.meta.client)에 지연/소비 용량 기록용 이벤트 핸들러를 등록합니다.
+    """
+    events = client.meta.events
+    events.register('before-parameter-build.dynamodb', _dynamodb_before, unique_id='lookback-metrics-before')
+    events.register('after-call.dynamodb', _dynamodb_after, unique_id='lookback-metrics-after')
+    events.register('after-call-error.dynamodb', _dynamodb_after_error, unique_id='lookback-metrics-error')
+
+
+# --- 구글 API ---
+
+# 캘린더 ID 는 사용자마다 다르므로 라벨에서는 {id} 로 치환
+_CALENDAR_ID_SEGMENT = re.compile(r'/calendars/[^/]+')
+
+
+def google_endpoint(url) -> str:
+    """
+    요청 URL 을 라벨용 엔드포인트로 바꿉니다 (예: www.googleapis.com/calendar/v3/calendars/{id}/events).
+    """
+    return f"{url.host}{_CALENDAR_ID_SEGMENT.sub('/calendars/{id}', url.path)}"
+
+
+async def google_request_started(request):
+    request.extensions['metrics_started'] = time.perf_counter()
+
+
+async def google_response_received(response):
+    started = response.request.extensions.get('metrics_started')
+    if started is not None:
+        seconds = time.perf_counter() - started
+        _google_children.get(google_endpoint(response.request.url), response.status_code).observe(seconds)
+
+
+# --- Postgres ---
+
+_STATEMENTS = {'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'BEGIN', 'COMMIT', 'ROLLBACK'}
+
+
+def _statement_label(statement: str) -> str:
+    verb = statement.lstrip()[:8].split(None, 1)
+    verb = verb[0].upper() if verb else ''
+    return verb if verb in _STATEMENTS else 'OTHER'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_started', None)
+    if started is not None:
+        _db_children.get(_statement_label(statement)).observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine):
+    """
+    SQLAlchemy 엔진(AsyncEngine 이면 sync_engine)에 쿼리 지연 기록용 이벤트를 등록합니다.
+    """
+    from sqlalchemy import event
+
+    engine = getattr(engine, 'sync_engine', engine)
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+# --- stats() 수집 ---
+
+_stats_sources = {}
+
+
+class _StatsCollector:
+    """
+    등록된 stats() 결과를 수집 시점에 게이지로 변환합니다.
+    숫자 값은 lookback_<이름>_<키>, {키: {필드: 값}} 형태(호스트별 커넥션 풀 등)는 key 라벨을 붙입니다.
+    """
+
+    def collect(self):
+        for source, stats_fn in _stats_sources.items():
+            try:
+                stats = stats_fn()
+            except Exception as e:
+                logger.error("%s 통계 수집 실패: %s", source, e)
+                continue
+            nested = {}
+            for key, value in stats.items():
+                if isinstance(value, dict):
+                    for field, field_value in value.items():
+                        nested.setdefault(field, []).append((key, field_value))
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    yield GaugeMetricFamily(f"lookback_{source}_{key}", f"{source} {key}", value=value)
+            for field, values in nested.items():
+                gauge = GaugeMetricFamily(f"lookback_{source}_{field}", f"{source} {field}", labels=['key'])
+                for key, value in values:
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        gauge.add_metric([str(key)], value)
+                yield gauge
+
+
+REGISTRY.register(_StatsCollector())
+
+
+def register_stats(name: str, stats_fn):
+    """
+    수집 시점에 읽을 stats() 함수를 등록합니다.
+
+    Args:
+        name (str): 메트릭 이름 접두사 (예: 'event_cache' -> lookback_event_cache_hits)
+        stats_fn: dict 를 반환하는 함수
+    """
+    _stats_sources[name] = stats_fn
+
+
+def render_metrics() -> tuple:
+    """
+    Returns:
+        tuple: (본문 bytes, Content-Type)
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
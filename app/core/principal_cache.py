@@ -0,0 +1,126 @@
+# principal_cache.py
+# 인증된 사용자(principal) 캐시
+#
+# get_current_user 는 요청마다 JWT 를 검증하고 users 테이블을 조회하므로, 대시보드를 한 번 열 때
+# 같은 사용자 조회가 위젯 수만큼 반복됩니다. JWT 해시별로 검증된 클레임과 읽어 온 User 를
+# PRINCIPAL_CACHE_TTL 동안 (토큰 만료 시각을 넘지 않게) 보관해, 캐시에 있는 요청은 Postgres 커넥션을 쓰지 않습니다.
+# - 같은 토큰의 동시 조회는 진행 중인 조회 하나를 함께 기다립니다 (single-flight).
+# - 사용자 정보를 바꾸는 곳(프로필 수정, 로그인 시 get_or_create_user)에서 invalidate_user 를 호출합니다.
+# 캐시는 프로세스 메모리에만 있으므로 다른 프로세스의 변경은 TTL 이 지나야 반영됩니다.
+import asyncio
+import hashlib
+import time
+
+from cachetools import TLRUCache
+
+from app.core.config import settings
+
+
+def _token_key(token: str) -> str:
+    # 토큰 원문을 캐시 키로 들고 있지 않도록 해시 사용
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class PrincipalCache:
+    """
+    JWT 별 (클레임, User) 캐시
+
+    Args:
+        maxsize (int): 캐시할 최대 토큰 수 (넘으면 가장 오래 안 쓴 항목부터 제거)
+        ttl (float): 항목 보관 시간(초)
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.ttl = ttl
+        self._entries = TLRUCache(maxsize=maxsize, ttu=lambda key, value, now: value['expires_at'], timer=time.monotonic)
+        # 이메일 -> 토큰 키 (사용자 단위 무효화용)
+        self._keys_by_email = {}
+        self._inflight = {}
+        # 조회 중에 무효화가 있었으면 읽은 (이전) 사용자 정보를 저장하지 않도록 비교
+        self._invalidations = 0
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, token: str, claims: dict, user):
+        """
+        검증한 토큰의 클레임과 사용자를 저장합니다. 토큰 만료(exp) 이후까지 보관하지 않습니다.
+        """
+        now = time.monotonic()
+        ttl = self.ttl
+        if claims.get('exp') is not None:
+            ttl = min(ttl, float(claims['exp']) - time.time())
+        if ttl <= 0:
+            return
+        key = _token_key(token)
+        self._entries[key] = {'claims': claims, 'user': user, 'expires_at': now + ttl}
+        # 만료/제거된 토큰 키는 같은 사용자의 새 항목을 넣을 때 정리
+        keys = {existing for existing in self._keys_by_email.get(user.email, ()) if existing in self._entries}
+        keys.add(key)
+        self._keys_by_email[user.email] = keys
+
+    def get(self, token: str):
+        """
+        Returns:
+            tuple: (claims, user) 또는 None (없거나 만료된 경우)
+        """
+        entry = self._entries.get(_token_key(token))
+        if entry is None:
+            return None
+        return entry['claims'], entry['user']
+
+    async def get_or_load(self, token: str, load):
+        """
+        캐시된 (클레임, 사용자)를 반환하고, 없으면 load(token)으로 읽어 저장합니다.
+        같은 토큰에 대한 동시 호출은 진행 중인 load 하나를 함께 기다립니다.
+
+        Args:
+            token (str): JWT
+            load: token을 받아 (claims, user) 또는 None (인증 실패)을 돌려주는 코루틴 함수
+
+        Returns:
+            tuple: (claims, user) 또는 None
+        """
+        cached = self.get(token)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        key = _token_key(token)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, token, load))
+            self._inflight[key] = task
+        # 기다리던 요청 하나가 취소되어도 다른 요청이 공유하는 조회는 계속되도록 shield
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, token: str, load):
+        invalidations = self._invalidations
+        try:
+            principal = await load(token)
+            if principal is not None and invalidations == self._invalidations:
+                self.put(token, *principal)
+            return principal
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate_user(self, email: str):
+        """
+        사용자의 모든 토큰 항목을 버립니다. 사용자 정보를 바꾼 뒤 호출합니다.
+        """
+        self._invalidations += 1
+        for key in self._keys_by_email.pop(email, ()):
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_email.clear()
+
+    def stats(self) -> dict:
+        return {'cached': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL
+)
@@ -0,0 +1,349 @@
+# rate_limit.py
+# 구글 Calendar API 호출용 클라이언트 측 속도 제한 / 재시도
+#
+# 여러 사용자의 동기화가 동시에 돌면 구글의 사용자별·프로젝트별 할당량에 걸려
+# 403 rateLimitExceeded / userRateLimitExceeded 나 429 응답을 받게 됩니다.
+# 거절된 캘린더를 그냥 건너뛰지 않도록 모든 Calendar API 요청을 GoogleRateLimiter.request 로 보냅니다.
+# - 프로젝트 전체 / 사용자(액세스 토큰)별 토큰 버킷으로 초당 요청 수를 제한하고
+# - 동시 요청 수는 AIMD 로 조절합니다: 성공하면 조금씩 늘리고, 속도 제한 응답을 받으면 절반으로 줄입니다.
+# - 속도 제한 응답은 구글이 요청을 처리하지 않은 것이므로 메서드와 상관없이 재시도하고,
+#   5xx 응답과 연결 오류는 같은 요청을 다시 보내도 결과가 같은(idempotent) 요청만 재시도합니다.
+# - 재시도 대기는 지수 백오프 + full jitter 이며, Retry-After 헤더가 있으면 그 시간 이상 기다립니다.
+# 버킷/동시성 상태는 프로세스 메모리에만 있으므로 프로세스마다 설정값을 나눠 잡아야 합니다.
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+RETRYABLE_STATUS = frozenset({500, 502, 503, 504})
+# 403 중 잠시 뒤 다시 시도하면 되는 사유 (quotaExceeded 같은 일일 할당량 초과는 재시도하지 않음)
+RATE_LIMIT_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded'})
+
+
+class TokenBucket:
+    """
+    초당 rate 개씩 채워지는 토큰 버킷
+
+    토큰이 모자라면 먼저 온 요청부터 차례대로 기다리도록 잔량을 음수(예약)로 남깁니다.
+
+    Args:
+        rate (float): 초당 허용 요청 수
+        capacity (float): 한 번에 몰아서 보낼 수 있는 최대 요청 수
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float = None) -> float:
+        """
+        토큰 하나를 예약합니다.
+
+        Returns:
+            float: 토큰을 쓸 수 있을 때까지 기다려야 하는 시간(초)
+        """
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    def pause(self, seconds: float, now: float = None):
+        """앞으로 seconds 동안은 토큰이 생기지 않도록 합니다 (Retry-After 반영)."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class AIMDLimiter:
+    """
+    응답에 따라 동시 요청 수 한도를 조절하는 리미터 (Additive Increase / Multiplicative Decrease)
+
+    Args:
+        initial (float): 처음 동시 요청 수 한도
+        minimum (float): 최소 한도
+        maximum (float): 최대 한도
+        decrease (float): 속도 제한 응답 시 한도에 곱할 비율
+        cooldown (float): 한도를 연속으로 줄이지 않을 간격(초) - 동시에 받은 여러 거절은 한 번만 반영
+    """
+
+    def __init__(self, initial: float, minimum: float, maximum: float, decrease: float = 0.5, cooldown: float = 1.0):
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = None
+        self._waiters = deque()
+
+    def _wake(self):
+        # 깨우는 대기자에게 자리를 바로 넘겨 먼저 기다린 요청부터 실행
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def acquire(self):
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 자리를 넘겨받은 뒤 취소된 경우 다음 대기자에게 반납
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self):
+        # 한도만큼 성공하면 한도 1 증가
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def on_throttle(self, now: float = None):
+        now = time.monotonic() if now is None else now
+        if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+            return
+        self.limit = max(self.minimum, self.limit * self.decrease)
+        self._last_decrease = now
+        logger.info(f"구글 API 속도 제한 응답으로 동시 요청 한도를 {self.limit:.1f}(으)로 줄입니다")
+
+
+class RetryPolicy:
+    """
+    구글 API 응답/오류의 재시도 여부와 대기 시간
+
+    Args:
+        max_attempts (int): 첫 요청을 포함한 최대 시도 횟수
+        base_delay (float): 첫 재시도 최대 대기(초), 시도마다 두 배
+        max_delay (float): 최대 대기(초) - Retry-After 가 이보다 길면 재시도하지 않음
+    """
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @staticmethod
+    def rate_limit_reason(response: httpx.Response):
+        """
+        속도 제한 응답이면 사유를, 아니면 None 을 반환합니다.
+
+        Returns:
+            str: 'rateLimitExceeded', 'userRateLimitExceeded', 'tooManyRequests' 또는 None
+        """
+        if response.status_code == 429:
+            return 'tooManyRequests'
+        if response.status_code != 403:
+            return None
+        try:
+            errors = response.json().get('error', {}).get('errors', [])
+        except ValueError:
+            return None
+        for error in errors:
+            if error.get('reason') in RATE_LIMIT_REASONS:
+                return error['reason']
+        return None
+
+    @staticmethod
+    def retry_after(response: httpx.Response):
+        """Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 반환합니다 (없으면 None)."""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def backoff(self, attempt: int, retry_after: float = None) -> float:
+        """
+        attempt 번째 실패 뒤 기다릴 시간(초) - 지수 백오프에 full jitter 를 적용하고 Retry-After 이상으로 맞춤
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        return max(delay, retry_after or 0.0)
+
+    def should_retry_response(self, response: httpx.Response, idempotent: bool) -> bool:
+        if self.rate_limit_reason(response) is not None:
+            return True
+        return idempotent and response.status_code in RETRYABLE_STATUS
+
+
+class GoogleRateLimiter:
+    """
+    구글 API 요청을 토큰 버킷(프로젝트/사용자) + AIMD 동시성 + 재시도 정책으로 보냅니다.
+
+    Args:
+        project_bucket (TokenBucket): 프로세스 전체 요청 버킷
+        user_rate (float): 사용자별 초당 요청 수
+        user_burst (float): 사용자별 최대 연속 요청 수
+        concurrency (AIMDLimiter): 동시 요청 수 리미터
+        retry (RetryPolicy): 재시도 정책
+        max_users (int): 사용자별 버킷을 기억할 최대 사용자 수
+    """
+
+    def __init__(self, project_bucket: TokenBucket, user_rate: float, user_burst: float,
+                 concurrency: AIMDLimiter, retry: RetryPolicy, max_users: int = 10000):
+        self.project_bucket = project_bucket
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.concurrency = concurrency
+        self.retry = retry
+        # 마지막 요청 후 버킷이 다시 가득 찰 시간이 지나면 잊어도 같은 상태
+        self._user_buckets = TTLCache(maxsize=max_users, ttl=max(60.0, user_burst / user_rate), timer=time.monotonic)
+        self.counters = {'requests': 0, 'retries': 0, 'throttled': 0, 'gave_up': 0}
+
+    def _user_bucket(self, user_key: str) -> TokenBucket:
+        bucket = self._user_buckets.get(user_key)
+        if bucket is None:
+            bucket = TokenBucket(self.user_rate, self.user_burst)
+        # 조회마다 다시 넣어 TTL 연장
+        self._user_buckets[user_key] = bucket
+        return bucket
+
+    async def _acquire(self, user_bucket: TokenBucket):
+        if user_bucket is not None:
+            await user_bucket.acquire()
+        await self.project_bucket.acquire()
+        await self.concurrency.acquire()
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str, idempotent: bool = None,
+                      user_key: str = None, **kwargs) -> httpx.Response:
+        """
+        속도 제한과 재시도를 적용해 요청을 보냅니다.
+
+        Args:
+            client (httpx.AsyncClient): HTTP 클라이언트
+            method (str): HTTP 메서드
+            url (str): 요청 URL
+            idempotent (bool, optional): 다시 보내도 되는 요청인지 (기본값: 메서드로 판단)
+            user_key (str, optional): 사용자별 버킷 키 (기본값: Authorization 헤더)
+            **kwargs: client.request 인자 (headers, params, json 등)
+
+        Returns:
+            httpx.Response: 마지막 응답 (재시도를 모두 써도 실패하면 실패 응답 그대로)
+
+        Raises:
+            httpx.TransportError: 연결 오류 (재시도할 수 없거나 모두 실패한 경우)
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        if user_key is None:
+            user_key = (kwargs.get('headers') or {}).get('Authorization')
+        user_bucket = self._user_bucket(user_key) if user_key else None
+
+        attempt = 0
+        while True:
+            attempt += 1
+            await self._acquire(user_bucket)
+            self.counters['requests'] += 1
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                error = e
+                response = None
+            finally:
+                self.concurrency.release()
+
+            if response is None:
+                if not idempotent or attempt >= self.retry.max_attempts:
+                    self.counters['gave_up'] += 1
+                    raise error
+                delay = self.retry.backoff(attempt)
+                logger.info(f"구글 API 연결 오류 ({type(error).__name__}), {delay:.2f}초 뒤 재시도 ({attempt}/{self.retry.max_attempts})")
+                await self._wait(delay)
+                continue
+
+            reason = self.retry.rate_limit_reason(response)
+            if reason is None and response.status_code < 500:
+                self.concurrency.on_success()
+                return response
+
+            retry_after = self.retry.retry_after(response)
+            if reason is not None:
+                self.counters['throttled'] += 1
+                self.concurrency.on_throttle()
+                # 버킷도 Retry-After 동안 멈춰 같은 할당량을 쓰는 다른 요청이 바로 거절되지 않게 함
+                if retry_after:
+                    bucket = user_bucket if reason == 'userRateLimitExceeded' and user_bucket else self.project_bucket
+                    bucket.pause(retry_after)
+
+            if (not self.retry.should_retry_response(response, idempotent)
+                    or attempt >= self.retry.max_attempts
+                    or (retry_after or 0.0) > self.retry.max_delay):
+                if reason is not None or response.status_code >= 500:
+                    self.counters['gave_up'] += 1
+                return response
+
+            delay = self.retry.backoff(attempt, retry_after)
+            logger.info(
+                f"구글 API 응답 {response.status_code}{f' ({reason})' if reason else ''}, "
+                f"{delay:.2f}초 뒤 재시도 ({attempt}/{self.retry.max_attempts})"
+            )
+            await response.aclose()
+            await self._wait(delay)
+
+    async def _wait(self, delay: float):
+        self.counters['retries'] += 1
+        await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            'concurrency_limit': self.concurrency.limit,
+            'in_flight': self.concurrency.in_flight,
+            'tracked_users': len(self._user_buckets)
+        }
+
+
+google_rate_limiter = GoogleRateLimiter(
+    TokenBucket(settings.GOOGLE_RATE_PROJECT_QPS, settings.GOOGLE_RATE_PROJECT_BURST),
+    user_rate=settings.GOOGLE_RATE_USER_QPS,
+    user_burst=settings.GOOGLE_RATE_USER_BURST,
+    concurrency=AIMDLimiter(
+        settings.GOOGLE_CONCURRENCY_INITIAL,
+        settings.GOOGLE_CONCURRENCY_MIN,
+        settings.GOOGLE_CONCURRENCY_MAX
+    ),
+    retry=RetryPolicy(
+        settings.GOOGLE_RETRY_MAX_ATTEMPTS,
+        settings.GOOGLE_RETRY_BASE_DELAY,
+        settings.GOOGLE_RETRY_MAX_DELAY
+    )
+)
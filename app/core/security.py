@@ -1,3 +1,6 @@
+import base64
+import hashlib
+import hmac
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -21,12 +24,51 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str):
+def decode_token(token: str) -> Optional[dict]:
+    """
+    JWT 를 검증하고 클레임을 반환합니다.
+
+    Returns:
+        dict: 클레임 (sub 가 없거나 검증 실패 시 None)
+    """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        return email
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    if payload.get("sub") is None:
+        return None
+    return payload
+
+def verify_token(token: str):
+    payload = decode_token(token)
+    return payload["sub"] if payload is not None else None
+
+# 구글 푸시 알림 채널 토큰
+# 알림(X-Goog-Channel-Token)만으로 사용자를 알아내고 위조를 막기 위해
+# "<base64url(사용자 이메일)>.<HMAC(채널 ID, 사용자, 캘린더)>" 형식으로 만들어 DB 조회 없이 검증합니다.
+# 캘린더 ID는 구글이 보내는 X-Goog-Resource-URI 에서 얻습니다.
+
+def _channel_signature(channel_id: str, user_email: str, calendar_id: str) -> str:
+    message = f"{channel_id}|{user_email}|{calendar_id}".encode()
+    digest = hmac.new(SECRET_KEY.encode(), message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip('=')
+
+def create_channel_token(channel_id: str, user_email: str, calendar_id: str) -> str:
+    user_part = base64.urlsafe_b64encode(user_email.encode()).decode().rstrip('=')
+    return f"{user_part}.{_channel_signature(channel_id, user_email, calendar_id)}"
+
+def verify_channel_token(token: str, channel_id: str, calendar_id: str) -> Optional[str]:
+    """
+    채널 토큰을 검증합니다.
+
+    Returns:
+        str: 토큰이 올바르면 사용자 이메일, 아니면 None
+    """
+    try:
+        user_part, signature = token.split('.', 1)
+        user_email = base64.urlsafe_b64decode(user_part + '=' * (-len(user_part) % 4)).decode()
+    except (AttributeError, ValueError, UnicodeDecodeError):
+        return None
+    if not hmac.compare_digest(signature, _channel_signature(channel_id, user_email, calendar_id)):
+        return None
+    return user_email
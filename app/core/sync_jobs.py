@@ -0,0 +1,302 @@
+# sync_jobs.py
+# 구글 → DynamoDB 동기화 작업 큐와 워커 풀
+#
+# /sync-calendar, /sync-events 는 동기화를 HTTP 요청 안에서 하지 않고 작업을 큐에 넣은 뒤 작업 ID를 바로 돌려줍니다.
+# - 앱 lifespan 동안 워커 SYNC_JOB_WORKERS 개가 큐에서 작업을 꺼내 종류별 핸들러(register)로 실행하고
+# - 같은 사용자/종류의 작업이 이미 대기 중이면 새로 넣지 않고 대기 중인 작업을 돌려주며
+#   (full_sync 요청과 목록 옵션은 대기 중인 작업에 합침)
+# - 같은 사용자의 작업은 한 번에 하나만 실행합니다 (같은 파티션과 syncToken 을 동시에 고치지 않도록).
+#   사용자의 작업이 실행 중이면 꺼낸 작업을 그 사용자의 대기열에 넘기고 워커는 다음 작업을 꺼내므로,
+#   한 사용자의 작업 여러 개가 워커를 붙잡아 다른 사용자의 작업이 밀리지 않습니다.
+# - 워커를 멈추면(stop) 실행 중이던 작업과 아직 대기 중인 작업은 실패로 기록합니다.
+# 진행 상황(캘린더 수, 저장/삭제한 이벤트 수)은 GET /sync-jobs/{id} 로 조회합니다.
+#
+# 큐와 작업 기록은 SyncJobBackend 로 분리되어 있어, 기본값인 프로세스 내부 큐(InMemorySyncJobBackend)를
+# 외부 큐나 로컬 대체 구현으로 바꿔 끼울 수 있습니다. 백엔드에는 상태가 바뀔 때(대기/실행/완료) 저장합니다.
+import asyncio
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+class SyncJob:
+    """
+    동기화 작업 하나
+
+    Args:
+        kind (str): 작업 종류 ('calendar': 캘린더 리스트, 'events': 이벤트, 'calendar_events': 지정한 캘린더의 이벤트)
+        user_email (str): 사용자 이메일
+        options (dict, optional): 핸들러 옵션 (조회 응답에 포함, 예: {'full_sync': True})
+        credentials (dict, optional): 핸들러가 쓰는 인증 정보 (조회 응답에 포함하지 않음)
+    """
+
+    def __init__(self, kind: str, user_email: str, options: dict = None, credentials: dict = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.user_email = user_email
+        self.options = dict(options or {})
+        self.credentials = dict(credentials or {})
+        self.status = QUEUED
+        self.progress = {'calendars_total': 0, 'calendars_done': 0, 'events_written': 0, 'events_deleted': 0}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self) -> dict:
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'options': self.options,
+            'progress': self.progress,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class SyncJobBackend(ABC):
+    """
+    동기화 작업 큐와 작업 기록 저장소 인터페이스
+    """
+
+    @abstractmethod
+    async def enqueue(self, job: SyncJob):
+        """작업을 큐에 넣습니다."""
+
+    @abstractmethod
+    async def dequeue(self) -> SyncJob:
+        """다음 작업이 들어올 때까지 기다렸다가 꺼냅니다."""
+
+    @abstractmethod
+    async def save(self, job: SyncJob):
+        """작업 기록을 저장합니다 (상태가 바뀔 때마다 호출)."""
+
+    @abstractmethod
+    async def load(self, job_id: str) -> SyncJob:
+        """작업 기록을 반환합니다 (없거나 보관 기간이 지났으면 None)."""
+
+    @abstractmethod
+    def pending(self) -> int:
+        """대기 중인 작업 수"""
+
+
+class InMemorySyncJobBackend(SyncJobBackend):
+    """
+    프로세스 내부 asyncio.Queue 와 작업 기록 캐시
+
+    Args:
+        retention (float): 마지막 상태 변경 후 작업 기록 보관 시간(초)
+        max_records (int): 보관할 최대 작업 기록 수 (넘으면 오래된 것부터 제거)
+    """
+
+    def __init__(self, retention: float, max_records: int):
+        self._queue = None
+        self._queue_loop = None
+        self._records = TTLCache(maxsize=max_records, ttl=retention, timer=time.monotonic)
+
+    def _get_queue(self) -> asyncio.Queue:
+        # 큐는 만든 이벤트 루프에서만 쓸 수 있으므로 루프가 바뀌면 (테스트 등) 새로 생성
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._queue_loop is not loop:
+            self._queue = asyncio.Queue()
+            self._queue_loop = loop
+        return self._queue
+
+    async def enqueue(self, job: SyncJob):
+        self._get_queue().put_nowait(job)
+
+    async def dequeue(self) -> SyncJob:
+        return await self._get_queue().get()
+
+    async def save(self, job: SyncJob):
+        self._records[job.id] = job
+
+    async def load(self, job_id: str) -> SyncJob:
+        return self._records.get(job_id)
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+
+class SyncJobManager:
+    """
+    동기화 작업 제출 / 워커 풀
+
+    Args:
+        backend (SyncJobBackend): 작업 큐와 기록 저장소
+        workers (int): 동시에 실행할 작업 수
+    """
+
+    def __init__(self, backend: SyncJobBackend, workers: int):
+        self.backend = backend
+        self.workers = workers
+        self._handlers = {}
+        # (사용자, 종류) -> 아직 시작하지 않은 작업 (같은 작업 합치기, 종료 시 취소 기록용)
+        self._queued = {}
+        # 작업이 실행 중인 사용자 -> 그 뒤에 실행할 같은 사용자의 작업들
+        self._user_waiting = {}
+        self._tasks = []
+
+    def register(self, kind: str, handler):
+        """
+        작업 종류별 핸들러를 등록합니다.
+
+        Args:
+            kind (str): 작업 종류
+            handler: SyncJob 을 받아 결과 dict 를 돌려주는 코루틴 함수 (job.progress 를 갱신해도 됨)
+        """
+        self._handlers[kind] = handler
+
+    async def submit(self, kind: str, user_email: str, options: dict = None, credentials: dict = None) -> SyncJob:
+        """
+        작업을 큐에 넣습니다. 같은 사용자/종류의 작업이 아직 대기 중이면 그 작업을 돌려줍니다.
+
+        Returns:
+            SyncJob: 새로 넣었거나 이미 대기 중인 작업
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"등록되지 않은 동기화 작업 종류: {kind}")
+
+        queued = self._queued.get((user_email, kind))
+        if queued is not None and queued.status == QUEUED:
+            # 전체 동기화 요청은 대기 중인 증분 동기화를 전체 동기화로 바꿔 한 번만 실행
+            # 목록 옵션(예: 알림으로 바뀐 캘린더 ID)은 합집합으로 합침
+            for name, value in (options or {}).items():
+                current = queued.options.get(name)
+                if isinstance(value, list) and isinstance(current, list):
+                    queued.options[name] = current + [item for item in value if item not in current]
+                elif value is True or name not in queued.options:
+                    queued.options[name] = value
+            queued.credentials.update(credentials or {})
+            logger.info(f"사용자 {user_email}의 {kind} 동기화 작업 {queued.id}이(가) 이미 대기 중입니다")
+            return queued
+
+        job = SyncJob(kind, user_email, options, credentials)
+        self._queued[(user_email, kind)] = job
+        await self.backend.save(job)
+        await self.backend.enqueue(job)
+        logger.info(f"사용자 {user_email}의 {kind} 동기화 작업 {job.id} 등록 (대기 {self.backend.pending()}개)")
+        return job
+
+    async def get(self, job_id: str) -> SyncJob:
+        return await self.backend.load(job_id)
+
+    async def start(self):
+        """워커를 시작합니다. 앱 lifespan 시작 시 호출합니다."""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.ensure_future(self._worker(index)) for index in range(self.workers)]
+        logger.info(f"동기화 작업 워커 {self.workers}개 시작")
+
+    async def stop(self):
+        """
+        워커를 멈춥니다. 실행 중이던 작업과 아직 시작하지 않은 작업은 실패로 기록되어
+        상태를 조회하는 쪽이 계속 기다리지 않습니다.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        queued = list(self._queued.values())
+        self._queued.clear()
+        for job in queued:
+            job.status = FAILED
+            job.error = "서버 종료로 실행되지 않았습니다"
+            job.finished_at = time.time()
+            await self.backend.save(job)
+        if queued:
+            logger.info(f"대기 중이던 동기화 작업 {len(queued)}개를 실패로 기록했습니다")
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self.backend.dequeue()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"동기화 작업 워커 {index} 오류: {str(e)}")
+
+    async def _run(self, job: SyncJob):
+        # 이전 워커 종료 때 실패로 기록된 작업
+        if job.status != QUEUED:
+            return
+
+        # 같은 사용자의 작업이 실행 중이면 그 워커가 이어서 실행하도록 넘기고 바로 반환
+        # (시작 전까지는 대기 중 상태이므로 같은 작업 요청은 계속 이 작업에 합쳐짐)
+        waiting = self._user_waiting.get(job.user_email)
+        if waiting is not None:
+            waiting.append(job)
+            return
+
+        user_email = job.user_email
+        waiting = self._user_waiting[user_email] = deque()
+        try:
+            while True:
+                await self._execute(job)
+                if not waiting:
+                    break
+                job = waiting.popleft()
+        finally:
+            del self._user_waiting[user_email]
+
+    async def _execute(self, job: SyncJob):
+        key = (job.user_email, job.kind)
+        if self._queued.get(key) is job:
+            del self._queued[key]
+
+        job.status = RUNNING
+        job.started_at = time.time()
+        await self.backend.save(job)
+        logger.info(f"사용자 {job.user_email}의 {job.kind} 동기화 작업 {job.id} 시작")
+
+        try:
+            job.result = await self._handlers[job.kind](job)
+            job.status = SUCCEEDED
+            logger.info(f"동기화 작업 {job.id} 완료: {job.progress}")
+        except asyncio.CancelledError:
+            job.status = FAILED
+            job.error = "서버 종료로 중단되었습니다"
+            raise
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+            logger.error(f"동기화 작업 {job.id} 실패: {str(e)}")
+        finally:
+            job.finished_at = time.time()
+            await self.backend.save(job)
+
+    def stats(self) -> dict:
+        return {
+            'workers': len(self._tasks),
+            'pending': self.backend.pending(),
+            'running_users': len(self._user_waiting)
+        }
+
+
+sync_jobs = SyncJobManager(
+    InMemorySyncJobBackend(
+        retention=settings.SYNC_JOB_RETENTION,
+        max_records=settings.SYNC_JOB_MAX_RECORDS
+    ),
+    workers=settings.SYNC_JOB_WORKERS
+)
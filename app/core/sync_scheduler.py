@@ -0,0 +1,252 @@
+# sync_scheduler.py
+# 사용자별 주기적 백그라운드 동기화 스케줄러
+#
+# 사용자가 동기화 API 를 부르지 않아도 대시보드가 최신 상태를 유지하도록, refresh token 이 있는 사용자의
+# 증분 동기화('events' 작업)를 주기적으로 동기화 작업 큐(app.core.sync_jobs)에 넣습니다.
+# - 사용자별 주기는 증분 동기화에서 바뀐 이벤트 수(upserted + deleted)로 조정합니다.
+#   변경이 있으면 주기를 절반으로 줄이고, 없으면 1.5배로 늘립니다 (SYNC_SCHEDULER_MIN/MAX_INTERVAL 범위).
+#   전체 재동기화나 실패한 캘린더가 섞인 결과는 변경량을 알 수 없으므로 주기를 그대로 둡니다.
+# - 다음 실행 시각에 ±SYNC_SCHEDULER_JITTER 비율의 무작위 지연을 더해 실행이 한꺼번에 몰리지 않게 하고
+# - 스케줄러가 넣은 작업 중 끝나지 않은 작업은 SYNC_SCHEDULER_MAX_INFLIGHT 개를 넘지 않게 해
+#   구글 API 할당량과 DynamoDB 처리량을 보호합니다.
+# 주기는 프로세스 메모리에만 있으므로 여러 프로세스로 실행할 때는 한 프로세스에서만 켭니다.
+import asyncio
+import logging
+import random
+import time
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.sync_jobs import FAILED, SUCCEEDED, SyncJobManager, sync_jobs
+from app.db.database import async_session
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+async def load_active_users() -> dict:
+    """
+    주기 동기화 대상 사용자를 읽습니다.
+
+    Returns:
+        dict: {이메일: refresh token} (활성 상태이고 refresh token 이 있는 사용자)
+    """
+    async with async_session() as session:
+        result = await session.execute(
+            select(User.email, User.refresh_token).where(User.is_active.is_(True), User.refresh_token.isnot(None))
+        )
+        return {email: refresh_token for email, refresh_token in result.all()}
+
+
+async def load_refresh_token(user_email: str) -> str:
+    """
+    사용자 한 명의 refresh token 을 읽습니다 (사용자 요청 없이 시작되는 작업용, 예: 푸시 알림).
+
+    Returns:
+        str: refresh token 또는 None (비활성 사용자이거나 없는 경우)
+    """
+    async with async_session() as session:
+        result = await session.execute(
+            select(User.refresh_token).where(User.email == user_email, User.is_active.is_(True))
+        )
+        return result.scalar_one_or_none()
+
+
+class UserSchedule:
+    """
+    사용자 한 명의 동기화 주기 상태
+
+    Args:
+        refresh_token (str): 작업에 넘길 구글 refresh token
+        interval (float): 현재 동기화 주기(초)
+        next_run (float): 다음 실행 시각 (time.monotonic 기준)
+    """
+
+    def __init__(self, refresh_token: str, interval: float, next_run: float):
+        self.refresh_token = refresh_token
+        self.interval = interval
+        self.next_run = next_run
+        self.job_id = None
+        self.last_changes = None
+
+
+class SyncScheduler:
+    """
+    사용자별 적응형 주기 동기화 스케줄러
+
+    Args:
+        jobs (SyncJobManager): 작업을 넣을 동기화 작업 큐
+        load_users: {이메일: refresh token} 을 돌려주는 코루틴 함수
+        min_interval (float): 최소 주기(초)
+        max_interval (float): 최대 주기(초)
+        initial_interval (float): 새 사용자의 첫 주기(초)
+        jitter (float): 다음 실행 시각에 더할 무작위 비율 (0.2 이면 ±20%)
+        max_inflight (int): 스케줄러가 넣은 작업 중 동시에 끝나지 않은 작업 최대 수
+        tick (float): 실행할 사용자를 확인하는 간격(초)
+        user_refresh (float): 대상 사용자 목록을 다시 읽는 간격(초)
+    """
+
+    def __init__(self, jobs: SyncJobManager, load_users, min_interval: float, max_interval: float,
+                 initial_interval: float, jitter: float, max_inflight: int, tick: float, user_refresh: float):
+        self.jobs = jobs
+        self.load_users = load_users
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.jitter = jitter
+        self.max_inflight = max_inflight
+        self.tick = tick
+        self.user_refresh = user_refresh
+        self.schedules = {}
+        self._users_loaded_at = None
+        self._task = None
+        self.submitted = 0
+        self.deferred = 0
+
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def next_interval(self, interval: float, result: dict, failed: bool) -> float:
+        """
+        작업 결과로 다음 주기를 계산합니다.
+
+        Args:
+            interval (float): 현재 주기(초)
+            result (dict): store_calendar_events 동기화 통계
+            failed (bool): 작업 실패 여부
+
+        Returns:
+            float: 다음 주기(초)
+        """
+        if failed:
+            # 실패가 이어지는 사용자(토큰 만료 등)는 점점 덜 자주 시도
+            return min(self.max_interval, interval * 2)
+        if not result or result.get('full_sync_calendars') or result.get('failed_calendars'):
+            # 변경량을 알 수 없는 경우 (전체 재동기화, 속도 제한 등으로 일부 캘린더 실패)
+            return interval
+        if result.get('upserted', 0) + result.get('deleted', 0) > 0:
+            return max(self.min_interval, interval / 2)
+        return min(self.max_interval, interval * 1.5)
+
+    async def refresh_users(self, now: float):
+        """대상 사용자 목록을 다시 읽어 새 사용자는 첫 실행을 흩어서 잡고, 빠진 사용자는 제거합니다."""
+        users = await self.load_users()
+        for email, refresh_token in users.items():
+            schedule = self.schedules.get(email)
+            if schedule is None:
+                self.schedules[email] = UserSchedule(
+                    refresh_token,
+                    self.initial_interval,
+                    now + random.uniform(0, self.initial_interval)
+                )
+            else:
+                schedule.refresh_token = refresh_token
+        for email in [email for email in self.schedules if email not in users]:
+            del self.schedules[email]
+        self._users_loaded_at = now
+
+    async def collect_finished(self, now: float) -> int:
+        """
+        넣었던 작업 중 끝난 작업의 결과로 주기와 다음 실행 시각을 정합니다.
+
+        Returns:
+            int: 아직 끝나지 않은 작업 수
+        """
+        inflight = 0
+        for schedule in self.schedules.values():
+            if schedule.job_id is None:
+                continue
+            job = await self.jobs.get(schedule.job_id)
+            if job is not None and job.status not in (SUCCEEDED, FAILED):
+                inflight += 1
+                continue
+
+            failed = job is None or job.status == FAILED
+            result = job.result if job is not None else None
+            schedule.interval = self.next_interval(schedule.interval, result, failed)
+            schedule.next_run = now + self._jittered(schedule.interval)
+            schedule.last_changes = None if failed or not result else result.get('upserted', 0) + result.get('deleted', 0)
+            schedule.job_id = None
+        return inflight
+
+    async def run_once(self, now: float = None) -> int:
+        """
+        한 번 확인해 실행할 때가 된 사용자의 작업을 예산 안에서 넣습니다.
+
+        Returns:
+            int: 이번에 넣은 작업 수
+        """
+        now = time.monotonic() if now is None else now
+        if self._users_loaded_at is None or now - self._users_loaded_at >= self.user_refresh:
+            try:
+                await self.refresh_users(now)
+            except Exception as e:
+                # DB 를 읽지 못하면 지금까지의 사용자 목록으로 계속하고 user_refresh 뒤에 다시 시도
+                self._users_loaded_at = now
+                logger.error(f"주기 동기화 대상 사용자 조회 실패: {str(e)}")
+
+        budget = self.max_inflight - await self.collect_finished(now)
+        due = sorted(
+            (schedule.next_run, email)
+            for email, schedule in self.schedules.items()
+            if schedule.job_id is None and schedule.next_run <= now
+        )
+        if len(due) > budget:
+            # 예산을 넘는 사용자는 다음 확인 때 (가장 오래 기다린 사용자부터) 실행
+            self.deferred += len(due) - max(budget, 0)
+
+        submitted = 0
+        for _, email in due[:max(budget, 0)]:
+            schedule = self.schedules[email]
+            job = await self.jobs.submit('events', email, credentials={'refresh_token': schedule.refresh_token})
+            schedule.job_id = job.id
+            submitted += 1
+        self.submitted += submitted
+        return submitted
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"주기 동기화 스케줄러 오류: {str(e)}")
+            await asyncio.sleep(self.tick)
+
+    async def start(self):
+        """스케줄러를 시작합니다. 앱 lifespan 시작 시 호출합니다."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._loop())
+            logger.info("주기 동기화 스케줄러 시작")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        intervals = [schedule.interval for schedule in self.schedules.values()]
+        return {
+            'users': len(self.schedules),
+            'inflight': sum(1 for schedule in self.schedules.values() if schedule.job_id is not None),
+            'submitted': self.submitted,
+            'deferred': self.deferred,
+            'min_interval': min(intervals) if intervals else None,
+            'max_interval': max(intervals) if intervals else None
+        }
+
+
+sync_scheduler = SyncScheduler(
+    sync_jobs,
+    load_active_users,
+    min_interval=settings.SYNC_SCHEDULER_MIN_INTERVAL,
+    max_interval=settings.SYNC_SCHEDULER_MAX_INTERVAL,
+    initial_interval=settings.SYNC_SCHEDULER_INITIAL_INTERVAL,
+    jitter=settings.SYNC_SCHEDULER_JITTER,
+    max_inflight=settings.SYNC_SCHEDULER_MAX_INFLIGHT,
+    tick=settings.SYNC_SCHEDULER_TICK,
+    user_refresh=settings.SYNC_SCHEDULER_USER_REFRESH
+)
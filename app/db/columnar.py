@@ -0,0 +1,239 @@
+# columnar.py
+# 이벤트 아이템을 NumPy 열(column) 배열로 바꿔 대시보드 위젯 집계를 벡터 연산으로 계산
+#
+# 이벤트 아이템 목록(start_key 순)을 한 번만 파싱해
+#   start_ts / end_ts   : 시작/종료 시각 (epoch 초, 시간 지정 일정이 아니면 NaN)
+#   start_day / end_day : 일정에 적힌 시작/종료 날짜 (date ordinal, 없으면 -1)
+#                         dateTime 은 적힌 오프셋 기준 날짜(앞 10자리), date 는 그대로 - 기존 위젯과 같은 기준
+#   all_day             : 날짜만 있는(종일) 일정 여부
+#   calendar            : 캘린더 코드 (calendars 목록의 인덱스)
+#   creator / organizer : 만든 사람 / 주최자 이메일 코드 (emails 목록의 인덱스, 없으면 -1)
+# 동기화 때 정규화된 시각 필드(start_ts, start_day, all_day 등 - app.db.event_items.event_time_fields)가 있는
+# 아이템은 문자열을 파싱하지 않고 그대로 옮기며, 필드가 없는 이전 아이템만 원본 이벤트를 파싱합니다.
+# 배열로 보관하고, 위젯은 start_key 구간에 해당하는 [start, stop) 범위에 마스크와
+# np.bincount / np.minimum.reduceat 를 적용해 집계합니다.
+from datetime import date, datetime
+
+import numpy as np
+
+from app.db.event_items import EPOCH_ORDINAL
+
+KST_OFFSET_SECONDS = 9 * 3600
+SECONDS_PER_DAY = 86400
+# 1970-01-01 은 목요일 (월요일 = 0)
+EPOCH_WEEKDAY = 3
+
+
+def _parse_date(value) -> int:
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except (TypeError, ValueError):
+        return -1
+
+
+def _parse_timestamp(value) -> float:
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return np.nan
+    if parsed.tzinfo is None:
+        return np.nan
+    return parsed.timestamp()
+
+
+def _kst_minutes_of_day(timestamps: np.ndarray) -> np.ndarray:
+    # KST 기준 자정 이후 분 (초 단위는 버림, 기존 hour + minute / 60 계산과 같은 기준)
+    return (np.floor((timestamps + KST_OFFSET_SECONDS) / 60) % (SECONDS_PER_DAY // 60)).astype(np.int64)
+
+
+def _hours(minutes: np.ndarray) -> np.ndarray:
+    return (minutes // 60) + (minutes % 60) / 60
+
+
+class EventColumns:
+    """
+    이벤트 아이템 목록의 열 배열 표현
+
+    Args:
+        items (list): 이벤트 아이템 목록 (calendar_id, event 키 포함)
+    """
+
+    def __init__(self, items: list):
+        count = len(items)
+        self.start_ts = np.full(count, np.nan)
+        self.end_ts = np.full(count, np.nan)
+        self.start_day = np.full(count, -1, dtype=np.int32)
+        self.end_day = np.full(count, -1, dtype=np.int32)
+        self.all_day = np.zeros(count, dtype=bool)
+        self.calendar = np.zeros(count, dtype=np.int32)
+        self.creator = np.full(count, -1, dtype=np.int32)
+        self.organizer = np.full(count, -1, dtype=np.int32)
+
+        self.calendars = []
+        self.emails = []
+        calendar_codes = {}
+        email_codes = {}
+
+        def email_code(person) -> int:
+            email = person.get('email') if isinstance(person, dict) else None
+            if email is None:
+                return -1
+            code = email_codes.get(email)
+            if code is None:
+                code = email_codes[email] = len(self.emails)
+                self.emails.append(email)
+            return code
+
+        for index, item in enumerate(items):
+            calendar_id = item.get('calendar_id')
+            code = calendar_codes.get(calendar_id)
+            if code is None:
+                code = calendar_codes[calendar_id] = len(self.calendars)
+                self.calendars.append(calendar_id)
+            self.calendar[index] = code
+
+            event = item['event']
+            if 'all_day' in item:
+                self._copy_normalized(index, item)
+            else:
+                self._parse_event(index, event)
+
+            self.creator[index] = email_code(event.get('creator'))
+            self.organizer[index] = email_code(event.get('organizer'))
+
+        self.calendar_codes = calendar_codes
+        self.email_codes = email_codes
+        # 시작/종료 시각이 모두 있는 시간 지정 일정
+        self.timed = np.isfinite(self.start_ts) & np.isfinite(self.end_ts)
+
+    def _copy_normalized(self, index: int, item: dict):
+        # DynamoDB 숫자는 Decimal 로 읽히므로 int 로 변환
+        all_day = bool(item['all_day'])
+        self.all_day[index] = all_day
+        if 'start_day' in item:
+            self.start_day[index] = int(item['start_day']) + EPOCH_ORDINAL
+        if 'end_day' in item:
+            self.end_day[index] = int(item['end_day']) + EPOCH_ORDINAL
+        # 종일 일정의 start_ts/end_ts(KST 자정)는 시간 지정 일정 집계에 쓰지 않음
+        if not all_day:
+            if 'start_ts' in item:
+                self.start_ts[index] = int(item['start_ts'])
+            if 'end_ts' in item:
+                self.end_ts[index] = int(item['end_ts'])
+
+    def _parse_event(self, index: int, event: dict):
+        start = event.get('start') or {}
+        end = event.get('end') or {}
+        if 'dateTime' in start:
+            self.start_ts[index] = _parse_timestamp(start['dateTime'])
+            self.start_day[index] = _parse_date(start['dateTime'])
+        elif 'date' in start:
+            self.start_day[index] = _parse_date(start['date'])
+            self.all_day[index] = True
+        if 'dateTime' in end:
+            self.end_ts[index] = _parse_timestamp(end['dateTime'])
+            self.end_day[index] = _parse_date(end['dateTime'])
+        elif 'date' in end:
+            self.end_day[index] = _parse_date(end['date'])
+
+    def __len__(self) -> int:
+        return len(self.start_ts)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            column.nbytes
+            for column in (self.start_ts, self.end_ts, self.start_day, self.end_day, self.all_day,
+                           self.calendar, self.creator, self.organizer, self.timed)
+        )
+
+    def calendar_mask(self, start: int, stop: int, calendar_ids) -> np.ndarray:
+        """[start, stop) 범위에서 calendar_ids 에 속하는 아이템 마스크"""
+        codes = [self.calendar_codes[cal_id] for cal_id in calendar_ids if cal_id in self.calendar_codes]
+        return np.isin(self.calendar[start:stop], codes)
+
+    def weekly_minutes(self, start: int, stop: int, first_day: date, last_day: date) -> dict:
+        """
+        시작 또는 종료 날짜가 [first_day, last_day] 에 있는 시간 지정 일정의 길이(분) 합계를 캘린더별로 계산합니다.
+
+        Returns:
+            dict: {캘린더 ID: 분}
+        """
+        first, last = first_day.toordinal(), last_day.toordinal()
+        start_day = self.start_day[start:stop]
+        end_day = self.end_day[start:stop]
+        mask = self.timed[start:stop] & (
+            ((start_day >= first) & (start_day <= last)) | ((end_day >= first) & (end_day <= last))
+        )
+        minutes = (self.end_ts[start:stop][mask] - self.start_ts[start:stop][mask]) / 60
+        totals = np.bincount(self.calendar[start:stop][mask], weights=minutes, minlength=len(self.calendars))
+        return {cal_id: float(totals[code]) for cal_id, code in self.calendar_codes.items()}
+
+    def day_counts(self, start: int, stop: int, first_day: date, days: int, calendar_ids) -> list:
+        """
+        first_day 부터 days 일 동안 날짜별로 시작하는 일정 수를 계산합니다.
+
+        Returns:
+            list: 날짜 순서대로 일정 수
+        """
+        first = first_day.toordinal()
+        offsets = self.start_day[start:stop] - first
+        mask = (offsets >= 0) & (offsets < days) & self.calendar_mask(start, stop, calendar_ids)
+        return [int(count) for count in np.bincount(offsets[mask], minlength=days)]
+
+    def organizer_counts(self, start: int, stop: int, lower: datetime, upper: datetime) -> dict:
+        """
+        시작 시각이 [lower, upper] 인 시간 지정 일정 수를 주최자 이메일별로 계산합니다.
+
+        Returns:
+            dict: {주최자 이메일: 일정 수} (처음 나타난 순서)
+        """
+        start_ts = self.start_ts[start:stop]
+        organizer = self.organizer[start:stop]
+        mask = (start_ts >= lower.timestamp()) & (start_ts <= upper.timestamp()) & (organizer >= 0)
+        codes = organizer[mask]
+        if not len(codes):
+            return {}
+        counts = np.bincount(codes, minlength=len(self.emails))
+        # 이벤트에 처음 나타난 순서를 유지 (동점일 때 기존 집계와 같은 순서)
+        unique, first_index = np.unique(codes, return_index=True)
+        ordered = unique[np.argsort(first_index)]
+        return {self.emails[code]: int(counts[code]) for code in ordered}
+
+    def day_spans(self, start: int, stop: int, creator_email: str, first_day: date, last_day: date) -> dict:
+        """
+        creator_email 이 만든, 시작 날짜가 [first_day, last_day] 인 시간 지정 일정으로
+        요일별(KST) 첫 시작 시각과 마지막 종료 시각(시간 단위)을 계산합니다.
+
+        Returns:
+            dict: {요일(0: 월요일): (시작 시각, 종료 시각)}
+        """
+        creator = self.email_codes.get(creator_email)
+        if creator is None:
+            return {}
+        start_day = self.start_day[start:stop]
+        mask = (
+            self.timed[start:stop]
+            & (self.creator[start:stop] == creator)
+            & (start_day >= first_day.toordinal())
+            & (start_day <= last_day.toordinal())
+        )
+        start_ts = self.start_ts[start:stop][mask]
+        if not len(start_ts):
+            return {}
+        end_ts = self.end_ts[start:stop][mask]
+
+        weekday = ((np.floor((start_ts + KST_OFFSET_SECONDS) / SECONDS_PER_DAY).astype(np.int64) + EPOCH_WEEKDAY) % 7)
+        start_hours = _hours(_kst_minutes_of_day(start_ts))
+        end_hours = _hours(_kst_minutes_of_day(end_ts))
+
+        # 요일별로 정렬한 뒤 구간별 최소/최대
+        order = np.argsort(weekday, kind='stable')
+        weekday = weekday[order]
+        bounds = np.flatnonzero(np.r_[True, weekday[1:] != weekday[:-1]])
+        first_start = np.minimum.reduceat(start_hours[order], bounds)
+        last_end = np.maximum.reduceat(end_hours[order], bounds)
+        return {
+            int(day): (float(first), float(last))
+            for day, first, last in zip(weekday[bounds], first_start, last_end)
+        }
@@ -1,219 +1,257 @@
 # dynamo.py
-import json
-import traceback
+import hashlib
+from contextlib import aclosing
 
 import pytz
-from app.api.v1.endpoints import google, login
+from app.api.v1.endpoints import google
 from botocore.exceptions import ClientError
-from boto3.dynamodb.types import TypeSerializer
-from boto3.dynamodb.conditions import Key
-from app.api.v1.endpoints.google import get_calendar_events
+from boto3.dynamodb.conditions import Key, Attr
+from app.api.v1.endpoints.google import (
+    GoogleAuthError,
+    SyncTokenExpiredError,
+    calendar_fetch_slot,
+    create_user_fetch_limit,
+    iter_event_pages,
+)
 from datetime import datetime, timedelta, timezone
-from dateutil.parser import parse
-from dotenv import load_dotenv
-import boto3
-import os
+from app.core.http_client import shared_http_client
+from app.core.logging_config import log_payload
+from app.db import rollups
+from app.db.dynamo_client import get_table, iterate_items, run_dynamo
+from app.db.event_cache import EventSet, event_cache
+from app.db.watch_channels import ensure_watch_channels, watch_enabled
+from app.db.widgets import (
+    CalendarScheduleWidget,
+    CategoryWidget,
+    CreatedWeeklyEventsWidget,
+    DayEventCountWidget,
+    SpendingTimeWidget,
+    UPCOMING_DEFAULT_K,
+    UpcomingWidget,
+    WeeklyActivityWidget,
+    WeeklyEventsWidget,
+)
+from app.db.event_items import (
+    CALENDAR_LIST_TABLE,
+    CREATOR_INDEX,
+    EVENT_ITEMS_TABLE,
+    EVENT_KEY_INDEX,
+    SYNC_STATE_TABLE,
+    create_event_item,
+    make_event_key,
+    start_key_range,
+)
 import asyncio
 import logging
 import httpx
-import datetime as dt
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-load_dotenv()
-
-AWS_ACCESS_kEY_ID = os.environ.get("AWS_ACCESS_kEY_ID")
-AWS_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
-dynamodb_client = boto3.resource(
-   'dynamodb',
-   region_name='ap-northeast-2',
-   aws_access_key_id=AWS_ACCESS_kEY_ID,
-   aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-)
+
+# 기존 데이터 삭제 시 한 번에 batch_writer로 넘길 키 수
+DELETE_CHUNK_SIZE = 500
+
+def with_start_key_range(condition, lower: str = None, upper: str = None):
+    """
+    파티션 키 조건에 정렬 키(start_key) 범위 조건을 붙입니다. 제한이 없는 쪽(None)은 생략합니다.
+    """
+    if lower and upper:
+        return condition & Key('start_key').between(lower, upper)
+    elif lower:
+        return condition & Key('start_key').gte(lower)
+    elif upper:
+        return condition & Key('start_key').lte(upper)
+    return condition
+
+async def iter_event_items(user_email: str, start: datetime = None, end: datetime = None, calendar_id: str = None, **kwargs):
+    """
+    이벤트 단위 테이블에서 [start, end] 구간에 시작하는 사용자의 이벤트를
+    페이지를 따라가며 범위 조회합니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        start (datetime, optional): 조회 구간 시작
+        end (datetime, optional): 조회 구간 끝
+        calendar_id (str, optional): 특정 캘린더만 조회할 경우 캘린더 ID
+        **kwargs: iterate_items 옵션 (limit, page_size, projection 등)
+
+    Yields:
+        dict: 이벤트 아이템 (calendar_id, event 키를 포함)
+    """
+    table = get_table(EVENT_ITEMS_TABLE)
+
+    condition = with_start_key_range(Key('user_id').eq(user_email), *start_key_range(start, end))
+
+    if calendar_id is not None:
+        kwargs['FilterExpression'] = Attr('calendar_id').eq(calendar_id)
+
+    # 호출한 쪽이 중간에 멈추면 (break/예외) 미리 요청한 다음 페이지를 바로 취소
+    async with aclosing(iterate_items(table.query, KeyConditionExpression=condition, **kwargs)) as items:
+        async for item in items:
+            yield item
+
+async def query_event_items(user_email: str, start: datetime = None, end: datetime = None, calendar_id: str = None, **kwargs) -> list:
+    """
+    iter_event_items 결과를 리스트로 모아 반환합니다.
+
+    Returns:
+        list: 이벤트 아이템 리스트
+    """
+    return [item async for item in iter_event_items(user_email, start, end, calendar_id, **kwargs)]
 
 async def get_user_event(user_email: str, cal_id: str) -> float:
     
-    table = dynamodb_client.Table('lookback-calendar-events')
-    
-    this_week_events_time = 0.0
-    
-    response = table.query(
-            KeyConditionExpression=Key('user_id').eq(user_email) & Key('calendar_id').eq(cal_id))
-    
-    items = response['Items']
+    durations = await get_user_event_by_calendar(user_email, [cal_id])
     
-    for item in items:
-        this_week_events_time = filter_this_week(item['events'])
+    return durations[cal_id]
+
+async def get_user_event_by_calendar(user_email: str, cal_ids: list, now: datetime = None) -> dict:
+    """
+    이번주(KST) 캘린더별 활동 시간(분)을 한 번의 범위 조회로 계산합니다.
+    사용자 파티션을 한 번만 읽고 캘린더별로 메모리에서 나눠 집계합니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        cal_ids (list): 집계할 캘린더 ID 목록
+        now (datetime, optional): 기준 시각 (기본값: 현재 시각)
+
+    Returns:
+        dict: {캘린더 ID: 이번주 활동 시간(분)}
+    """
+    widget = SpendingTimeWidget([{'id': cal_id} for cal_id in cal_ids], now or datetime.now(timezone.utc))
+    await feed_widgets(user_email, [widget])
         
     logger.info("사용자 캘린더별 활동 시간 이번주 필터링 완료")
     
-    return this_week_events_time
-            
-            
-###사용자 캘린더 중 이번주에 해당하는 것만 필터링
-def filter_this_week(events):
-    
-    duration_time = 0.0
-    korea_tz = pytz.timezone("Asia/Seoul")
-    now_korea = datetime.now(korea_tz)
-    
-    start_of_week = (now_korea - timedelta(days=now_korea.weekday())).date() 
-    end_of_week = start_of_week + timedelta(days=6)
-    
-    for event in events:
-        try:
-            if 'start' not in event:
-                continue
+    return widget.durations()
             
-            if 'dateTime' in event['start']:
-                start = datetime.strptime(event['start']['dateTime'][:10], '%Y-%m-%d').date()
-                start_time = event['start']['dateTime']
-                
-                #일정 시작 시간 추출
-                start_time = datetime.fromisoformat(start_time)
-            else:
-                start = datetime.strptime(event['start']['date'], '%Y-%m-%d').date()
-                
-            if 'end' not in event:
-                continue
-                
-            if 'dateTime' in event['end']:
-                end = datetime.strptime(event['end']['dateTime'][:10] , '%Y-%m-%d').date()
-                end_time = event['end']['dateTime']
-                end_time = datetime.fromisoformat(end_time)
-            else:
-                end = datetime.strptime(event['end']['date'], '%Y-%m-%d').date()
-                
-            if start_of_week <= start <= end_of_week or start_of_week <= end <= end_of_week:
-                try:
-                    duration_time += (end_time - start_time).total_seconds() / 60
-                except Exception as e:
-                    print('error call ')
-                    
-                    print(f'error:{e}')
-        except Exception as e:
-            print(f'일정 처리 중 에러 발생: {e}')
             
-        
-    return duration_time
-
-async def find_one_week_event(user_email: str) -> dict:
-    
-    #오늘 기준 일주일 구하기 
-    one_week = find_one_week()
-    
-    #{date:요일} 딕셔너리 선언
-    week_datetime = {date.strftime("%Y-%m-%d"): date.strftime("%A") for date in one_week}
-    
-    #{요일:0} 딕셔너리 선언 
-    weekday_event_count = {weekday: 0 for weekday in week_datetime.values()}
+async def find_one_week_event(user_email: str, now: datetime = None) -> dict:
     
     #사용자 캘린더 리스트 가져오기 
     cal_list = await get_calendar_list_by_user(user_email)
     
-    table = dynamodb_client.Table('lookback-calendar-events')
+    #지난주 월요일 ~ 일요일 구간을 페이지 단위로 가져오면서 요일별 개수 집계
+    widget = DayEventCountWidget(cal_list, now or datetime.now(timezone.utc))
+    await feed_widgets(user_email, [widget])
     
-    for cal in cal_list:
-        cal_id = cal['id']
-        response = table.query(
-            KeyConditionExpression=Key('user_id').eq(user_email) & Key('calendar_id').eq(cal_id))
-        
-        print(f'현재 id:{cal_id}')
-        
-        #캘린더 데이터 가져오기 
-        items = response['Items']
-        try:
-            for item in items:
-                events = item['events']
-                for event in events:
-                    event_date = event['start'].get('dateTime') or event['start'].get('date')
-                    date_obj = datetime.fromisoformat(event_date)
-                    # 날짜만 추출해서 출력 (YYYY-MM-DD 형식)
-                    date_only = str(date_obj.date()) # datetime.date 객체로 변환
-                    if date_only in week_datetime:
-                        #print(date_only)
-                        weekday_event_count[week_datetime[date_only]] +=1
-                        print(f"요일별 데이터:{weekday_event_count}")
-        except Exception as e:
-            print(f"Error processing item: {e}")
-    
-    return weekday_event_count
+    return widget.result()
 
 
-def find_one_week():
-    today = dt.date.today()
-    this_week_monday = today - dt.timedelta(days=today.weekday())
-    last_week_monday = this_week_monday - dt.timedelta(days=7)
-    
-    last_week = [(last_week_monday + dt.timedelta(days=i)) for i in range(7)]
-    
-    return last_week
+async def upcomming_event_dict(user_email: str, k: int = UPCOMING_DEFAULT_K, horizon: timedelta = None, now: datetime = None) -> list:
+    """
+    지금 이후(horizon 이내) 가장 먼저 시작하는 일정 k개를 반환합니다.
+    메모리 캐시에 이벤트가 있으면 그 안에서, 없으면 now 부터 정렬 키 순으로 범위 조회하다가
+    k개가 모이면 다음 페이지를 읽지 않고 멈춥니다.
 
+    Args:
+        user_email (str): 사용자 이메일
+        k (int): 반환할 일정 수
+        horizon (timedelta, optional): 조회할 기간 (None이면 제한 없음)
+        now (datetime, optional): 기준 시각 (기본값: 현재 시각)
 
-async def upcomming_event_dict(user_email: str) -> list:
-    
-    #캘린더 데이터 저장할 리스트 -> 이중 리스트 형태가 됨 
-    calendar_data_list = []
+    Returns:
+        list: 시작 시각 순 [{'time', 'name', 'category'}]
+    """
+    cached = event_cache.get(user_email)
     
     #사용자 캘린더 리스트 가져오기 
-    cal_list = await get_calendar_list_by_user(user_email)
-    
-    table = dynamodb_client.Table('lookback-calendar-events')
+    cal_list = cached.calendar_list
+    if cal_list is None:
+        cal_list = await get_calendar_list_by_user(user_email)
+        if cal_list:
+            cached.set_calendar_list(cal_list)
+            event_cache.store(user_email, cached)
     
+    widget = UpcomingWidget(cal_list, now or datetime.now(timezone.utc), k, horizon)
+    lower, upper = start_key_range(*widget.window())
+    events = cached.sources.get('events')
+    if events is not None and events.covers(lower, upper):
+        await feed_widgets(user_email, [widget], cached)
+    else:
+        # k개가 모여 멈출 때 미리 요청한 다음 페이지 조회를 바로 취소하도록 aclosing
+        async with aclosing(iter_source_items(user_email, 'events', lower, upper)) as items:
+            async for item in items:
+                widget.add(item)
+                if widget.complete:
+                    break
     
-    for cal in cal_list:
-        cal_id = cal['id']
-        response = table.query(
-            KeyConditionExpression=Key('user_id').eq(user_email) & Key('calendar_id').eq(cal_id))
-        
-        #캘린더 데이터 가져오기 
-        items = response['Items']
-        
-        for item in items:
-            calendar_data_list.append(item['events'])
-            
-    
-    this_week_uppcoming = find_uppcoming_events(calendar_data_list)
-    
-    return this_week_uppcoming
+    return widget.result()
 
 
-def find_uppcoming_events(calendar_data_list:list ) -> list:
-    
-    result = []
+async def feed_widgets(user_email: str, widgets: list, cached=None):
+    """
+    위젯 집계기들이 필요로 하는 이벤트를 한 번씩만 읽어 각 집계기에 넘겨줍니다.
+    사용자 파티션은 위젯 조회 구간들의 합집합을 한 번 범위 조회하고,
+    creator-start-index 를 쓰는 위젯이 있으면 그 조회를 함께 진행합니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        widgets (list): app.db.widgets 의 위젯 집계기 목록
+        cached (CachedUser, optional): 이벤트 메모리 캐시 항목 - 구간을 포함하는 이벤트가 있으면 DynamoDB를 읽지 않음
+    """
+    await asyncio.gather(*(
+        _feed_widgets_from(user_email, [widget for widget in widgets if widget.source == source], source, cached)
+        for source in ('events', 'creator')
+    ))
+
+def widget_key_range(widgets: list) -> tuple:
+    """
+    위젯별 정렬 키 범위와 그 합집합 (하한, 상한) 을 반환합니다. (None 쪽은 제한 없음)
+    """
+    bounds = [start_key_range(*widget.window()) for widget in widgets]
+    lowers = [lower for lower, _ in bounds]
+    uppers = [upper for _, upper in bounds]
+    lower = None if None in lowers else min(lowers)
+    upper = None if None in uppers else max(uppers)
+    return bounds, lower, upper
+
+async def iter_source_items(user_email: str, source: str, lower: str = None, upper: str = None):
+    """
+    사용자 파티션('events') 또는 사용자가 만든 일정('creator', creator-start-index)을 정렬 키 범위로 조회합니다.
+    """
+    if source == 'creator':
+        condition = with_start_key_range(Key('creator_email').eq(user_email), lower, upper)
+        kwargs = {'IndexName': CREATOR_INDEX}
+    else:
+        condition = with_start_key_range(Key('user_id').eq(user_email), lower, upper)
+        kwargs = {}
     
-    flatten_data = [item for sublist in calendar_data_list for item in sublist]
-    sorted_data = sorted(flatten_data, key=get_start_datetime, reverse=True)
+    async with aclosing(iterate_items(get_table(EVENT_ITEMS_TABLE).query, KeyConditionExpression=condition, **kwargs)) as items:
+        async for item in items:
+            yield item
+
+async def _feed_widgets_from(user_email: str, widgets: list, source: str, cached=None):
+    if not widgets:
+        return
     
-    for data in sorted_data[:5]:
-        start_time = data['start'].get('dateTime') or data['start'].get('date')
-        category = data.get('organizer', {}).get('displayName')
-        summary = data.get('summary')
+    bounds, lower, upper = widget_key_range(widgets)
+    targets = list(zip(widgets, bounds))
     
-        # 딕셔너리 생성
-        event_info = {
-            'time': start_time,
-            'name': summary, 
-            'category': category
-            }
-        
-        result.append(event_info)
+    def dispatch(item):
+        start_key = item['start_key']
+        for widget, (widget_lower, widget_upper) in targets:
+            if (widget_lower is None or start_key >= widget_lower) and (widget_upper is None or start_key <= widget_upper):
+                widget.add(item)
     
-    return result
-
-def get_start_datetime(event):
-    start = event.get('start', {})
-    if 'dateTime' in start:  # dateTime이 있으면 사용
-        return parse(start['dateTime'])
-    elif 'date' in start:  # date만 있으면 UTC 기준 자정으로 설정
-        date_only = parse(start['date']).replace(tzinfo=timezone.utc)  # UTC 시간대 설정
-        return date_only
+    events = cached.sources.get(source) if cached is not None else None
+    if events is not None and events.covers(lower, upper):
+        # 메모리에 있으면 위젯별 구간을 잘라 열 배열로 한 번에 집계 (지원하지 않는 위젯은 아이템 단위)
+        for widget, (widget_lower, widget_upper) in targets:
+            start, stop = events.index_range(widget_lower, widget_upper)
+            if hasattr(widget, 'add_columns'):
+                widget.add_columns(events.columns, start, stop)
+            else:
+                for index in range(start, stop):
+                    widget.add(events.items[index])
+                    # 정렬 키 순서로 넘기므로 더 볼 필요가 없는 위젯(예: 다가오는 일정 k개)은 중단
+                    if getattr(widget, 'complete', False):
+                        break
+        return
     
-    return datetime.min.replace(tzinfo=timezone.utc)  # 시작 날짜가 없으면 최소값 반환
-
+    async with aclosing(iter_source_items(user_email, source, lower, upper)) as items:
+        async for item in items:
+            dispatch(item)
 
-    
-  
 
 def create_dynamodb_data(user_email: str, cal_list: dict) -> dict:
    """
@@ -237,7 +275,7 @@ def create_dynamodb_data(user_email: str, cal_list: dict) -> dict:
            for calendar in cal_list.get("items", [])
        ]
    }
-   logger.info(f"Transformed data for DynamoDB: {new_data}")
+   log_payload(logger, "Transformed data for DynamoDB", new_data)
    return new_data
 
 async def get_google_email(access_token: str) -> str:
@@ -249,23 +287,34 @@ async def get_google_email(access_token: str) -> str:
 
    Returns:
        str: 사용자 이메일 또는 None (조회 실패 시)
+
+   Raises:
+       GoogleAuthError: 액세스 토큰이 거부된 경우 (HTTP 401)
    """
    url = "https://www.googleapis.com/oauth2/v3/userinfo"
    headers = {"Authorization": f"Bearer {access_token}"}
    
-   async with httpx.AsyncClient() as client:
+   async with shared_http_client() as client:
        response = await client.get(url, headers=headers)
+       if response.status_code == 401:
+           google.raise_for_status(response)
        if response.status_code == 200:
            user_info = response.json()
            return user_info.get("email")
        return None
 
-async def put_calendar_list(access_token: str):
+async def put_calendar_list(access_token: str) -> int:
    """
    사용자의 Google 캘린더 리스트를 조회하여 DynamoDB에 저장합니다.
 
    Args:
        access_token (str): Google OAuth2 액세스 토큰
+
+   Returns:
+       int: 캘린더 수
+
+   Raises:
+       Exception: 저장/집계 갱신 실패 시 (동기화 작업이 실패로 기록되도록 다시 발생)
    """
    token_info = {"access_token": access_token}
    cal_data = await google.get_calendar_data(token_info)
@@ -275,12 +324,37 @@ async def put_calendar_list(access_token: str):
    cal_list = create_dynamodb_data(user_email, cal_data)
 
    try:
-       push_to_dynamodb_calendar_list(cal_list)
+       await run_dynamo(push_to_dynamodb_calendar_list, cal_list)
+       # 캘린더 이름/목록이 바뀌면 위젯 결과도 바뀌므로 메모리 캐시를 버리고 집계 갱신
+       event_cache.invalidate(user_email)
+       await refresh_dashboard_rollups(user_email)
+       # 바뀐 캘린더 목록에 맞게 푸시 알림 채널 등록/해지
+       await ensure_watch_channels(user_email, access_token, [calendar['id'] for calendar in cal_list['calendar']])
    except ClientError as e:
-       logger.error(f"ClientError: {e.response['Error']['Message']}")
+       event_cache.invalidate(user_email)
+       await discard_dashboard_rollups(user_email)
+       logger.error("ClientError: %s", e.response['Error']['Message'])
+       raise
    except Exception as e:
-       logger.error(f"Unexpected error: {str(e)}")
-       logger.error(f"상세 에러: {traceback.format_exc()}")
+       event_cache.invalidate(user_email)
+       await discard_dashboard_rollups(user_email)
+       logger.error("Unexpected error: %s", e)
+       logger.error("상세 에러", exc_info=True)
+       raise
+   
+   return len(cal_list['calendar'])
+
+async def renew_watch_channels(user_email: str, access_token: str) -> dict:
+   """
+   저장된 캘린더 리스트 기준으로 만료가 가까운 푸시 알림 채널을 갱신하고, 목록에 없는 캘린더의 채널을 해지합니다.
+
+   Returns:
+       dict: ensure_watch_channels 통계 또는 None (웹훅 미설정)
+   """
+   if not watch_enabled():
+       return None
+   calendar_list = await get_calendar_list_by_user(user_email)
+   return await ensure_watch_channels(user_email, access_token, [calendar['id'] for calendar in calendar_list])
 
 async def get_calendar_list_by_user(user_email: str) -> list:
    """
@@ -292,73 +366,385 @@ async def get_calendar_list_by_user(user_email: str) -> list:
    Returns:
        list: 캘린더 리스트 또는 빈 리스트 (조회 실패 시)
    """
-   table = dynamodb_client.Table("lookback-calendar-list")
+   table = get_table(CALENDAR_LIST_TABLE)
    
    try:
-       response = table.get_item(Key={'user_id': user_email})
+       response = await run_dynamo(table.get_item, Key={'user_id': user_email})
        return response.get('Item', {}).get('calendar', [])
    except Exception as e:
-       logger.error(f"Error getting calendar list from DynamoDB: {str(e)}")
+       logger.error("Error getting calendar list from DynamoDB: %s", e)
        return []
 
-async def store_calendar_events(user_email: str, access_token: str):
+async def store_calendar_events(user_email: str, access_token: str, full_sync: bool = False, progress: dict = None) -> dict:
     """
-    사용자의 모든 캘린더에 대한 이벤트를 조회하여 DynamoDB에 저장합니다.
-    먼저 사용자의 기존 데이터를 삭제한 후 새로운 데이터를 저장합니다.
+    사용자의 모든 캘린더에 대한 이벤트를 구글과 동기화하여 DynamoDB에 이벤트 단위로 저장합니다.
+    캘린더별로 저장된 syncToken이 있으면 변경/삭제된 이벤트만 받아 upsert/delete 하고,
+    syncToken이 없거나 만료(HTTP 410)된 캘린더는 기존 데이터를 지우고 전체를 다시 저장합니다.
+    캘린더들은 동시에 동기화되며, 각 캘린더는 페이지 단위로 받는 즉시 저장됩니다.
 
     Args:
         user_email (str): 사용자 이메일
         access_token (str): Google OAuth2 액세스 토큰
+        full_sync (bool): True이면 저장된 syncToken을 무시하고 전체 재동기화
+        progress (dict, optional): 진행 상황을 기록할 dict (동기화 작업 조회용)
+            {'calendars_total', 'calendars_done', 'events_written', 'events_deleted'}
+
+    Returns:
+        dict: 동기화 통계 {'calendars', 'upserted', 'deleted', 'full_sync_calendars', 'failed_calendars'}
+              failed_calendars 는 재시도 후에도 실패한 캘린더 (syncToken을 갱신하지 않아 다음 동기화에서 다시 받음)
+
+    Raises:
+        GoogleAuthError: 구글이 액세스 토큰을 거부한 경우 (새 토큰으로 다시 시도)
+        Exception: 캘린더 목록/syncToken 조회, 삭제, 집계 갱신 등 캘린더 단위가 아닌 단계가 실패한 경우
     """
-    table = dynamodb_client.Table("lookback-calendar-events")
+    stats = {'calendars': 0, 'upserted': 0, 'deleted': 0, 'full_sync_calendars': [], 'failed_calendars': []}
     
     try:
-        # 1. 먼저 사용자의 기존 데이터를 모두 삭제
-        response = table.query(
-            KeyConditionExpression='user_id = :uid',
-            ExpressionAttributeValues={
-                ':uid': user_email
-            }
-        )
+        calendar_list = await get_calendar_list_by_user(user_email)
+        calendar_ids = [calendar['id'] for calendar in calendar_list]
+        if progress is not None:
+            progress['calendars_total'] = len(calendar_ids)
+            progress['calendars_done'] = 0
+        sync_tokens = {} if full_sync else await get_sync_tokens(user_email)
         
-        with table.batch_writer() as batch:
-            for item in response.get('Items', []):
-                batch.delete_item(
-                    Key={
-                        'user_id': item['user_id'],
-                        'calendar_id': item['calendar_id']
-                    }
-                )
-        logger.info(f"사용자 {user_email}의 기존 데이터 삭제 완료")
+        # 1. syncToken이 하나도 없으면 (첫 동기화 또는 전체 재동기화) 사용자의 기존 데이터를 모두 삭제
+        if not sync_tokens:
+            stats['deleted'] += await delete_user_event_items(user_email)
+            if progress is not None:
+                progress['events_deleted'] += stats['deleted']
+            logger.info("사용자 %s의 기존 데이터 삭제 완료", user_email)
+        else:
+            # 캘린더 목록에서 빠진 캘린더의 데이터와 syncToken 정리
+            removed_ids = [calendar_id for calendar_id in sync_tokens if calendar_id not in calendar_ids]
+            if removed_ids:
+                stats['deleted'] += await delete_user_event_items(user_email, removed_ids)
+                await run_dynamo(delete_sync_tokens, user_email, removed_ids)
+                logger.info("목록에서 제외된 캘린더 %d개의 데이터 삭제 완료", len(removed_ids))
+            # syncToken이 없는 캘린더(첫 동기화가 중간에 실패했거나 토큰이 지워진 경우)는
+            # 남아 있을 수 있는 이전 데이터를 지우고 전체 동기화 (sync_calendar_events 와 같음)
+            missing_ids = [calendar_id for calendar_id in calendar_ids if calendar_id not in sync_tokens]
+            if missing_ids:
+                stats['deleted'] += await delete_user_event_items(user_email, missing_ids)
+            if progress is not None:
+                progress['events_deleted'] += stats['deleted']
+
+        # 2. 캘린더별 변경분 반영 - 캘린더들을 동시에 받아 페이지마다 바로 저장
+        user_limit = create_user_fetch_limit()
+        async with shared_http_client() as client:
+            results = await asyncio.gather(*(
+                sync_calendar(client, user_email, access_token, calendar_id, sync_tokens.get(calendar_id), user_limit, progress)
+                for calendar_id in calendar_ids
+            ), return_exceptions=True)
+        raise_auth_error(results)
         
-        # 2. 새로운 데이터 저장 프로세스
-        calendar_list = await get_calendar_list_by_user(user_email)
+        for calendar_id, result in zip(calendar_ids, results):
+            if result is None:
+                stats['failed_calendars'].append(calendar_id)
+                continue
+            stats['calendars'] += 1
+            stats['upserted'] += result['upserted']
+            stats['deleted'] += result['deleted']
+            if result['full_sync']:
+                stats['full_sync_calendars'].append(result['calendar_id'])
         
-        for calendar in calendar_list:
-            try:
-                calendar_id = calendar['id']
-                logger.info(f"캘린더 {calendar_id} 이벤트 처리 시작")
+        if stats['calendars'] < len(calendar_ids):
+            logger.info("%d개 캘린더는 이번 동기화에서 제외되었습니다", len(calendar_ids) - stats['calendars'])
+        
+        # 3. 이벤트 메모리 캐시를 버리고 대시보드 위젯 집계 갱신
+        event_cache.invalidate(user_email)
+        await refresh_dashboard_rollups(user_email)
                 
-                events = await get_calendar_events(access_token, [calendar_id])
-                logger.info(f"[이벤트 가져오기 완료] 캘린더 ID: {calendar_id}, 이벤트 수: {len(events[0].get('events', []))}")
-                if events and events[0]['events']:
-                    events_data = {
-                        'user_id': user_email,
-                        'calendar_id': calendar_id,
-                        'events': events[0]['events']
-                    }
-                    
-                    await push_to_dynamodb_events(events_data)
-                    logger.info(f"캘린더 {calendar_id} 이벤트 저장 완료")
-                else:
-                    logger.info(f"캘린더 {calendar_id}에 저장할 이벤트가 없습니다")
-            except Exception as e:
-                logger.error(f"캘린더 {calendar_id} 처리 중 오류 발생: {str(e)}")
+    except Exception as e:
+        # 일부 캘린더만 반영된 경우에도 이전 캐시와 동기화 이전에 만든 집계를 쓰지 않도록 무효화
+        event_cache.invalidate(user_email)
+        await discard_dashboard_rollups(user_email)
+        logger.error("전체 프로세스 중 오류 발생: %s", e)
+        logger.error("상세 오류", exc_info=True)
+        raise
+    
+    return stats
+
+async def sync_calendar_events(user_email: str, access_token: str, calendar_ids: list, progress: dict = None) -> dict:
+    """
+    지정한 캘린더만 증분 동기화합니다 (푸시 알림으로 변경이 확인된 캘린더).
+    저장된 syncToken이 없는 캘린더는 해당 캘린더의 기존 데이터를 지우고 전체를 다시 저장합니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        access_token (str): Google OAuth2 액세스 토큰
+        calendar_ids (list): 동기화할 캘린더 ID 목록
+        progress (dict, optional): 진행 상황을 기록할 dict (동기화 작업 조회용)
+
+    Returns:
+        dict: 동기화 통계 {'calendars', 'upserted', 'deleted', 'full_sync_calendars', 'failed_calendars', 'unknown_calendars'}
+              unknown_calendars 는 사용자 캘린더 목록에 없는 캘린더 (동기화하지 않음)
+
+    Raises:
+        Exception: 캘린더 단위가 아닌 단계가 실패한 경우 (store_calendar_events 와 같음)
+    """
+    stats = {'calendars': 0, 'upserted': 0, 'deleted': 0, 'full_sync_calendars': [], 'failed_calendars': [], 'unknown_calendars': []}
+    
+    try:
+        known_ids = {calendar['id'] for calendar in await get_calendar_list_by_user(user_email)}
+        stats['unknown_calendars'] = [calendar_id for calendar_id in calendar_ids if calendar_id not in known_ids]
+        calendar_ids = [calendar_id for calendar_id in calendar_ids if calendar_id in known_ids]
+        if progress is not None:
+            progress['calendars_total'] = len(calendar_ids)
+            progress['calendars_done'] = 0
+        if not calendar_ids:
+            return stats
+        sync_tokens = await get_sync_tokens(user_email)
+        
+        # syncToken이 없는 캘린더는 남아 있을 수 있는 이전 데이터를 지우고 전체 동기화
+        missing_ids = [calendar_id for calendar_id in calendar_ids if calendar_id not in sync_tokens]
+        if missing_ids:
+            stats['deleted'] += await delete_user_event_items(user_email, missing_ids)
+            if progress is not None:
+                progress['events_deleted'] += stats['deleted']
+        
+        user_limit = create_user_fetch_limit()
+        async with shared_http_client() as client:
+            results = await asyncio.gather(*(
+                sync_calendar(client, user_email, access_token, calendar_id, sync_tokens.get(calendar_id), user_limit, progress)
+                for calendar_id in calendar_ids
+            ), return_exceptions=True)
+        raise_auth_error(results)
+        
+        for calendar_id, result in zip(calendar_ids, results):
+            if result is None:
+                stats['failed_calendars'].append(calendar_id)
                 continue
-                
+            stats['calendars'] += 1
+            stats['upserted'] += result['upserted']
+            stats['deleted'] += result['deleted']
+            if result['full_sync']:
+                stats['full_sync_calendars'].append(result['calendar_id'])
+        
+        event_cache.invalidate(user_email)
+        await refresh_dashboard_rollups(user_email)
+    
     except Exception as e:
-        logger.error(f"전체 프로세스 중 오류 발생: {str(e)}")
-        logger.error(f"상세 오류: {traceback.format_exc()}")
+        event_cache.invalidate(user_email)
+        await discard_dashboard_rollups(user_email)
+        logger.error("캘린더 %s 동기화 중 오류 발생: %s", calendar_ids, e)
+        logger.error("상세 오류", exc_info=True)
+        raise
+    
+    return stats
+
+def raise_auth_error(results: list):
+    """
+    sync_calendar 결과 중 토큰 거부(GoogleAuthError)가 있으면 다시 발생시킵니다.
+    다른 캘린더의 조회가 모두 끝난 뒤 발생시키므로, 동기화 작업이 새 토큰으로 다시 시도할 때 진행 중인 조회가 남지 않습니다.
+    """
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+async def sync_calendar(client: httpx.AsyncClient, user_email: str, access_token: str, calendar_id: str,
+                        sync_token: str = None, user_limit: asyncio.Semaphore = None, progress: dict = None) -> dict:
+    """
+    캘린더 하나를 동시 조회 제한 안에서 동기화합니다.
+    syncToken이 만료(HTTP 410)되면 해당 캘린더의 데이터를 지우고 전체를 다시 저장합니다.
+    progress 가 있으면 끝난 캘린더 수를 (성공/실패 모두) 기록합니다.
+
+    Returns:
+        dict: {'calendar_id', 'upserted', 'deleted', 'full_sync'} 또는 None (실패 시)
+
+    Raises:
+        GoogleAuthError: 액세스 토큰이 거부된 경우 (다른 캘린더도 실패하므로 캘린더 단위로 처리하지 않음)
+    """
+    async with calendar_fetch_slot(user_limit or create_user_fetch_limit(1)):
+        try:
+            logger.info("캘린더 %s 이벤트 처리 시작", calendar_id)
+            try:
+                result = await store_event_pages(
+                    user_email, calendar_id,
+                    iter_event_pages(client, access_token, calendar_id, sync_token),
+                    progress
+                )
+            except SyncTokenExpiredError:
+                logger.info("캘린더 %s의 syncToken 만료, 전체 동기화로 전환", calendar_id)
+                deleted = await delete_user_event_items(user_email, [calendar_id])
+                if progress is not None:
+                    progress['events_deleted'] += deleted
+                result = await store_event_pages(
+                    user_email, calendar_id,
+                    iter_event_pages(client, access_token, calendar_id),
+                    progress
+                )
+                result['deleted'] += deleted
+            logger.info("캘린더 %s 이벤트 저장 완료 (upsert %d, delete %d)", calendar_id, result['upserted'], result['deleted'])
+            return result
+        except GoogleAuthError:
+            raise
+        except httpx.HTTPStatusError as e:
+            logger.error("캘린더 %s의 이벤트 가져오기 실패: %s", calendar_id, e.response.status_code)
+        except Exception as e:
+            logger.error("캘린더 %s 처리 중 오류 발생: %s", calendar_id, e)
+        finally:
+            if progress is not None:
+                progress['calendars_done'] += 1
+        return None
+
+async def store_event_pages(user_email: str, calendar_id: str, pages, progress: dict = None) -> dict:
+    """
+    iter_event_pages가 yield 하는 페이지를 받는 대로 저장하고, 마지막 페이지의 syncToken을 저장합니다.
+    저장이 모두 끝난 뒤에만 syncToken을 갱신하므로 실패 시 다음 동기화에서 같은 변경분을 다시 받습니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        calendar_id (str): 캘린더 ID
+        pages: iter_event_pages 비동기 제너레이터
+        progress (dict, optional): 페이지마다 저장/삭제한 이벤트 수를 더할 진행 상황 dict
+
+    Returns:
+        dict: {'calendar_id', 'upserted', 'deleted', 'full_sync'}
+    """
+    result = {'calendar_id': calendar_id, 'upserted': 0, 'deleted': 0, 'full_sync': False}
+    next_sync_token = None
+    
+    async for page in pages:
+        result['full_sync'] = page['full_sync']
+        # 전체 동기화는 기존 데이터를 이미 지웠으므로 기존 키 조회 생략
+        upserted, deleted = await apply_event_changes(
+            user_email, calendar_id, page['events'], lookup_existing=not page['full_sync']
+        )
+        result['upserted'] += upserted
+        result['deleted'] += deleted
+        if progress is not None:
+            progress['events_written'] += upserted
+            progress['events_deleted'] += deleted
+        next_sync_token = page['next_sync_token'] or next_sync_token
+    
+    if next_sync_token:
+        await run_dynamo(put_sync_token, user_email, calendar_id, next_sync_token)
+    return result
+
+async def apply_event_changes(user_email: str, calendar_id: str, events: list, lookup_existing: bool = True) -> tuple:
+    """
+    구글에서 받은 이벤트 변경분을 이벤트 단위 테이블에 반영합니다.
+    취소(status == 'cancelled')된 이벤트는 삭제하고, 나머지는 upsert 합니다.
+    시작 시각이 바뀌면 정렬 키도 바뀌므로 이전 키의 아이템은 삭제합니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        calendar_id (str): 캘린더 ID
+        events (list): 구글 이벤트 리스트
+        lookup_existing (bool): 기존 아이템 키를 event-key-index 로 찾을지 여부
+                                (전체 동기화로 기존 데이터를 이미 지운 경우 False)
+
+    Returns:
+        tuple: (upsert 한 아이템 수, 삭제한 아이템 수)
+    """
+    events = [event for event in events if event.get('id')]
+    if lookup_existing:
+        existing_keys = await asyncio.gather(
+            *(find_event_item_keys(user_email, calendar_id, event['id']) for event in events)
+        )
+    else:
+        existing_keys = [[] for _ in events]
+    
+    put_items, delete_keys = [], []
+    for event, keys in zip(events, existing_keys):
+        item = None if event.get('status') == 'cancelled' else create_event_item(user_email, calendar_id, event)
+        for key in keys:
+            if item is None or key['start_key'] != item['start_key']:
+                delete_keys.append(key)
+        if item is not None:
+            put_items.append(item)
+    
+    if put_items or delete_keys:
+        await run_dynamo(push_to_dynamodb_event_items, put_items, delete_keys)
+    return len(put_items), len(delete_keys)
+
+async def find_event_item_keys(user_email: str, calendar_id: str, event_id: str) -> list:
+    """
+    event-key-index 로 이벤트의 기존 아이템 키를 찾습니다.
+
+    Returns:
+        list: [{'user_id', 'start_key', ...}] 형태의 키 리스트 (없으면 빈 리스트)
+    """
+    table = get_table(EVENT_ITEMS_TABLE)
+    return [
+        key async for key in iterate_items(
+            table.query,
+            IndexName=EVENT_KEY_INDEX,
+            KeyConditionExpression=Key('event_key').eq(make_event_key(user_email, calendar_id, event_id))
+        )
+    ]
+
+async def delete_user_event_items(user_email: str, calendar_ids: list = None) -> int:
+    """
+    사용자의 이벤트 아이템을 삭제합니다. 키만 페이지 단위로 조회하면서 바로 삭제합니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        calendar_ids (list, optional): 주어지면 해당 캘린더의 아이템만 삭제
+
+    Returns:
+        int: 삭제한 아이템 수
+    """
+    table = get_table(EVENT_ITEMS_TABLE)
+    query_kwargs = {
+        'KeyConditionExpression': Key('user_id').eq(user_email),
+        'projection': 'user_id, start_key'
+    }
+    if calendar_ids is not None:
+        query_kwargs['FilterExpression'] = Attr('calendar_id').is_in(list(calendar_ids))
+    
+    deleted = 0
+    keys = []
+    async with aclosing(iterate_items(table.query, **query_kwargs)) as items:
+        async for key in items:
+            keys.append(key)
+            if len(keys) >= DELETE_CHUNK_SIZE:
+                await run_dynamo(push_to_dynamodb_event_items, [], keys)
+                deleted += len(keys)
+                keys = []
+    if keys:
+        await run_dynamo(push_to_dynamodb_event_items, [], keys)
+        deleted += len(keys)
+    return deleted
+
+async def get_sync_tokens(user_email: str) -> dict:
+    """
+    사용자의 캘린더별 syncToken을 조회합니다.
+
+    Returns:
+        dict: {캘린더 ID: syncToken}
+    """
+    table = get_table(SYNC_STATE_TABLE)
+    try:
+        return {
+            item['calendar_id']: item['sync_token']
+            async for item in iterate_items(table.query, KeyConditionExpression=Key('user_id').eq(user_email))
+            if item.get('sync_token')
+        }
+    except Exception as e:
+        logger.error("Error getting sync tokens from DynamoDB: %s", e)
+        return {}
+
+def put_sync_token(user_email: str, calendar_id: str, sync_token: str):
+    """
+    캘린더의 nextSyncToken을 저장합니다.
+    """
+    table = get_table(SYNC_STATE_TABLE)
+    table.put_item(Item={
+        'user_id': user_email,
+        'calendar_id': calendar_id,
+        'sync_token': sync_token,
+        'updated_at': datetime.now(timezone.utc).isoformat()
+    })
+
+def delete_sync_tokens(user_email: str, calendar_ids: list):
+    """
+    캘린더들의 syncToken을 삭제합니다.
+    """
+    table = get_table(SYNC_STATE_TABLE)
+    with table.batch_writer() as batch:
+        for calendar_id in calendar_ids:
+            batch.delete_item(Key={'user_id': user_email, 'calendar_id': calendar_id})
 
 def push_to_dynamodb_calendar_list(dynamodb_item: dict):
    """
@@ -367,7 +753,7 @@ def push_to_dynamodb_calendar_list(dynamodb_item: dict):
    Args:
        dynamodb_item (dict): 저장할 캘린더 리스트 데이터
    """
-   table = dynamodb_client.Table("lookback-calendar-list")
+   table = get_table(CALENDAR_LIST_TABLE)
    item = {
        "user_id": dynamodb_item["user_id"],
        "calendar": dynamodb_item["calendar"]
@@ -377,84 +763,55 @@ def push_to_dynamodb_calendar_list(dynamodb_item: dict):
        table.put_item(Item=item)
        logger.info("Successfully inserted item into DynamoDB")
    except Exception as e:
-       logger.error(f"Error inserting item into DynamoDB: {str(e)}")
+       logger.error("Error inserting item into DynamoDB: %s", e)
 
-async def push_to_dynamodb_events(events_data: dict):
+def push_to_dynamodb_event_items(event_items: list, delete_keys: list = ()):
    """
-   캘린더 이벤트를 DynamoDB에 저장합니다.
+   이벤트 아이템들을 이벤트 단위 테이블에 배치로 저장/삭제합니다.
+   실패 시 호출한 쪽에서 syncToken을 갱신하지 않도록 예외를 다시 발생시킵니다.
 
    Args:
-       events_data (dict): 저장할 이벤트 데이터
+       event_items (list): create_event_item으로 만든 저장할 아이템 리스트
+       delete_keys (list): 삭제할 아이템 키 리스트 (user_id, start_key)
    """
-   table = dynamodb_client.Table("lookback-calendar-events")
+   table = get_table(EVENT_ITEMS_TABLE)
    
    try:
-       table.put_item(Item=events_data)
-       logger.info(f"Successfully stored events for calendar {events_data['calendar_id']}")
+       with table.batch_writer(overwrite_by_pkeys=['user_id', 'start_key']) as batch:
+           for key in delete_keys:
+               batch.delete_item(Key={'user_id': key['user_id'], 'start_key': key['start_key']})
+           for item in event_items:
+               batch.put_item(Item=item)
+       logger.info("Successfully stored %d event items, deleted %d", len(event_items), len(delete_keys))
    except Exception as e:
-       logger.error(f"Error storing events in DynamoDB: {str(e)}")
+       logger.error("Error storing events in DynamoDB: %s", e)
+       raise
 
 
-from datetime import datetime, timedelta
 
-# 사용자 별로 미리 필터링해서 데이터 가져오기
-async def get_weekly_activity_data_per_user(user_email: str) -> dict:
-    table = dynamodb_client.Table("lookback-calendar-events")
+def log_widget_events(widget):
+    logger.info("[조회 기간] %s ~ %s", widget.this_week_start, widget.this_week_end)
+    logger.info("[필터링 후 데이터 수] %d개", len(widget.events))
+    log_payload(logger, "[필터링 된 데이터 샘플]", widget.events[:2])  # 처음 2개만 로깅
 
-
-
-    
+# 사용자 별로 미리 필터링해서 데이터 가져오기
+async def get_weekly_activity_data_per_user(user_email: str, now: datetime = None) -> dict:
     try:
-        # 1. 조회 기간 설정
-        today = datetime.now(pytz.UTC)
-        this_week_start = today - timedelta(days=today.weekday())
-        this_week_end = this_week_start + timedelta(days=6)
-        
-        this_week_start = this_week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-        this_week_end = this_week_end.replace(hour=23, minute=59, second=59)
-
-        logger.info(f"[현재 사용자] {user_email}")
-        logger.info(f"[조회 기간] {this_week_start.strftime('%Y-%m-%d %H:%M')} ~ {this_week_end.strftime('%Y-%m-%d %H:%M')}")
-
-        # 2. 데이터 조회
+        logger.info("[현재 사용자] %s", user_email)
         
-
-        response = table.query(
-            KeyConditionExpression=Key('user_id').eq(user_email)
-        )
+        # 조회 기간에 시작하는 시간 지정 일정만 페이지가 도착하는 대로 필터링
+        widget = WeeklyEventsWidget([], now or datetime.now(pytz.UTC))
+        await feed_widgets(user_email, [widget])
+        log_widget_events(widget)
         
-        raw_events = response.get('Items', [])
-        logger.info(f"[전체 데이터 수] {len(raw_events)}개")
-        # logger.info(f"[데이터 구조 확인] {raw_events[:1]}")  # 첫 번째 데이터의 구조 확인
-        
-        # 3. 조회 기간에 해당하는 데이터만 필터링
-        filtered_events = []
-        for event in raw_events:
-            try:
-                if 'events' in event:  # events 배열이 있는 경우
-                    for sub_event in event['events']:
-                        if 'start' in sub_event and 'dateTime' in sub_event['start']:
-                            event_time = datetime.fromisoformat(sub_event['start']['dateTime'])
-                            if this_week_start <= event_time <= this_week_end:
-                                filtered_events.append(sub_event)
-            except Exception as sub_e:
-                logger.error(f"이벤트 처리 중 오류: {str(sub_e)}")
-                continue
-                
-        logger.info(f"[필터링 후 데이터 수] {len(filtered_events)}개")
-        logger.info(f"[필터링 된 데이터 샘플]\n{filtered_events[:2]}")  # 처음 2개만 로깅
-        
-        return {
-            'events': filtered_events,
-            'this_week_start': this_week_start.isoformat()
-        }
+        return widget.result()
         
     except Exception as e:
-        logger.error(f"조회 중 오류: {str(e)}")
-        logger.error(f"전체 오류 내용: {traceback.format_exc()}")
+        logger.error("조회 중 오류: %s", e)
+        logger.error("전체 오류 내용", exc_info=True)
         return {'events': [], 'this_week_start': None}
 
-async def get_monthly_activity_data_per_user(user_email: str) -> dict:
+async def get_monthly_activity_data_per_user(user_email: str, now: datetime = None) -> dict:
     '''
         {
   "events": [
@@ -477,194 +834,321 @@ async def get_monthly_activity_data_per_user(user_email: str) -> dict:
   "this_month_start": "2025-01-01T00:00:00+00:00"  // 이번 달 시작 날짜 (ISO 8601 형식)
 }
     '''
-    table = dynamodb_client.Table("lookback-calendar-events")
-    
     try:
-        # 1. 조회 기간 설정 (이번 달의 시작과 끝 날짜 계산)
-        today = datetime.now(pytz.UTC)
-        first_day_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        last_day_of_month = (first_day_of_month.replace(month=today.month + 1, day=1) - timedelta(days=1))
+        # 이번 달 (로컬 날짜 기준 필터를 위해 앞뒤 여유를 두고 범위 조회)
+        widget = CalendarScheduleWidget([], now or datetime.now(pytz.UTC))
+        await feed_widgets(user_email, [widget])
 
-        logger.info(f"[조회 기간] {first_day_of_month.strftime('%Y-%m-%d %H:%M')} ~ {last_day_of_month.strftime('%Y-%m-%d %H:%M')}")
-
-        # 2. 데이터 조회
-        response = table.query(
-            KeyConditionExpression=Key('user_id').eq(user_email)  # 사용자 이메일로 필터링
-        )
-        raw_events = response.get('Items', [])
-        logger.info(f"[전체 데이터 수] {len(raw_events)}개")
+        logger.info("[조회 기간] %s ~ %s", widget.month_start, widget.month_end)
+        logger.info("[필터링 후 데이터 수] %d개", len(widget.events))
+        log_payload(logger, "[필터링 된 데이터 샘플]", widget.events[:2])  # 처음 2개만 로깅
 
-        filtered_events = []
-        for event in raw_events:
-            try:
-                if 'events' in event:
-                    for sub_event in event['events']:
-                        processed_sub_event = sub_event.copy()  # 원본 이벤트 복사
-                        
-                        if 'start' in sub_event:
-                            # 날짜만 있는 경우 처리
-                            if 'date' in sub_event.get('start', {}):
-                                start_date = datetime.strptime(sub_event['start']['date'], '%Y-%m-%d')
-                                end_date = datetime.strptime(sub_event['end']['date'], '%Y-%m-%d') - timedelta(days=1)
-                                event_date = start_date.strftime('%Y-%m-%d')
-                            
-                            # datetime이 있는 경우 처리
-                            elif 'dateTime' in sub_event.get('start', {}):
-                                event_time = datetime.fromisoformat(sub_event['start']['dateTime'])
-                                end_time = datetime.fromisoformat(sub_event['end']['dateTime'])
-                                event_date = event_time.strftime('%Y-%m-%d')
-
-                                # start와 end 객체에 date 추가
-                                processed_sub_event['start']['date'] = event_date
-                                processed_sub_event['end']['date'] = end_time.strftime('%Y-%m-%d')
-
-                                # 종료 시간이 자정인 경우 처리
-                                if end_time.time() == datetime.min.time():
-                                    end_time = end_time - timedelta(seconds=1)
-                                    processed_sub_event['end']['date'] = (end_time - timedelta(days=1)).strftime('%Y-%m-%d')
-
-                            # 이벤트 시간이 이번 달에 속하는지 확인
-                            month_start = first_day_of_month.strftime('%Y-%m-%d')
-                            month_end = last_day_of_month.strftime('%Y-%m-%d')
-
-                            if month_start <= event_date <= month_end:
-                                filtered_events.append(processed_sub_event)
-
-            except Exception as sub_e:
-                logger.error(f"이벤트 처리 중 오류: {str(sub_e)}")
-                continue
-
-        logger.info(f"[필터링 후 데이터 수] {len(filtered_events)}개")
-        logger.info(f"[필터링 된 데이터 샘플]\n{filtered_events[:2]}")  # 처음 2개만 로깅
-        
-        result = {
-            'events': filtered_events,
-            'this_month_start': first_day_of_month.isoformat()
-        }
-
-        return result
+        return widget.result()
         
     except Exception as e:
-        logger.error(f"조회 중 오류: {str(e)}")
-        logger.error(f"전체 오류 내용: {traceback.format_exc()}")
+        logger.error("조회 중 오류: %s", e)
+        logger.error("전체 오류 내용", exc_info=True)
         return {'events': [], 'this_month_start': None}
 
-async def get_weekly_activity_data(user_email: str) -> dict:
-    table = dynamodb_client.Table("lookback-calendar-events")
-    
+async def get_weekly_activity_data(user_email: str, now: datetime = None) -> dict:
     try:
-        # 1. 조회 기간 설정
-        today = datetime.now(pytz.UTC)
-        this_week_start = today - timedelta(days=today.weekday())
-        this_week_end = this_week_start + timedelta(days=5)
-        
-        this_week_start = this_week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-        this_week_end = this_week_end.replace(hour=23, minute=59, second=59)
-
-        logger.info(f"[조회 기간] {this_week_start.strftime('%Y-%m-%d %H:%M')} ~ {this_week_end.strftime('%Y-%m-%d %H:%M')}")
+        # 사용자가 만든 일정 중 이번 주 전후에 시작하는 이벤트만 GSI 범위 조회
+        widget = CreatedWeeklyEventsWidget(user_email, now or datetime.now(pytz.UTC))
+        await feed_widgets(user_email, [widget])
+        log_widget_events(widget)
 
-        # 2. 데이터 조회
-        response = table.scan()
-        raw_events = response.get('Items', [])
-        logger.info(f"[전체 데이터 수] {len(raw_events)}개")
-
-        filtered_events = []
-        for event in raw_events:
-            try:
-                if 'events' in event:
-                    for sub_event in event['events']:
-                        processed_sub_event = sub_event.copy()  # 원본 이벤트 복사
-                        
-                        if 'start' in sub_event:
-                            # 날짜만 있는 경우 처리
-                            if 'date' in sub_event.get('start', {}):
-                                start_date = datetime.strptime(sub_event['start']['date'], '%Y-%m-%d')
-                                end_date = datetime.strptime(sub_event['end']['date'], '%Y-%m-%d') - timedelta(days=1)
-                                event_date = start_date.strftime('%Y-%m-%d')
-                            
-                            # datetime이 있는 경우 처리
-                            elif 'dateTime' in sub_event.get('start', {}):
-                                event_time = datetime.fromisoformat(sub_event['start']['dateTime'])
-                                end_time = datetime.fromisoformat(sub_event['end']['dateTime'])
-                                event_date = event_time.strftime('%Y-%m-%d')
-
-                                # start와 end 객체에 date 추가
-                                processed_sub_event['start']['date'] = event_date
-                                processed_sub_event['end']['date'] = end_time.strftime('%Y-%m-%d')
-
-                                # 종료 시간이 자정인 경우 처리
-                                if end_time.time() == datetime.min.time():
-                                    end_time = end_time - timedelta(seconds=1)
-                                    processed_sub_event['end']['date'] = (end_time - timedelta(days=1)).strftime('%Y-%m-%d')
-                            
-                            # 이벤트 시간이 이번 주에 속하는지 확인
-                            week_start = this_week_start.strftime('%Y-%m-%d')
-                            week_end = this_week_end.strftime('%Y-%m-%d')
-
-                            if week_start <= event_date <= week_end:
-                                filtered_events.append(processed_sub_event)
-
-            except Exception as sub_e:
-                logger.error(f"이벤트 처리 중 오류: {str(sub_e)}")
-                continue
-        # for event in raw_events:
-        #     try:
-        #         if 'events' in event:  # events 배열이 있는 경우
-        #             for sub_event in event['events']:
-        #                 if 'start' in sub_event and 'dateTime' in sub_event['start']:
-        #                     event_time = datetime.fromisoformat(sub_event['start']['dateTime'])
-        #                     if this_week_start <= event_time <= this_week_end:
-        #                         filtered_events.append(sub_event)
-        #     except Exception as sub_e:
-        #         logger.error(f"이벤트 처리 중 오류: {str(sub_e)}")
-        #         continue
-        #### 커밋용        
-        logger.info(f"[필터링 후 데이터 수] {len(filtered_events)}개")
-        logger.info(f"[필터링 된 데이터 샘플]\n{filtered_events[:2]}")  # 처음 2개만 로깅
-        
-        result = {
-            'events': filtered_events,
-            'this_week_start': this_week_start.isoformat()
-        }
-
-        return result
+        return widget.result()
         
     except Exception as e:
-        logger.error(f"조회 중 오류: {str(e)}")
-        logger.error(f"전체 오류 내용: {traceback.format_exc()}")
+        logger.error("조회 중 오류: %s", e)
+        logger.error("전체 오류 내용", exc_info=True)
         return {'events': [], 'this_week_start': None}
 
 async def check_calendar_events(user_email: str):
     """
     사용자의 캘린더 이벤트 데이터를 확인하는 함수
     """
-    table = dynamodb_client.Table("lookback-calendar-events")
-    
     try:
-        response = table.query(
-            KeyConditionExpression='user_id = :uid',
-            ExpressionAttributeValues={':uid': user_email}
-        )
+        items = await query_event_items(user_email)
         
         logger.info("=== 캘린더 이벤트 데이터 확인 ===")
-        logger.info(f"총 아이템 수: {len(response.get('Items', []))}")
+        logger.info("총 아이템 수: %d", len(items))
+        
+        events_by_calendar = {}
+        for item in items:
+            events_by_calendar.setdefault(item.get('calendar_id'), []).append(item['event'])
         
-        for item in response.get('Items', []):
-            logger.info(f"\n캘린더 ID: {item.get('calendar_id')}")
-            events = item.get('events', [])
-            logger.info(f"이벤트 수: {len(events)}")
+        for calendar_id, events in events_by_calendar.items():
+            logger.info("\n캘린더 ID: %s", calendar_id)
+            logger.info("이벤트 수: %d", len(events))
             
             # 처음 5개 이벤트만 샘플로 출력
             for event in events[:5]:
-                logger.info(f"""
-                제목: {event.get('summary')}
-                시작: {event.get('start', {}).get('dateTime')}
-                종료: {event.get('end', {}).get('dateTime')}
-                """)
+                logger.info(
+                    "\n제목: %s\n시작: %s\n종료: %s",
+                    event.get('summary'),
+                    event.get('start', {}).get('dateTime'),
+                    event.get('end', {}).get('dateTime')
+                )
                 
-        return response.get('Items', [])
+        return items
         
     except Exception as e:
-        logger.error(f"데이터 확인 중 오류 발생: {str(e)}")
+        logger.error("데이터 확인 중 오류 발생: %s", e)
         return []
 
+#### 대시보드 위젯 계산 (원본 경로) 과 집계(rollup)
+async def sum_time_by_calendar(user: str, now: datetime = None) -> dict:
+    """
+    이번주 캘린더별 활동 시간(분)을 캘린더 이름(summary) 기준으로 반환합니다.
+    """
+    user_duration_time = {}
+    
+    # 사용자 캘린더 리스트 가져오기 
+    user_cal_list = await get_calendar_list_by_user(user)
+    
+    log_payload(logger, "사용자 캘린더 리스트 가져오기 성공", user_cal_list)
+    
+    # 모든 캘린더의 활동 시간을 한 번의 조회로 계산
+    duration_by_cal_id = await get_user_event_by_calendar(user, [calendar['id'] for calendar in user_cal_list], now)
+    
+    for calendar in user_cal_list:
+        summary = calendar['summary']
+        cal_id = calendar['id']
+        user_duration_time[summary] = duration_by_cal_id[cal_id]
+    
+    return user_duration_time
+
+# 위젯 이름 -> (집계 기간 키 함수, 위젯 집계기)
+# - 기간 키 함수가 None 인 위젯(지금 시각 기준인 다가오는 일정)은 집계로 저장하지 않고 항상 원본 경로로 계산
+DASHBOARD_WIDGETS = {
+    'spending_time': (rollups.kst_week, SpendingTimeWidget),
+    'day_event_count': (rollups.local_last_week, DayEventCountWidget),
+    'upcoming': (None, UpcomingWidget),
+    'categories': (rollups.utc_week, CategoryWidget),
+    'weekly_activity': (rollups.utc_week, WeeklyActivityWidget),
+    'calendar_schedule': (rollups.utc_month, CalendarScheduleWidget),
+}
+
+# 집계로 저장하는 위젯
+ROLLUP_WIDGETS = [widget for widget, (period, _) in DASHBOARD_WIDGETS.items() if period is not None]
+
+def current_rollup_keys(now: datetime) -> list:
+    """
+    now 기준 현재 기간의 집계 키 목록 (대시보드가 읽는 키)
+    """
+    return [rollups.rollup_key(widget, DASHBOARD_WIDGETS[widget][0](now)) for widget in ROLLUP_WIDGETS]
+
+async def discard_dashboard_rollups(user_email: str, now: datetime = None):
+    """
+    현재 기간의 집계를 지워 다음 대시보드 조회가 원본 경로로 계산하도록 합니다.
+    동기화나 집계 계산이 중간에 실패해 저장된 집계가 동기화 이전 값으로 남을 때 호출합니다.
+    삭제가 실패해도 호출한 쪽의 원래 오류를 가리지 않도록 로그만 남깁니다.
+    """
+    try:
+        await run_dynamo(rollups.delete_rollups, user_email, current_rollup_keys(now or datetime.now(timezone.utc)))
+    except Exception as e:
+        logger.error("대시보드 집계 삭제 중 오류 발생: %s", e)
+
+def build_widgets(user_email: str, cal_list: list, widgets: list, now: datetime) -> dict:
+    """
+    위젯 이름 목록으로 위젯 집계기를 만듭니다.
+
+    Returns:
+        dict: {위젯 이름: 위젯 집계기}
+    """
+    aggregators = {}
+    for widget in widgets:
+        widget_class = DASHBOARD_WIDGETS[widget][1]
+        if widget_class.source == 'creator':
+            aggregators[widget] = widget_class(user_email, now)
+        else:
+            aggregators[widget] = widget_class(cal_list, now)
+    return aggregators
+
+async def load_cached_events(user_email: str, cached, now: datetime) -> list:
+    """
+    모든 대시보드 위젯의 조회 구간을 덮는 캘린더 리스트와 이벤트를 읽어 메모리 캐시 항목에 채웁니다.
+    이미 캐시된 데이터가 구간을 덮고 있으면 DynamoDB를 읽지 않습니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        cached (CachedUser): event_cache.get()으로 가져온 캐시 항목
+        now (datetime): 기준 시각
+
+    Returns:
+        list: 사용자 캘린더 리스트
+    """
+    cal_list = cached.calendar_list
+    if cal_list is None:
+        cal_list = await get_calendar_list_by_user(user_email)
+        # 조회 실패 시에도 빈 리스트가 오므로 빈 리스트는 캐시하지 않음
+        if cal_list:
+            cached.set_calendar_list(cal_list)
+            event_cache.store(user_email, cached)
+
+    aggregators = list(build_widgets(user_email, cal_list, list(DASHBOARD_WIDGETS), now).values())
+    
+    async def load_source(source: str):
+        _, lower, upper = widget_key_range([widget for widget in aggregators if widget.source == source])
+        events = cached.sources.get(source)
+        if events is not None and events.covers(lower, upper):
+            return
+        items = [item async for item in iter_source_items(user_email, source, lower, upper)]
+        cached.set_events(source, EventSet(lower, upper, items))
+    
+    await asyncio.gather(load_source('events'), load_source('creator'))
+    event_cache.store(user_email, cached)
+    return cal_list
+
+async def compute_dashboard_widgets(user_email: str, widgets: list, now: datetime, cached=None) -> dict:
+    """
+    여러 대시보드 위젯을 원본 경로로 함께 계산합니다.
+    캘린더 리스트와 이벤트는 메모리 캐시에 없을 때만 한 번씩 읽습니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        widgets (list): DASHBOARD_WIDGETS 의 위젯 이름 목록
+        now (datetime): 기준 시각
+        cached (CachedUser, optional): 사용할 캐시 항목 (기본값: 현재 세대 항목)
+
+    Returns:
+        dict: {위젯 이름: 위젯 응답 데이터}
+    """
+    if not widgets:
+        return {}
+    
+    cached = cached or event_cache.get(user_email)
+    cal_list = await load_cached_events(user_email, cached, now)
+    
+    aggregators = build_widgets(user_email, cal_list, widgets, now)
+    await feed_widgets(user_email, list(aggregators.values()), cached)
+    return {widget: aggregator.result() for widget, aggregator in aggregators.items()}
+
+async def refresh_dashboard_rollups(user_email: str, now: datetime = None) -> list:
+    """
+    모든 대시보드 위젯을 원본 경로로 계산하여 현재 기간의 집계로 저장합니다.
+    store_calendar_events / put_calendar_list 끝에서 호출됩니다.
+
+    Returns:
+        list: 저장한 rollup 키 목록
+    """
+    now = now or datetime.now(timezone.utc)
+    cached = event_cache.get(user_email)
+    try:
+        results = await compute_dashboard_widgets(user_email, ROLLUP_WIDGETS, now, cached)
+    except Exception as e:
+        # 원본 조회가 실패하면 빈 결과를 집계로 저장하지 않고, 동기화 이전 집계도 지워 원본 경로로 계산하게 함
+        logger.error("대시보드 집계 계산 중 오류 발생: %s", e)
+        await discard_dashboard_rollups(user_email, now)
+        return []
+    
+    payloads = {
+        rollups.rollup_key(widget, DASHBOARD_WIDGETS[widget][0](now)): payload
+        for widget, payload in results.items()
+    }
+    
+    await run_dynamo(rollups.put_rollups, user_email, payloads)
+    for key, payload in payloads.items():
+        cached.set_rollup(key, payload)
+    event_cache.store(user_email, cached)
+    logger.info("사용자 %s의 대시보드 집계 %d개 저장 완료", user_email, len(payloads))
+    return list(payloads)
+
+async def load_dashboard(user_email: str, widgets: list, now: datetime = None) -> dict:
+    """
+    요청한 대시보드 위젯들의 응답을 한 번에 만듭니다.
+    현재 기간의 집계가 있는 위젯은 집계를 읽고, 나머지는 이벤트를 한 번만 읽어 함께 계산한 뒤
+    집계로 채워 넣습니다. 같은 동기화 세대 안에서 다시 부르면 메모리 캐시만 사용합니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        widgets (list): DASHBOARD_WIDGETS 의 위젯 이름 목록
+        now (datetime, optional): 기준 시각 (기본값: 현재 시각)
+
+    Returns:
+        dict: {위젯 이름: 위젯 응답 데이터}
+    """
+    now = now or datetime.now(timezone.utc)
+    cached = event_cache.get(user_email)
+    keys = {
+        widget: rollups.rollup_key(widget, DASHBOARD_WIDGETS[widget][0](now))
+        for widget in widgets
+        if DASHBOARD_WIDGETS[widget][0] is not None
+    }
+    
+    results = {widget: cached.rollups[key] for widget, key in keys.items() if key in cached.rollups}
+    
+    # 이벤트가 메모리에 있으면 집계 테이블을 읽는 것보다 바로 계산하는 편이 빠름
+    if not cached.sources:
+        unread = [widget for widget in keys if widget not in results]
+        stored = await asyncio.gather(*(rollups.get_rollup(user_email, keys[widget]) for widget in unread))
+        for widget, payload in zip(unread, stored):
+            if payload is not None:
+                cached.set_rollup(keys[widget], payload)
+                results[widget] = payload
+    
+    missing = [widget for widget in widgets if widget not in results]
+    computed = await compute_dashboard_widgets(user_email, missing, now, cached)
+    results.update(computed)
+    
+    for widget, payload in computed.items():
+        if widget not in keys:
+            continue
+        # 계산하는 동안 동기화가 끝났으면 (세대가 바뀜) 이전 데이터로 만든 결과를 집계로 남기지 않음
+        if cached.generation != event_cache.generation(user_email):
+            break
+        try:
+            stored = await run_dynamo(rollups.put_rollup_if_absent, user_email, keys[widget], payload)
+            if stored and cached.generation != event_cache.generation(user_email):
+                # 저장하는 사이 동기화가 끝났으면 방금 넣은 집계를 지워 다음 조회가 다시 계산하게 함
+                await run_dynamo(rollups.delete_rollups, user_email, [keys[widget]])
+                break
+            cached.set_rollup(keys[widget], payload)
+        except Exception as e:
+            logger.error("집계 %s 저장 중 오류 발생: %s", keys[widget], e)
+    
+    event_cache.store(user_email, cached)
+    return {widget: results[widget] for widget in widgets}
+
+def dashboard_etag(user_email: str, widgets: list, *variant, now: datetime = None) -> str:
+    """
+    대시보드 응답의 ETag 를 만듭니다. DynamoDB 를 읽지 않고 사용자의 동기화 세대와
+    위젯별 기간 키(이번 주 / 이번 달, 기간이 없는 위젯은 현재 분)로만 계산하므로
+    동기화가 끝나거나 기간이 바뀌면 값이 바뀝니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        widgets (list): DASHBOARD_WIDGETS 의 위젯 이름 목록
+        *variant: 응답을 바꾸는 그 밖의 값 (엔드포인트 이름, 요청 파라미터 등)
+        now (datetime, optional): 기준 시각 (기본값: 현재 시각)
+
+    Returns:
+        str: 따옴표로 감싼 ETag 값
+    """
+    now = now or datetime.now(timezone.utc)
+    windows = []
+    for widget in widgets:
+        period = DASHBOARD_WIDGETS[widget][0]
+        windows.append(rollups.rollup_key(widget, period(now) if period is not None else now.strftime('%Y-%m-%dT%H:%M')))
+    
+    tag = '|'.join([
+        user_email,
+        event_cache.instance,
+        str(event_cache.generation(user_email)),
+        *windows,
+        *(str(value) for value in variant)
+    ])
+    return '"' + hashlib.sha1(tag.encode('utf-8')).hexdigest()[:24] + '"'
+
+async def get_dashboard_widget(user_email: str, widget: str, now: datetime = None):
+    """
+    대시보드 위젯 응답을 집계 테이블에서 한 번의 조회로 가져옵니다.
+    현재 기간의 집계가 없으면 (기간이 바뀐 뒤 아직 동기화 전) 원본 경로로 계산하고 채워 넣습니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        widget (str): DASHBOARD_WIDGETS 의 위젯 이름
+        now (datetime, optional): 기준 시각 (기본값: 현재 시각)
+    """
+    return (await load_dashboard(user_email, [widget], now))[widget]
@@ -0,0 +1,159 @@
+# dynamo_client.py
+# DynamoDB 세션/커넥션 풀과 블로킹 boto3 호출을 위한 스레드 풀 관리
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config
+from dotenv import load_dotenv
+
+from app.core.config import settings
+from app.core.metrics import instrument_dynamodb
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+AWS_REGION = "ap-northeast-2"
+AWS_ACCESS_kEY_ID = os.environ.get("AWS_ACCESS_kEY_ID")
+AWS_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
+
+_session = None
+_resource = None
+_executor = None
+_tables = {}
+
+
+def init_dynamodb():
+    """
+    공유 boto3 세션, DynamoDB 리소스(커넥션 풀)와 전용 스레드 풀을 생성합니다.
+    앱 lifespan 시작 시 한 번 호출되며, 이미 초기화된 경우 아무 것도 하지 않습니다.
+    """
+    global _session, _resource, _executor
+
+    if _resource is not None:
+        return
+
+    _session = boto3.session.Session(
+        region_name=AWS_REGION,
+        aws_access_key_id=AWS_ACCESS_kEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY
+    )
+    # 워커 수와 커넥션 풀 크기를 맞춰 스레드가 커넥션을 기다리지 않도록 함
+    _resource = _session.resource(
+        'dynamodb',
+        config=Config(
+            max_pool_connections=settings.DYNAMODB_MAX_POOL_CONNECTIONS,
+            retries={'mode': 'standard'}
+        )
+    )
+    if settings.METRICS_ENABLED:
+        instrument_dynamodb(_resource.meta.client)
+    _executor = ThreadPoolExecutor(
+        max_workers=settings.DYNAMODB_MAX_WORKERS,
+        thread_name_prefix="dynamodb"
+    )
+    logger.info(
+        "DynamoDB 초기화 완료 (workers=%d, pool=%d)",
+        settings.DYNAMODB_MAX_WORKERS,
+        settings.DYNAMODB_MAX_POOL_CONNECTIONS
+    )
+
+
+def close_dynamodb():
+    """
+    스레드 풀을 종료하고 공유 리소스를 해제합니다. 앱 lifespan 종료 시 호출됩니다.
+    """
+    global _session, _resource, _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+    _tables.clear()
+    _session = None
+    _resource = None
+    _executor = None
+    logger.info("DynamoDB 리소스 정리 완료")
+
+
+def get_table(table_name: str):
+    """
+    공유 리소스에서 테이블 핸들을 가져옵니다. 핸들은 테이블 이름별로 재사용됩니다.
+
+    Args:
+        table_name (str): DynamoDB 테이블 이름
+
+    Returns:
+        boto3 Table 리소스
+    """
+    table = _tables.get(table_name)
+    if table is None:
+        init_dynamodb()
+        table = _resource.Table(table_name)
+        _tables[table_name] = table
+    return table
+
+
+async def run_dynamo(func, *args, **kwargs):
+    """
+    블로킹 boto3 호출을 전용 스레드 풀에서 실행하여 이벤트 루프를 막지 않도록 합니다.
+
+    Args:
+        func: 실행할 boto3 메서드 (예: table.query)
+        *args, **kwargs: func에 전달할 인자
+
+    Returns:
+        func의 반환값
+    """
+    if _executor is None:
+        init_dynamodb()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+async def iterate_items(operation, limit: int = None, page_size: int = None, projection: str = None, **kwargs):
+    """
+    query/scan 결과를 LastEvaluatedKey를 따라가며 아이템 단위로 yield 합니다.
+    현재 페이지를 넘겨주는 동안 다음 페이지를 미리 요청하므로 집계가 마지막 페이지를
+    기다리지 않고 시작되며, 메모리에는 최대 두 페이지만 올라옵니다.
+    끝까지 읽지 않고 멈추는 쪽은 contextlib.aclosing 으로 감싸야 미리 요청한 페이지가 바로 취소됩니다
+    (limit 에 도달한 경우는 제너레이터가 스스로 취소).
+
+    Args:
+        operation: table.query 또는 table.scan
+        limit (int, optional): 전체 최대 아이템 수
+        page_size (int, optional): 요청당 DynamoDB Limit 힌트
+        projection (str, optional): ProjectionExpression
+        **kwargs: operation에 그대로 전달할 인자 (KeyConditionExpression 등)
+
+    Yields:
+        dict: DynamoDB 아이템
+    """
+    request = dict(kwargs)
+    if page_size or limit:
+        request['Limit'] = page_size or limit
+    if projection:
+        request['ProjectionExpression'] = projection
+
+    yielded = 0
+    pending = asyncio.ensure_future(run_dynamo(operation, **request))
+    try:
+        while pending is not None:
+            response = await pending
+            pending = None
+            items = response.get('Items', [])
+
+            last_key = response.get('LastEvaluatedKey')
+            if last_key and (limit is None or yielded + len(items) < limit):
+                request['ExclusiveStartKey'] = last_key
+                pending = asyncio.ensure_future(run_dynamo(operation, **request))
+
+            for item in items:
+                yield item
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -0,0 +1,235 @@
+# event_cache.py
+# 대시보드용 사용자 이벤트 메모리 캐시
+#
+# 동기화 사이에는 사용자의 이벤트가 바뀌지 않으므로, 대시보드를 계산할 때 읽은
+# 캘린더 리스트 / 이벤트 아이템 / 위젯 집계를 (사용자, 동기화 세대) 키로 프로세스 메모리에 보관합니다.
+# - store_calendar_events / put_calendar_list 가 끝나면 invalidate()로 세대를 올려 이전 항목을 버리고
+# - TTL 이 지나거나 메모리 상한(바이트)을 넘으면 가장 오래 안 쓴 사용자부터 제거합니다 (LRU + TTL).
+# 여러 프로세스로 실행할 때 다른 프로세스에서 일어난 동기화는 TTL 이 지나야 반영됩니다.
+#
+# 세대 번호는 프로세스 전체에서 하나씩 늘어나는 카운터에서 받습니다. 사용자의 캐시 항목이 제거되면
+# (만료/용량 초과/무효화) 세대 번호도 함께 지우고 다음에 새 번호를 받으므로, 캐시 항목이 없는 사용자의
+# 세대 번호가 쌓이지 않으면서 같은 번호가 다시 쓰이지도 않습니다.
+# 카운터는 프로세스마다 따로 시작하므로, 세대로 만든 값(대시보드 ETag 등)을 밖으로 내보낼 때는
+# 프로세스별로 다른 instance 값을 함께 써서 다른 프로세스의 값과 섞이지 않게 합니다.
+import itertools
+import logging
+import sys
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+from app.db.columnar import EventColumns
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value) -> int:
+    """
+    DynamoDB에서 읽은 값(dict/list/str/숫자)의 대략적인 메모리 사용량(바이트)을 계산합니다.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+class EventSet:
+    """
+    한 사용자의 정렬 키 구간 [lower, upper] 에 시작하는 이벤트 아이템 (start_key 순)과
+    위젯 집계용 열 배열 (아이템과 같은 순서)
+
+    Args:
+        lower (str): 구간 하한 키 (None이면 제한 없음)
+        upper (str): 구간 상한 키 (None이면 제한 없음)
+        items (list): 구간에 속하는 이벤트 아이템 전체
+    """
+
+    def __init__(self, lower: str, upper: str, items: list):
+        self.lower = lower
+        self.upper = upper
+        self.items = sorted(items, key=lambda item: item['start_key'])
+        self.keys = [item['start_key'] for item in self.items]
+        self.columns = EventColumns(self.items)
+
+    def covers(self, lower: str, upper: str) -> bool:
+        """[lower, upper] 구간이 이 집합 안에 모두 들어오는지 여부"""
+        lower_ok = self.lower is None or (lower is not None and lower >= self.lower)
+        upper_ok = self.upper is None or (upper is not None and upper <= self.upper)
+        return lower_ok and upper_ok
+
+    def index_range(self, lower: str, upper: str) -> tuple:
+        """[lower, upper] 구간에 시작하는 아이템의 [start, stop) 인덱스 (covers()가 참인 구간에만 사용)"""
+        start = bisect_left(self.keys, lower) if lower is not None else 0
+        stop = bisect_right(self.keys, upper) if upper is not None else len(self.keys)
+        return start, stop
+
+    def select(self, lower: str, upper: str) -> list:
+        """[lower, upper] 구간에 시작하는 아이템"""
+        start, stop = self.index_range(lower, upper)
+        return self.items[start:stop]
+
+
+class CachedUser:
+    """
+    한 동기화 세대 동안의 사용자 대시보드 데이터
+    - calendar_list: 캘린더 리스트 (None이면 아직 읽지 않음)
+    - sources: {'events' | 'creator': EventSet}
+    - rollups: {rollup_key: 위젯 응답 데이터}
+    """
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.calendar_list = None
+        self.sources = {}
+        self.rollups = {}
+        self.size = sys.getsizeof(self)
+
+    def set_calendar_list(self, calendar_list: list):
+        self.calendar_list = calendar_list
+        self.size += estimate_size(calendar_list)
+
+    def set_events(self, source: str, events: EventSet):
+        self.sources[source] = events
+        self.size += estimate_size(events.items) + estimate_size(events.keys) + events.columns.nbytes
+
+    def set_rollup(self, key: str, payload):
+        self.rollups[key] = payload
+        self.size += estimate_size(key) + estimate_size(payload)
+
+
+class _CountingTTLCache(TTLCache):
+    # 용량 초과로 제거된 항목 / 만료된 항목 수 집계, 제거된 키는 on_remove 로 알림
+
+    def __init__(self, *args, on_remove=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_remove = on_remove
+        self.evictions = 0
+        self.expirations = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        if self.on_remove is not None:
+            self.on_remove(item[0])
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        if self.on_remove is not None:
+            for key, _ in expired:
+                self.on_remove(key)
+        return expired
+
+
+class EventCache:
+    """
+    (사용자, 동기화 세대) 별 대시보드 데이터 캐시
+
+    Args:
+        max_bytes (int): 캐시 전체 메모리 상한 (바이트)
+        ttl (float): 항목 유지 시간(초)
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self._entries = _CountingTTLCache(
+            maxsize=max_bytes,
+            ttl=ttl,
+            timer=time.monotonic,
+            getsizeof=lambda entry: entry.size,
+            on_remove=self._forget
+        )
+        # 사용자 -> 현재 세대 번호 (캐시 항목이 있거나 채우는 중인 사용자만)
+        self._generations = {}
+        self._counter = itertools.count(1)
+        self.instance = uuid.uuid4().hex[:12]
+        self.hits = 0
+        self.misses = 0
+        self.too_large = 0
+
+    def generation(self, user_email: str) -> int:
+        """
+        사용자의 현재 세대 번호. 없으면 (처음이거나 무효화/제거된 뒤) 새 번호를 받습니다.
+        """
+        generation = self._generations.get(user_email)
+        if generation is None:
+            generation = self._generations[user_email] = next(self._counter)
+        return generation
+
+    def _forget(self, key: tuple):
+        # 캐시에서 빠진 항목이 사용자의 현재 세대이면 세대 번호도 지움 (다음에 새 번호를 받음)
+        user_email, generation = key
+        if self._generations.get(user_email) == generation:
+            del self._generations[user_email]
+
+    def get(self, user_email: str) -> CachedUser:
+        """
+        현재 세대의 캐시 항목을 반환하고, 없으면 빈 항목을 새로 만들어 반환합니다.
+        새 항목은 store()를 호출해야 캐시에 들어갑니다.
+        """
+        generation = self.generation(user_email)
+        entry = self._entries.get((user_email, generation))
+        if entry is None:
+            self.misses += 1
+            return CachedUser(generation)
+        self.hits += 1
+        return entry
+
+    def contains(self, user_email: str) -> bool:
+        """현재 세대의 항목이 만료되지 않고 남아 있는지 여부 (hits/misses 에 집계하지 않음)"""
+        generation = self._generations.get(user_email)
+        return generation is not None and (user_email, generation) in self._entries
+
+    def store(self, user_email: str, entry: CachedUser):
+        """
+        항목을 저장(또는 내용이 늘어난 항목의 크기를 다시 계산)합니다.
+        읽는 동안 동기화가 끝나 세대가 바뀌었다면 저장하지 않습니다.
+        """
+        if entry.generation != self._generations.get(user_email):
+            return
+        try:
+            self._entries[(user_email, entry.generation)] = entry
+        except ValueError:
+            # 항목 하나가 상한보다 큰 경우 (이벤트가 매우 많은 사용자) 캐시하지 않음
+            self.too_large += 1
+            self._entries.pop((user_email, entry.generation), None)
+            self._forget((user_email, entry.generation))
+            logger.info("사용자 %s의 이벤트 캐시 항목(%s바이트)이 상한보다 커서 저장하지 않습니다", user_email, entry.size)
+
+    def invalidate(self, user_email: str):
+        """
+        동기화가 끝났을 때 호출합니다. 세대 번호를 지워 (다음 조회 때 새 번호를 받음)
+        이전 세대 항목과 진행 중인 저장을 모두 무효화합니다.
+        """
+        generation = self._generations.pop(user_email, None)
+        if generation is not None:
+            self._entries.pop((user_email, generation), None)
+
+    def clear(self):
+        self._entries.clear()
+        self._generations.clear()
+
+    def stats(self) -> dict:
+        self._entries.expire()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self._entries.evictions,
+            'expirations': self._entries.expirations,
+            'too_large': self.too_large,
+            'entries': len(self._entries),
+            'generations': len(self._generations),
+            'bytes': self._entries.currsize
+        }
+
+
+event_cache = EventCache(
+    max_bytes=settings.EVENT_CACHE_MAX_BYTES,
+    ttl=settings.EVENT_CACHE_TTL
+)
@@ -0,0 +1,271 @@
+# event_items.py
+# 이벤트 단위 DynamoDB 테이블 스키마와 키 생성 함수
+#
+# lookback-calendar-event-items
+#   user_id   (HASH)  : 사용자 이메일
+#   start_key (RANGE) : "<UTC 시작시각>#<calendar_id>#<event_id>"
+#                       예) 2025-01-06T00:30:00Z#primary@gmail.com#abc123
+#   calendar_id, event_id, event(구글 이벤트 원본)
+#   creator_email : 이벤트 생성자 이메일 (creator-start-index GSI 의 해시 키)
+#   event_key     : "<user_id>#<calendar_id>#<event_id>" (event-key-index GSI 의 해시 키)
+#   start_ts / end_ts     : 시작/종료 시각 UTC epoch 초 (정수, 종일 일정은 KST 자정)
+#   start_day / end_day   : 일정에 적힌 시작/종료 날짜의 epoch 일 수 (1970-01-01 = 0)
+#                           dateTime 은 적힌 오프셋 기준 날짜, date 는 그대로
+#   all_day               : 날짜만 있는 종일 일정 여부
+#   (동기화 때 한 번만 파싱해 두고 읽기 경로는 정수 비교만 합니다)
+#
+# 시작시각이 정렬 키의 앞부분이므로 주간/월간/다가오는 일정 조회가
+# KeyConditionExpression 범위 조회가 됩니다.
+# creator-start-index 는 다른 사용자의 캘린더에 저장된 일정까지 포함해
+# "내가 만든 일정"을 사용자/기간 단위로 조회하기 위한 인덱스입니다.
+# event-key-index 는 증분 동기화 시 시작 시각을 모르는 이벤트(수정/삭제)의
+# 기존 아이템 키를 찾기 위한 인덱스입니다.
+#
+# lookback-calendar-sync-state
+#   user_id (HASH), calendar_id (RANGE), sync_token, updated_at
+#   캘린더별 구글 nextSyncToken 저장
+#
+# lookback-dashboard-rollups
+#   user_id (HASH), rollup_key (RANGE) : "<위젯>#<ISO 주 또는 월>"  예) spending_time#2025-W02
+#   data : 위젯 응답 JSON 문자열, updated_at
+#   동기화 끝에 미리 계산해 둔 대시보드 집계 (app/db/rollups.py)
+#
+# lookback-calendar-watch-channels
+#   user_id (HASH), calendar_id (RANGE), channel_id, resource_id, expiration(epoch 초), updated_at
+#   캘린더별 구글 events.watch 푸시 알림 채널 (app/db/watch_channels.py)
+from datetime import date, datetime, timedelta, timezone
+
+import pytz
+
+# 기존 (user_id, calendar_id) 단위 blob 테이블
+EVENTS_TABLE = "lookback-calendar-events"
+# 이벤트 단위 테이블
+EVENT_ITEMS_TABLE = "lookback-calendar-event-items"
+CALENDAR_LIST_TABLE = "lookback-calendar-list"
+SYNC_STATE_TABLE = "lookback-calendar-sync-state"
+ROLLUP_TABLE = "lookback-dashboard-rollups"
+WATCH_CHANNEL_TABLE = "lookback-calendar-watch-channels"
+CREATOR_INDEX = "creator-start-index"
+EVENT_KEY_INDEX = "event-key-index"
+
+KOREA_TZ = pytz.timezone("Asia/Seoul")
+
+# 이벤트의 로컬 날짜/종료일 기준 필터를 위해 범위 조회 시 앞뒤로 두는 여유
+EVENT_RANGE_SLACK = timedelta(days=1)
+
+# 같은 시각으로 시작하는 모든 키보다 큰 값 ('#' < '~')
+KEY_UPPER_SUFFIX = "~"
+
+# start_day / end_day 기준일 (1970-01-01)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+CREATOR_INDEX_DEFINITION = {
+    'IndexName': CREATOR_INDEX,
+    'KeySchema': [
+        {'AttributeName': 'creator_email', 'KeyType': 'HASH'},
+        {'AttributeName': 'start_key', 'KeyType': 'RANGE'},
+    ],
+    'Projection': {
+        'ProjectionType': 'INCLUDE',
+        # 위젯이 인덱스 조회 결과도 문자열을 파싱하지 않도록 정규화된 시각 필드까지 포함
+        'NonKeyAttributes': ['calendar_id', 'event', 'start_ts', 'end_ts', 'start_day', 'end_day', 'all_day'],
+    },
+}
+
+EVENT_KEY_INDEX_DEFINITION = {
+    'IndexName': EVENT_KEY_INDEX,
+    'KeySchema': [
+        {'AttributeName': 'event_key', 'KeyType': 'HASH'},
+    ],
+    'Projection': {'ProjectionType': 'KEYS_ONLY'},
+}
+
+EVENT_ITEMS_TABLE_DEFINITION = {
+    'TableName': EVENT_ITEMS_TABLE,
+    'KeySchema': [
+        {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+        {'AttributeName': 'start_key', 'KeyType': 'RANGE'},
+    ],
+    'AttributeDefinitions': [
+        {'AttributeName': 'user_id', 'AttributeType': 'S'},
+        {'AttributeName': 'start_key', 'AttributeType': 'S'},
+        {'AttributeName': 'creator_email', 'AttributeType': 'S'},
+        {'AttributeName': 'event_key', 'AttributeType': 'S'},
+    ],
+    'GlobalSecondaryIndexes': [CREATOR_INDEX_DEFINITION, EVENT_KEY_INDEX_DEFINITION],
+    'BillingMode': 'PAY_PER_REQUEST',
+}
+
+SYNC_STATE_TABLE_DEFINITION = {
+    'TableName': SYNC_STATE_TABLE,
+    'KeySchema': [
+        {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+        {'AttributeName': 'calendar_id', 'KeyType': 'RANGE'},
+    ],
+    'AttributeDefinitions': [
+        {'AttributeName': 'user_id', 'AttributeType': 'S'},
+        {'AttributeName': 'calendar_id', 'AttributeType': 'S'},
+    ],
+    'BillingMode': 'PAY_PER_REQUEST',
+}
+
+ROLLUP_TABLE_DEFINITION = {
+    'TableName': ROLLUP_TABLE,
+    'KeySchema': [
+        {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+        {'AttributeName': 'rollup_key', 'KeyType': 'RANGE'},
+    ],
+    'AttributeDefinitions': [
+        {'AttributeName': 'user_id', 'AttributeType': 'S'},
+        {'AttributeName': 'rollup_key', 'AttributeType': 'S'},
+    ],
+    'BillingMode': 'PAY_PER_REQUEST',
+}
+
+WATCH_CHANNEL_TABLE_DEFINITION = {
+    'TableName': WATCH_CHANNEL_TABLE,
+    'KeySchema': [
+        {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+        {'AttributeName': 'calendar_id', 'KeyType': 'RANGE'},
+    ],
+    'AttributeDefinitions': [
+        {'AttributeName': 'user_id', 'AttributeType': 'S'},
+        {'AttributeName': 'calendar_id', 'AttributeType': 'S'},
+    ],
+    'BillingMode': 'PAY_PER_REQUEST',
+}
+
+
+def format_key_time(value: datetime) -> str:
+    """
+    datetime을 정렬 키에 쓰이는 UTC 문자열로 변환합니다.
+
+    Args:
+        value (datetime): 변환할 시각 (naive인 경우 KST로 간주)
+
+    Returns:
+        str: "YYYY-MM-DDTHH:MM:SSZ" 형식 문자열
+    """
+    if value.tzinfo is None:
+        value = KOREA_TZ.localize(value)
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def event_start_time(event: dict):
+    """
+    구글 이벤트의 시작 시각을 반환합니다. 종일 일정은 KST 자정으로 봅니다.
+
+    Args:
+        event (dict): 구글 캘린더 이벤트
+
+    Returns:
+        datetime: 시작 시각 또는 None (시작 정보가 없는 경우)
+    """
+    start = event.get('start', {})
+    if 'dateTime' in start:
+        start_time = datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00'))
+        if start_time.tzinfo is None:
+            start_time = KOREA_TZ.localize(start_time)
+        return start_time
+    if 'date' in start:
+        return KOREA_TZ.localize(datetime.strptime(start['date'], '%Y-%m-%d'))
+    return None
+
+
+def event_time_fields(event: dict) -> dict:
+    """
+    구글 이벤트의 시작/종료 시각을 읽기 경로에서 다시 파싱하지 않도록 정수 필드로 정규화합니다.
+
+    Args:
+        event (dict): 구글 캘린더 이벤트
+
+    Returns:
+        dict: start_ts, end_ts, start_day, end_day, all_day 중 변환할 수 있는 필드
+    """
+    fields = {}
+    start = event.get('start') or {}
+    fields['all_day'] = 'dateTime' not in start and 'date' in start
+
+    for prefix in ('start', 'end'):
+        value = event.get(prefix) or {}
+        try:
+            if 'dateTime' in value:
+                parsed = datetime.fromisoformat(value['dateTime'].replace('Z', '+00:00'))
+                if parsed.tzinfo is None:
+                    parsed = KOREA_TZ.localize(parsed)
+                local_date = date.fromisoformat(value['dateTime'][:10])
+            elif 'date' in value:
+                local_date = date.fromisoformat(value['date'])
+                parsed = KOREA_TZ.localize(datetime.combine(local_date, datetime.min.time()))
+            else:
+                continue
+        except (TypeError, ValueError):
+            continue
+        fields[f'{prefix}_ts'] = int(parsed.timestamp())
+        fields[f'{prefix}_day'] = epoch_day(local_date)
+    return fields
+
+
+def epoch_day(value: date) -> int:
+    """날짜를 start_day / end_day 값(1970-01-01 부터의 일 수)으로 바꿉니다."""
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def epoch_date(day) -> date:
+    """start_day / end_day 값(DynamoDB 에서 읽으면 Decimal)을 날짜로 바꿉니다."""
+    return date.fromordinal(int(day) + EPOCH_ORDINAL)
+
+
+def make_event_key(user_email: str, calendar_id: str, event_id: str) -> str:
+    """
+    event-key-index 조회에 쓰이는 이벤트 식별 키를 만듭니다.
+    """
+    return f"{user_email}#{calendar_id}#{event_id}"
+
+
+def create_event_item(user_email: str, calendar_id: str, event: dict) -> dict:
+    """
+    구글 이벤트 하나를 이벤트 단위 테이블의 아이템으로 변환합니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        calendar_id (str): 캘린더 ID
+        event (dict): 구글 캘린더 이벤트
+
+    Returns:
+        dict: DynamoDB 아이템 또는 None (시작 시각/ID가 없어 저장할 수 없는 경우)
+    """
+    start_time = event_start_time(event)
+    event_id = event.get('id')
+    if start_time is None or not event_id:
+        return None
+
+    item = {
+        'user_id': user_email,
+        'start_key': f"{format_key_time(start_time)}#{calendar_id}#{event_id}",
+        'calendar_id': calendar_id,
+        'event_id': event_id,
+        'event_key': make_event_key(user_email, calendar_id, event_id),
+        'event': event,
+        **event_time_fields(event)
+    }
+    creator_email = event.get('creator', {}).get('email')
+    if creator_email:
+        item['creator_email'] = creator_email
+    return item
+
+
+def start_key_range(start: datetime = None, end: datetime = None) -> tuple:
+    """
+    [start, end] 구간에 시작하는 이벤트를 찾기 위한 정렬 키 범위를 만듭니다.
+
+    Args:
+        start (datetime, optional): 구간 시작 (없으면 제한 없음)
+        end (datetime, optional): 구간 끝 (없으면 제한 없음)
+
+    Returns:
+        tuple: (하한 키, 상한 키) - 제한이 없는 쪽은 None
+    """
+    lower = format_key_time(start) if start is not None else None
+    upper = format_key_time(end) + KEY_UPPER_SUFFIX if end is not None else None
+    return lower, upper
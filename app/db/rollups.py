@@ -0,0 +1,143 @@
+# rollups.py
+# 대시보드 위젯 집계(rollup) 저장소
+#
+# 동기화가 끝날 때 위젯별 응답을 미리 계산해 (user_id, "<위젯>#<기간>") 키로 저장하고,
+# 대시보드 핸들러는 같은 기간 키로 아이템 하나만 읽습니다.
+# 기간 키는 각 위젯의 원래 조회 구간과 같은 기준(KST/UTC 주, 서버 로컬 지난주, UTC 월)으로 만들기 때문에
+# 기간 안에서는 원본 경로와 같은 결과가 되고, 기간이 바뀌면 키가 달라져 자연스럽게 다시 계산됩니다.
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from botocore.exceptions import ClientError
+
+from app.db.dynamo_client import get_table, run_dynamo
+from app.db.event_items import KOREA_TZ, ROLLUP_TABLE
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB 아이템 최대 크기(400KB)보다 작게 - 넘으면 저장하지 않고 (이전 집계는 지우고) 원본 경로로 계산
+ROLLUP_MAX_BYTES = 350_000
+
+
+def iso_week(value) -> str:
+    year, week, _ = value.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def kst_week(now: datetime) -> str:
+    """이번 주 (KST 월요일 시작)"""
+    return iso_week(now.astimezone(KOREA_TZ))
+
+
+def utc_week(now: datetime) -> str:
+    """이번 주 (UTC 월요일 시작)"""
+    return iso_week(now.astimezone(timezone.utc))
+
+
+def local_last_week(now: datetime) -> str:
+    """지난 주 (서버 로컬 날짜 기준)"""
+    return iso_week(now.astimezone().date() - timedelta(days=7))
+
+
+def utc_month(now: datetime) -> str:
+    """이번 달 (UTC)"""
+    return now.astimezone(timezone.utc).strftime('%Y-%m')
+
+
+def rollup_key(widget: str, period: str) -> str:
+    return f"{widget}#{period}"
+
+
+async def get_rollup(user_email: str, key: str):
+    """
+    저장된 위젯 집계를 읽습니다.
+
+    Returns:
+        위젯 응답 데이터 또는 None (없거나 조회 실패 시)
+    """
+    table = get_table(ROLLUP_TABLE)
+    try:
+        response = await run_dynamo(table.get_item, Key={'user_id': user_email, 'rollup_key': key})
+    except Exception as e:
+        logger.error("Error getting rollup from DynamoDB: %s", e)
+        return None
+    item = response.get('Item')
+    return json.loads(item['data']) if item else None
+
+
+def _json_default(value):
+    # DynamoDB에서 읽은 숫자(Decimal)는 FastAPI 응답과 같은 방식으로 int/float 로 변환
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dump_payload(payload) -> str:
+    """
+    위젯 응답을 저장 형식(JSON 문자열)으로 변환합니다.
+    """
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+
+def _rollup_item(user_email: str, key: str, payload) -> dict:
+    data = dump_payload(payload)
+    if len(data.encode()) > ROLLUP_MAX_BYTES:
+        logger.info("집계 %s이(가) %s바이트를 넘어 저장하지 않습니다", key, ROLLUP_MAX_BYTES)
+        return None
+    return {
+        'user_id': user_email,
+        'rollup_key': key,
+        'data': data,
+        'updated_at': datetime.now(timezone.utc).isoformat()
+    }
+
+
+def put_rollups(user_email: str, payloads: dict):
+    """
+    위젯 집계들을 덮어씁니다. 동기화 직후 호출됩니다.
+    저장하기에 너무 큰 집계는 이전 동기화의 값이 남지 않도록 같은 키를 지웁니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        payloads (dict): {rollup_key: 위젯 응답 데이터}
+    """
+    table = get_table(ROLLUP_TABLE)
+    with table.batch_writer() as batch:
+        for key, payload in payloads.items():
+            item = _rollup_item(user_email, key, payload)
+            if item is not None:
+                batch.put_item(Item=item)
+            else:
+                batch.delete_item(Key={'user_id': user_email, 'rollup_key': key})
+
+
+def delete_rollups(user_email: str, keys: list):
+    """
+    위젯 집계들을 지웁니다. 지운 키는 다음 조회 때 원본 경로로 계산됩니다.
+    """
+    table = get_table(ROLLUP_TABLE)
+    with table.batch_writer() as batch:
+        for key in keys:
+            batch.delete_item(Key={'user_id': user_email, 'rollup_key': key})
+
+
+def put_rollup_if_absent(user_email: str, key: str, payload):
+    """
+    집계가 없을 때만 저장합니다. 조회 시 원본 경로로 계산한 결과를 채워 넣을 때 사용하며,
+    그 사이 동기화가 저장한 더 새로운 집계를 덮어쓰지 않습니다.
+
+    Returns:
+        bool: 저장했으면 True (이미 있거나 너무 커서 저장하지 않으면 False)
+    """
+    item = _rollup_item(user_email, key, payload)
+    if item is None:
+        return False
+    try:
+        get_table(ROLLUP_TABLE).put_item(Item=item, ConditionExpression='attribute_not_exists(user_id)')
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return False
+    return True
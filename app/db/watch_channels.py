@@ -0,0 +1,175 @@
+# watch_channels.py
+# 캘린더별 구글 푸시 알림(events.watch) 채널 저장소
+#
+# settings.GOOGLE_WEBHOOK_URL 이 있으면 캘린더마다 채널을 하나 등록해 두고,
+# 구글이 보내는 변경 알림(/api/v1/calendar/webhook)으로 바뀐 캘린더만 증분 동기화합니다.
+# 채널은 만료 시각이 있으므로 캘린더 리스트 저장/주기 동기화 때마다 ensure_watch_channels 를 불러
+# 만료까지 GOOGLE_WATCH_RENEW_MARGIN 보다 적게 남은 채널은 새로 등록하고 이전 채널은 해지합니다.
+# 채널 토큰은 app.core.security.create_channel_token 으로 서명하므로 알림 처리 시 이 테이블을 읽지 않습니다.
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+from boto3.dynamodb.conditions import Key
+
+from app.api.v1.endpoints.google import calendar_fetch_slot, create_user_fetch_limit, stop_channel, watch_calendar_events
+from app.core.config import settings
+from app.core.http_client import shared_http_client
+from app.core.security import create_channel_token
+from app.db.dynamo_client import get_table, iterate_items, run_dynamo
+from app.db.event_items import WATCH_CHANNEL_TABLE
+
+logger = logging.getLogger(__name__)
+
+# 구글이 허용하는 채널 토큰 최대 길이
+CHANNEL_TOKEN_MAX_LENGTH = 256
+
+
+def watch_enabled() -> bool:
+    """푸시 알림 웹훅 주소가 설정되어 있는지"""
+    return bool(settings.GOOGLE_WEBHOOK_URL)
+
+
+async def get_watch_channels(user_email: str) -> dict:
+    """
+    사용자의 등록된 알림 채널을 조회합니다.
+
+    Returns:
+        dict: {캘린더 ID: {'channel_id', 'resource_id', 'expires_at', ...}}
+    """
+    table = get_table(WATCH_CHANNEL_TABLE)
+    try:
+        return {
+            item['calendar_id']: item
+            async for item in iterate_items(table.query, KeyConditionExpression=Key('user_id').eq(user_email))
+        }
+    except Exception as e:
+        logger.error("Error getting watch channels from DynamoDB: %s", e)
+        return {}
+
+
+def put_watch_channel(user_email: str, calendar_id: str, channel: dict):
+    """
+    등록한 채널 정보를 저장합니다.
+
+    Args:
+        channel (dict): events.watch 응답 (id, resourceId, expiration(ms))
+    """
+    table = get_table(WATCH_CHANNEL_TABLE)
+    table.put_item(Item={
+        'user_id': user_email,
+        'calendar_id': calendar_id,
+        'channel_id': channel['id'],
+        'resource_id': channel['resourceId'],
+        'expires_at': int(channel['expiration']) // 1000,
+        'updated_at': datetime.now(timezone.utc).isoformat()
+    })
+
+
+def delete_watch_channels(user_email: str, calendar_ids: list):
+    table = get_table(WATCH_CHANNEL_TABLE)
+    with table.batch_writer() as batch:
+        for calendar_id in calendar_ids:
+            batch.delete_item(Key={'user_id': user_email, 'calendar_id': calendar_id})
+
+
+async def _stop_quietly(client: httpx.AsyncClient, access_token: str, channel: dict) -> bool:
+    # 이미 만료/해지된 채널은 404 - 알림이 더 오지 않으므로 실패로 보지 않음
+    try:
+        await stop_channel(client, access_token, channel['channel_id'], channel['resource_id'])
+        return True
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return True
+        logger.error("알림 채널 %s 해지 실패: %s", channel['channel_id'], e.response.status_code)
+    except Exception as e:
+        logger.error("알림 채널 %s 해지 중 오류 발생: %s", channel['channel_id'], e)
+    return False
+
+
+async def _watch(client: httpx.AsyncClient, user_email: str, access_token: str, calendar_id: str,
+                 user_limit: asyncio.Semaphore):
+    channel_id = uuid.uuid4().hex
+    token = create_channel_token(channel_id, user_email, calendar_id)
+    if len(token) > CHANNEL_TOKEN_MAX_LENGTH:
+        logger.error("캘린더 %s의 채널 토큰이 너무 길어 알림 채널을 등록하지 않습니다", calendar_id)
+        return None
+
+    async with calendar_fetch_slot(user_limit):
+        try:
+            channel = await watch_calendar_events(
+                client, access_token, calendar_id, channel_id, token,
+                settings.GOOGLE_WEBHOOK_URL, settings.GOOGLE_WATCH_TTL
+            )
+        except httpx.HTTPStatusError as e:
+            # 공휴일 캘린더 등 알림을 지원하지 않는 캘린더는 주기 동기화로만 갱신
+            logger.error("캘린더 %s의 알림 채널 등록 실패: %s", calendar_id, e.response.status_code)
+            return None
+        except Exception as e:
+            logger.error("캘린더 %s의 알림 채널 등록 중 오류 발생: %s", calendar_id, e)
+            return None
+    await run_dynamo(put_watch_channel, user_email, calendar_id, channel)
+    return channel
+
+
+async def ensure_watch_channels(user_email: str, access_token: str, calendar_ids: list, now: float = None) -> dict:
+    """
+    캘린더 목록에 맞게 알림 채널을 등록/갱신/해지합니다.
+    - 채널이 없거나 만료까지 GOOGLE_WATCH_RENEW_MARGIN 보다 적게 남은 캘린더는 새 채널을 등록하고 이전 채널은 해지
+    - 목록에서 빠진 캘린더의 채널은 해지하고 삭제
+    GOOGLE_WEBHOOK_URL 이 없으면 아무것도 하지 않습니다.
+
+    Args:
+        user_email (str): 사용자 이메일
+        access_token (str): Google OAuth2 액세스 토큰
+        calendar_ids (list): 현재 캘린더 ID 목록
+        now (float, optional): 현재 시각 (epoch 초)
+
+    Returns:
+        dict: {'created', 'renewed', 'stopped', 'failed'} 또는 None (웹훅 미설정)
+    """
+    if not watch_enabled():
+        return None
+    now = time.time() if now is None else now
+    stats = {'created': 0, 'renewed': 0, 'stopped': 0, 'failed': 0}
+
+    existing = await get_watch_channels(user_email)
+    removed = [calendar_id for calendar_id in existing if calendar_id not in calendar_ids]
+    due = [
+        calendar_id for calendar_id in calendar_ids
+        if calendar_id not in existing
+        or int(existing[calendar_id]['expires_at']) - now < settings.GOOGLE_WATCH_RENEW_MARGIN
+    ]
+    if not removed and not due:
+        return stats
+
+    user_limit = create_user_fetch_limit()
+    async with shared_http_client() as client:
+        channels = await asyncio.gather(*(
+            _watch(client, user_email, access_token, calendar_id, user_limit) for calendar_id in due
+        ))
+        # 새 채널이 등록된 뒤에 이전 채널을 해지해 그 사이 변경 알림을 놓치지 않도록 함
+        replaced = [
+            existing[calendar_id] for calendar_id, channel in zip(due, channels)
+            if channel is not None and calendar_id in existing
+        ]
+        stopped = await asyncio.gather(*(
+            _stop_quietly(client, access_token, channel) for channel in replaced + [existing[cid] for cid in removed]
+        ))
+
+    for calendar_id, channel in zip(due, channels):
+        if channel is None:
+            stats['failed'] += 1
+        elif calendar_id in existing:
+            stats['renewed'] += 1
+        else:
+            stats['created'] += 1
+    stats['stopped'] = sum(stopped)
+    if removed:
+        await run_dynamo(delete_watch_channels, user_email, removed)
+
+    logger.info("사용자 %s의 알림 채널 정리: %s", user_email, stats)
+    return stats
@@ -0,0 +1,688 @@
+# widgets.py
+# 대시보드 위젯 계산 (순수 함수 / 집계기)
+#
+# 각 위젯 집계기는
+#   window() : 필요한 이벤트의 시작 시각 구간 (start, end) - None이면 제한 없음
+#   add(item): 구간에 속하는 이벤트 아이템을 start_key 순서대로 하나씩 받음
+#   result() : 위젯 응답 데이터
+# 를 제공합니다. 위젯 하나만 조회할 때는 자신의 구간만 범위 조회하고,
+# /dashboard 처럼 여러 위젯을 함께 계산할 때는 구간들의 합집합을 한 번만 읽어
+# 각 집계기에 자신의 구간에 속하는 아이템만 넘겨주므로 두 경로의 결과가 같습니다.
+#
+# source 가 'creator' 인 집계기는 사용자 파티션이 아니라 creator-start-index 에서 읽습니다.
+#
+# 메모리 캐시에 열 배열(app.db.columnar.EventColumns)이 있으면 add() 대신
+#   add_columns(columns, start, stop): 구간에 속하는 [start, stop) 범위를 벡터 연산으로 한 번에 집계
+# 를 사용합니다 (add_columns 가 없는 위젯은 아이템을 하나씩 받음).
+#
+# add() 는 동기화 때 정규화된 시각 필드(start_ts, start_day, all_day 등 - app.db.event_items.event_time_fields)를
+# 정수로 비교하고, 필드가 없는 이전 아이템만 원본 이벤트의 문자열을 파싱합니다.
+import copy
+import datetime as dt
+import heapq
+import logging
+from datetime import datetime, timedelta, timezone
+
+import pytz
+from dateutil.parser import parse
+
+from app.db.event_items import EVENT_RANGE_SLACK, KOREA_TZ, epoch_date, epoch_day, event_start_time
+
+# 다가오는 일정 위젯 기본 개수
+UPCOMING_DEFAULT_K = 5
+
+logger = logging.getLogger(__name__)
+
+
+###사용자 캘린더 중 이번주에 해당하는 것만 필터링
+def filter_this_week(events, now: datetime = None):
+
+    duration_time = 0.0
+    korea_tz = pytz.timezone("Asia/Seoul")
+    now_korea = now.astimezone(korea_tz) if now else datetime.now(korea_tz)
+
+    start_of_week = (now_korea - timedelta(days=now_korea.weekday())).date()
+    end_of_week = start_of_week + timedelta(days=6)
+
+    for event in events:
+        # 종일 일정은 시간 합계에서 제외 (이전 일정의 시각이 남아 다시 더해지지 않도록 일정마다 초기화)
+        start_time = end_time = None
+        try:
+            if 'start' not in event:
+                continue
+
+            if 'dateTime' in event['start']:
+                start = datetime.strptime(event['start']['dateTime'][:10], '%Y-%m-%d').date()
+                start_time = event['start']['dateTime']
+
+                #일정 시작 시간 추출
+                start_time = datetime.fromisoformat(start_time)
+            else:
+                start = datetime.strptime(event['start']['date'], '%Y-%m-%d').date()
+
+            if 'end' not in event:
+                continue
+
+            if 'dateTime' in event['end']:
+                end = datetime.strptime(event['end']['dateTime'][:10] , '%Y-%m-%d').date()
+                end_time = event['end']['dateTime']
+                end_time = datetime.fromisoformat(end_time)
+            else:
+                end = datetime.strptime(event['end']['date'], '%Y-%m-%d').date()
+
+            if start_time is None or end_time is None:
+                continue
+
+            if start_of_week <= start <= end_of_week or start_of_week <= end <= end_of_week:
+                try:
+                    duration_time += (end_time - start_time).total_seconds() / 60
+                except Exception as e:
+                    logger.error("error call: %s", e)
+        except Exception as e:
+            logger.error("일정 처리 중 에러 발생: %s", e)
+
+
+    return duration_time
+
+
+def find_one_week(now: datetime = None):
+    # now가 주어지면 서버 로컬 날짜로 변환 (dt.date.today()와 같은 기준)
+    today = now.astimezone().date() if now else dt.date.today()
+    this_week_monday = today - dt.timedelta(days=today.weekday())
+    last_week_monday = this_week_monday - dt.timedelta(days=7)
+
+    last_week = [(last_week_monday + dt.timedelta(days=i)) for i in range(7)]
+
+    return last_week
+
+
+def find_uppcoming_events(calendar_data_list: list, now: datetime = None, k: int = UPCOMING_DEFAULT_K) -> list:
+    """
+    캘린더별 일정 목록에서 now 이후 가장 먼저 시작하는 일정 k개를 반환합니다.
+    전체를 정렬하지 않고 크기 k 힙으로 고릅니다 (O(n log k)).
+
+    Args:
+        calendar_data_list (list): 캘린더별 일정 리스트의 리스트
+        now (datetime, optional): 기준 시각 (기본값: 현재 시각)
+        k (int): 반환할 일정 수
+
+    Returns:
+        list: 시작 시각 순 [{'time', 'name', 'category'}]
+    """
+    now = now or datetime.now(timezone.utc)
+    upcoming = []
+    for sublist in calendar_data_list:
+        for data in sublist:
+            start_time = event_start_time(data)
+            if start_time is not None and start_time >= now:
+                upcoming.append((start_time, data))
+
+    return [format_upcoming_event(data) for _, data in heapq.nsmallest(k, upcoming, key=lambda pair: pair[0])]
+
+
+def format_upcoming_event(data: dict) -> dict:
+    start_time = data['start'].get('dateTime') or data['start'].get('date')
+    category = data.get('organizer', {}).get('displayName')
+    summary = data.get('summary')
+
+    # 딕셔너리 생성
+    return {
+        'time': start_time,
+        'name': summary,
+        'category': category
+    }
+
+
+def get_start_datetime(event):
+    start = event.get('start', {})
+    if 'dateTime' in start:  # dateTime이 있으면 사용
+        return parse(start['dateTime'])
+    elif 'date' in start:  # date만 있으면 UTC 기준 자정으로 설정
+        date_only = parse(start['date']).replace(tzinfo=timezone.utc)  # UTC 시간대 설정
+        return date_only
+
+    return datetime.min.replace(tzinfo=timezone.utc)  # 시작 날짜가 없으면 최소값 반환
+
+
+def count_category_distribution(cal_list: list, events: list) -> list:
+    """
+    이벤트 수가 가장 많은 순으로 상위 6개 캘린더(주최자 이메일 기준)를 반환합니다.
+
+    Args:
+        cal_list (list): 사용자 캘린더 리스트
+        events (list): 이번주 이벤트 리스트
+
+    Returns:
+        list: [{'category', 'summary', 'entry_number'}, ...]
+    """
+    return rank_categories(cal_list, count_organizers(events))
+
+
+def count_organizers(events: list) -> dict:
+    """
+    주최자 이메일별 이벤트 수를 처음 나타난 순서대로 셉니다.
+    """
+    organizer_count = {}
+
+    # 이벤트 데이터에서 캘린더별로 개수 세기
+    for event in events:
+        try:
+            event_id = event['organizer']['email']  # event에서 직접 email 접근
+            organizer_count[event_id] = organizer_count.get(event_id, 0) + 1
+        except KeyError as e:
+            logger.error("이벤트 처리 중 KeyError 발생: %s", e)
+            continue
+        except Exception as e:
+            logger.error("이벤트 처리 중 예기치 않은 오류 발생: %s", e)
+            continue
+
+    return organizer_count
+
+
+def rank_categories(cal_list: list, organizer_count: dict) -> list:
+    """
+    주최자 이메일별 이벤트 수로 상위 6개 캘린더 분포 데이터를 만듭니다.
+
+    Args:
+        cal_list (list): 사용자 캘린더 리스트
+        organizer_count (dict): {주최자 이메일: 이벤트 수} (처음 나타난 순서)
+    """
+    # 캘린더 리스트에서 id와 summary 추출하여 calendar_ids 딕셔너리 생성
+    calendar_ids = {item['id']: item['summary'] for item in cal_list}
+    # 각 calendar_id는 처음에 0으로 카운트를 설정
+    event_count = {item['id']: 0 for item in cal_list}
+
+    # 존재하지 않는 캘린더의 이벤트가 있을 경우, 추가하여 카운트
+    for event_id, count in organizer_count.items():
+        event_count[event_id] = event_count.get(event_id, 0) + count
+
+    # 데이터 정리 (상위 6개 추출)
+    sorted_categories = sorted(event_count.items(), key=lambda x: x[1], reverse=True)[:6]
+
+    # 카테고리 분포 데이터 구성 (cal_id, summary, entry_number 포함)
+    return [
+        {
+            "category": cal_id,
+            "summary": calendar_ids.get(cal_id, ""),  # summary가 없을 경우 '' (빈칸)으로 처리
+            "entry_number": count
+        }
+        for cal_id, count in sorted_categories
+    ]
+
+
+def summarize_weekly_activity(events: list, user_email: str) -> dict:
+    """
+    사용자가 만든 이번주 일정으로 요일별(KST) 첫 시작 시각과 마지막 종료 시각(시간 단위)을 계산합니다.
+
+    Returns:
+        dict: {'this_week': [{'day', 'startTime', 'endTime'}, ...]}
+    """
+    return format_weekly_activity(weekly_day_spans(events, user_email))
+
+
+def weekly_day_spans(events: list, user_email: str) -> dict:
+    """
+    요일별(0: 월요일 ~ 6: 일요일) 첫 시작 시각과 마지막 종료 시각을 계산합니다.
+
+    Returns:
+        dict: {요일: {'start', 'end'}} - 일정이 없는 요일은 start 24, end 0
+    """
+    logger.info("총 이벤트 수: %d", len(events))
+
+    # 현재 로그인한 사용자의 일정만 필터링
+    current_user_events = [
+        event for event in events
+        if event.get('creator', {}).get('email') == user_email
+    ]
+    logger.info("현재 사용자의 이벤트 수: %d", len(current_user_events))
+
+    # 요일별 시작/종료 시간을 저장할 딕셔너리 (0: 월요일 ~ 6: 일요일)
+    daily_times = {day: {'start': 24, 'end': 0} for day in range(7)}
+
+    for event in current_user_events:
+        try:
+            start = event['start'].get('dateTime')
+            end = event['end'].get('dateTime')
+
+            if not start or not end:
+                continue
+
+            # 시간 변환 및 KST 적용
+            start_dt = datetime.fromisoformat(start.replace('Z', '+00:00')).astimezone(KOREA_TZ)
+            end_dt = datetime.fromisoformat(end.replace('Z', '+00:00')).astimezone(KOREA_TZ)
+
+            weekday = start_dt.weekday()
+            start_time = start_dt.hour + start_dt.minute / 60
+            end_time = end_dt.hour + end_dt.minute / 60
+
+            # 해당 요일의 최소 시작 시간과 최대 종료 시간 업데이트
+            daily_times[weekday]['start'] = min(daily_times[weekday]['start'], start_time)
+            daily_times[weekday]['end'] = max(daily_times[weekday]['end'], end_time)
+
+        except Exception as e:
+            logger.error("이벤트 처리 중 오류 발생: %s", e)
+            continue
+
+    return daily_times
+
+
+def format_weekly_activity(daily_times: dict) -> dict:
+    # 최종 데이터 형식으로 변환 (이벤트가 있는 날만 포함)
+    this_week_events = [
+        {
+            'day': day,
+            'startTime': times['start'] if times['start'] < 24 else 0,
+            'endTime': times['end'] if times['end'] > 0 else 0
+        }
+        for day, times in daily_times.items()
+        if times['start'] < 24 or times['end'] > 0
+    ]
+
+    return {'this_week': this_week_events}
+
+
+def process_dated_event(sub_event: dict):
+    """
+    월간/주간 일정 화면용으로 이벤트 사본의 start/end 에 로컬 날짜(date)를 채웁니다.
+
+    Returns:
+        tuple: (처리된 이벤트 사본, 시작 날짜 문자열 'YYYY-MM-DD') - 시작 정보가 없으면 (None, None)
+    """
+    if 'start' not in sub_event:
+        return None, None
+
+    # 원본 아이템을 다른 위젯과 함께 쓰므로 start/end 까지 복사
+    processed_sub_event = copy.deepcopy(sub_event)
+
+    # 날짜만 있는 경우 처리
+    if 'date' in sub_event.get('start', {}):
+        start_date = datetime.strptime(sub_event['start']['date'], '%Y-%m-%d')
+        end_date = datetime.strptime(sub_event['end']['date'], '%Y-%m-%d') - timedelta(days=1)
+        event_date = start_date.strftime('%Y-%m-%d')
+
+    # datetime이 있는 경우 처리
+    elif 'dateTime' in sub_event.get('start', {}):
+        event_time = datetime.fromisoformat(sub_event['start']['dateTime'])
+        end_time = datetime.fromisoformat(sub_event['end']['dateTime'])
+        event_date = event_time.strftime('%Y-%m-%d')
+
+        # start와 end 객체에 date 추가
+        processed_sub_event['start']['date'] = event_date
+        processed_sub_event['end']['date'] = end_time.strftime('%Y-%m-%d')
+
+        # 종료 시간이 자정인 경우 처리
+        if end_time.time() == datetime.min.time():
+            end_time = end_time - timedelta(seconds=1)
+            processed_sub_event['end']['date'] = (end_time - timedelta(days=1)).strftime('%Y-%m-%d')
+    else:
+        return None, None
+
+    return processed_sub_event, event_date
+
+
+def is_midnight(value: str) -> bool:
+    # 'YYYY-MM-DDThh:mm:ss[.ffffff][Z|±hh:mm]' 의 시각 부분이 자정인지 (적힌 시각 기준)
+    clock = value[11:].rstrip('Z').split('+')[0].split('-')[0]
+    return clock[:8] == '00:00:00' and not clock[8:].strip('.0')
+
+
+def process_dated_item(item: dict, first_day: int, last_day: int):
+    """
+    시작 날짜가 [first_day, last_day] 인 이벤트 아이템을 process_dated_event 와 같은 모양으로 처리합니다.
+    정규화된 시각 필드로 구간을 확인하므로 구간 밖의 이벤트는 복사하지 않으며,
+    필드가 없는 이전 아이템만 process_dated_event 로 원본 이벤트를 파싱합니다.
+
+    Args:
+        item (dict): 이벤트 아이템
+        first_day (int): 구간 첫 날 (epoch 일 수)
+        last_day (int): 구간 마지막 날 (epoch 일 수)
+
+    Returns:
+        dict: 처리된 이벤트 사본 - 구간 밖이거나 시작/종료 정보가 없으면 None
+    """
+    event = item['event']
+    if 'all_day' not in item:
+        processed_sub_event, event_date = process_dated_event(event)
+        if processed_sub_event is None or not first_day <= epoch_day(dt.date.fromisoformat(event_date)) <= last_day:
+            return None
+        return processed_sub_event
+
+    # process_dated_event 와 같이 종일 일정은 종료 date, 시간 지정 일정은 종료 dateTime 이 있어야 함
+    end_key = 'date' if item['all_day'] else 'dateTime'
+    if 'start_day' not in item or 'end_day' not in item or end_key not in event.get('end', {}):
+        return None
+    if not first_day <= int(item['start_day']) <= last_day:
+        return None
+
+    processed_sub_event = copy.deepcopy(event)
+    if not item['all_day']:
+        processed_sub_event['start']['date'] = epoch_date(item['start_day']).isoformat()
+        end_day = int(item['end_day'])
+        # 종료 시간이 자정인 경우 처리
+        if is_midnight(event['end']['dateTime']):
+            end_day -= 2
+        processed_sub_event['end']['date'] = epoch_date(end_day).isoformat()
+    return processed_sub_event
+
+
+def utc_week_start(now: datetime) -> datetime:
+    today = now.astimezone(pytz.UTC)
+    return (today - timedelta(days=today.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class SpendingTimeWidget:
+    """이번주(KST) 캘린더별 활동 시간(분) - /dashboard-spendingTime"""
+
+    source = 'events'
+
+    def __init__(self, cal_list: list, now: datetime):
+        self.cal_list = cal_list
+        self.now = now
+        now_korea = now.astimezone(KOREA_TZ)
+        self.week_start = KOREA_TZ.localize(datetime.combine((now_korea - timedelta(days=now_korea.weekday())).date(), datetime.min.time()))
+        self.first_day = epoch_day(self.week_start.date())
+        self.last_day = self.first_day + 6
+        # 정규화 필드가 없는 이전 아이템 (filter_this_week 로 계산)
+        self.events_by_calendar = {cal['id']: [] for cal in cal_list}
+        self.minutes = {cal['id']: 0.0 for cal in cal_list}
+
+    def window(self):
+        return self.week_start - EVENT_RANGE_SLACK, self.week_start + timedelta(days=7) + EVENT_RANGE_SLACK
+
+    def add(self, item: dict):
+        cal_id = item['calendar_id']
+        if cal_id not in self.events_by_calendar:
+            return
+        if 'all_day' not in item:
+            self.events_by_calendar[cal_id].append(item['event'])
+            return
+        # filter_this_week 와 같은 기준: 시작 또는 종료 날짜가 이번주(KST 월~일)인 시간 지정 일정
+        if item['all_day'] or 'start_ts' not in item or 'end_ts' not in item or 'dateTime' not in item['event'].get('end', {}):
+            return
+        start_day, end_day = int(item['start_day']), int(item['end_day'])
+        if self.first_day <= start_day <= self.last_day or self.first_day <= end_day <= self.last_day:
+            self.minutes[cal_id] += (int(item['end_ts']) - int(item['start_ts'])) / 60
+
+    def add_columns(self, columns, start: int, stop: int):
+        week_start = self.week_start.date()
+        minutes = columns.weekly_minutes(start, stop, week_start, week_start + timedelta(days=6))
+        for cal_id in self.minutes:
+            self.minutes[cal_id] += minutes.get(cal_id, 0.0)
+
+    def durations(self) -> dict:
+        """{캘린더 ID: 이번주 활동 시간(분)}"""
+        return {
+            cal_id: filter_this_week(events, self.now) + self.minutes[cal_id]
+            for cal_id, events in self.events_by_calendar.items()
+        }
+
+    def result(self) -> dict:
+        """{캘린더 이름: 이번주 활동 시간(분)}"""
+        durations = self.durations()
+        return {calendar['summary']: durations[calendar['id']] for calendar in self.cal_list}
+
+
+class DayEventCountWidget:
+    """지난주 요일별 일정 개수 - /dashboard-by-day-events"""
+
+    source = 'events'
+
+    def __init__(self, cal_list: list, now: datetime):
+        #오늘 기준 일주일 구하기
+        self.one_week = find_one_week(now)
+        #{date:요일} 딕셔너리 선언
+        self.week_datetime = {date.strftime("%Y-%m-%d"): date.strftime("%A") for date in self.one_week}
+        #{요일:0} 딕셔너리 선언
+        self.weekday_event_count = {weekday: 0 for weekday in self.week_datetime.values()}
+        #{epoch 일 수:요일} 딕셔너리 선언 (정규화된 start_day 비교용)
+        self.week_days = {epoch_day(date): date.strftime("%A") for date in self.one_week}
+        self.cal_ids = {cal['id'] for cal in cal_list}
+
+    def window(self):
+        #조회 구간: 지난주 월요일 ~ 일요일 (KST)
+        week_start = KOREA_TZ.localize(datetime.combine(self.one_week[0], datetime.min.time()))
+        return week_start - EVENT_RANGE_SLACK, week_start + timedelta(days=7) + EVENT_RANGE_SLACK
+
+    def add(self, item: dict):
+        if item['calendar_id'] not in self.cal_ids:
+            return
+        if 'all_day' in item:
+            weekday = self.week_days.get(int(item['start_day'])) if 'start_day' in item else None
+            if weekday is not None:
+                self.weekday_event_count[weekday] += 1
+            return
+        try:
+            event = item['event']
+            event_date = event['start'].get('dateTime') or event['start'].get('date')
+            date_obj = datetime.fromisoformat(event_date)
+            # 날짜만 추출해서 출력 (YYYY-MM-DD 형식)
+            date_only = str(date_obj.date()) # datetime.date 객체로 변환
+            if date_only in self.week_datetime:
+                self.weekday_event_count[self.week_datetime[date_only]] +=1
+                logger.debug("요일별 데이터:%s", self.weekday_event_count)
+        except Exception as e:
+            logger.error("Error processing item: %s", e)
+
+    def add_columns(self, columns, start: int, stop: int):
+        counts = columns.day_counts(start, stop, self.one_week[0], len(self.one_week), self.cal_ids)
+        for date, count in zip(self.one_week, counts):
+            self.weekday_event_count[self.week_datetime[date.strftime("%Y-%m-%d")]] += count
+
+    def result(self) -> dict:
+        return self.weekday_event_count
+
+
+class UpcomingWidget:
+    """
+    지금 이후(horizon 이내) 시작하는 일정 k개 - /dashboard-upcomming-schedule
+
+    크기 k 의 최대 힙(시작 시각 기준)에 가장 이른 k개만 남기므로 O(n log k) 입니다.
+    아이템을 start_key 순서로 받을 때는 힙이 찬 뒤의 아이템이 결과를 바꿀 수 없으므로
+    complete 가 참이 되면 읽기를 멈출 수 있습니다.
+    """
+
+    source = 'events'
+
+    def __init__(self, cal_list: list, now: datetime, k: int = UPCOMING_DEFAULT_K, horizon: timedelta = None):
+        self.now = now
+        self.k = k
+        self.horizon = horizon
+        self.calendar_ids = {cal['id'] for cal in cal_list}
+        # (-시작 시각, -도착 순서, 이벤트): 힙의 top 이 현재 k개 중 가장 늦은 일정
+        self.heap = []
+        self.seen = 0
+
+    def window(self):
+        return self.now, (self.now + self.horizon if self.horizon is not None else None)
+
+    @property
+    def complete(self) -> bool:
+        return len(self.heap) >= self.k
+
+    def add(self, item: dict):
+        if item['calendar_id'] not in self.calendar_ids or self.k <= 0:
+            return
+        if 'start_ts' in item:
+            start_ts = int(item['start_ts'])
+        else:
+            start_time = event_start_time(item['event'])
+            if start_time is None:
+                return
+            start_ts = int(start_time.timestamp())
+
+        self.seen += 1
+        entry = (-start_ts, -self.seen, item['event'])
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def result(self) -> list:
+        return [format_upcoming_event(event) for _, _, event in sorted(self.heap, reverse=True)]
+
+
+class WeeklyEventsWidget:
+    """이번주(UTC 월~일) 에 시작하는 시간 지정 일정 목록"""
+
+    source = 'events'
+
+    def __init__(self, cal_list: list, now: datetime):
+        self.this_week_start = utc_week_start(now)
+        self.this_week_end = (self.this_week_start + timedelta(days=6)).replace(hour=23, minute=59, second=59)
+        self.lower_ts = self.this_week_start.timestamp()
+        self.upper_ts = self.this_week_end.timestamp()
+        self.events = []
+
+    def window(self):
+        return self.this_week_start, self.this_week_end
+
+    def add(self, item: dict):
+        if 'all_day' in item:
+            # 종일 일정이 아니면서 start_ts 가 있으면 시작이 dateTime 인 일정
+            if not item['all_day'] and 'start_ts' in item and self.lower_ts <= int(item['start_ts']) <= self.upper_ts:
+                self.events.append(item['event'])
+            return
+        try:
+            sub_event = item['event']
+            if 'start' in sub_event and 'dateTime' in sub_event['start']:
+                event_time = datetime.fromisoformat(sub_event['start']['dateTime'])
+                if self.this_week_start <= event_time <= self.this_week_end:
+                    self.events.append(sub_event)
+        except Exception as sub_e:
+            logger.error("이벤트 처리 중 오류: %s", sub_e)
+
+    def result(self) -> dict:
+        return {
+            'events': self.events,
+            'this_week_start': self.this_week_start.isoformat()
+        }
+
+
+class CategoryWidget(WeeklyEventsWidget):
+    """이번주 이벤트 수 상위 6개 캘린더 - /dashboard-category-dist"""
+
+    def __init__(self, cal_list: list, now: datetime):
+        super().__init__(cal_list, now)
+        self.cal_list = cal_list
+        self.organizer_count = {}
+
+    def add_columns(self, columns, start: int, stop: int):
+        counts = columns.organizer_counts(start, stop, self.this_week_start, self.this_week_end)
+        for organizer, count in counts.items():
+            self.organizer_count[organizer] = self.organizer_count.get(organizer, 0) + count
+
+    def result(self) -> list:
+        organizer_count = count_organizers(self.events)
+        for organizer, count in self.organizer_count.items():
+            organizer_count[organizer] = organizer_count.get(organizer, 0) + count
+        return rank_categories(self.cal_list, organizer_count)
+
+
+class CalendarScheduleWidget:
+    """이번달(UTC) 일정 목록 - /dashboard-calendar-schedule"""
+
+    source = 'events'
+
+    def __init__(self, cal_list: list, now: datetime):
+        today = now.astimezone(pytz.UTC)
+        self.first_day_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        self.first_day_of_next_month = (self.first_day_of_month + timedelta(days=32)).replace(day=1)
+        last_day_of_month = self.first_day_of_next_month - timedelta(days=1)
+        # 이벤트 시간이 이번 달에 속하는지 확인할 날짜 문자열
+        self.month_start = self.first_day_of_month.strftime('%Y-%m-%d')
+        self.month_end = last_day_of_month.strftime('%Y-%m-%d')
+        self.first_day = epoch_day(self.first_day_of_month.date())
+        self.last_day = epoch_day(last_day_of_month.date())
+        self.events = []
+
+    def window(self):
+        # 로컬 날짜 기준 필터를 위해 앞뒤 여유를 두고 범위 조회
+        return self.first_day_of_month - EVENT_RANGE_SLACK, self.first_day_of_next_month + EVENT_RANGE_SLACK
+
+    def add(self, item: dict):
+        try:
+            processed_sub_event = process_dated_item(item, self.first_day, self.last_day)
+            if processed_sub_event is not None:
+                self.events.append(processed_sub_event)
+        except Exception as sub_e:
+            logger.error("이벤트 처리 중 오류: %s", sub_e)
+
+    def result(self) -> dict:
+        return {
+            'events': self.events,
+            'this_month_start': self.first_day_of_month.isoformat()
+        }
+
+
+class CreatedWeeklyEventsWidget:
+    """사용자가 만든 이번주(UTC 월~토) 일정 목록 (creator-start-index 조회)"""
+
+    source = 'creator'
+
+    def __init__(self, user_email: str, now: datetime):
+        self.user_email = user_email
+        self.this_week_start = utc_week_start(now)
+        self.this_week_end = (self.this_week_start + timedelta(days=5)).replace(hour=23, minute=59, second=59)
+        # 이벤트 시간이 이번 주에 속하는지 확인할 날짜 문자열
+        self.week_start = self.this_week_start.strftime('%Y-%m-%d')
+        self.week_end = self.this_week_end.strftime('%Y-%m-%d')
+        self.first_day = epoch_day(self.this_week_start.date())
+        self.last_day = epoch_day(self.this_week_end.date())
+        self.events = []
+
+    def window(self):
+        return self.this_week_start - EVENT_RANGE_SLACK, self.this_week_end + EVENT_RANGE_SLACK
+
+    def add(self, item: dict):
+        try:
+            processed_sub_event = process_dated_item(item, self.first_day, self.last_day)
+            if processed_sub_event is not None:
+                self.events.append(processed_sub_event)
+        except Exception as sub_e:
+            logger.error("이벤트 처리 중 오류: %s", sub_e)
+
+    def result(self) -> dict:
+        return {
+            'events': self.events,
+            'this_week_start': self.this_week_start.isoformat()
+        }
+
+
+class WeeklyActivityWidget(CreatedWeeklyEventsWidget):
+    """요일별 첫 시작/마지막 종료 시각 - /weekly-activity, /dashboard-godLifeBar"""
+
+    def __init__(self, user_email: str, now: datetime):
+        super().__init__(user_email, now)
+        self.spans = {}
+
+    def add(self, item: dict):
+        if 'all_day' not in item:
+            # 정규화 필드가 없는 이전 아이템은 result() 에서 weekly_day_spans 로 계산
+            super().add(item)
+            return
+        # 시작 날짜가 이번주(UTC 월~토)인 사용자가 만든 시간 지정 일정 (종일 일정은 시각이 없어 제외)
+        event = item['event']
+        if (item['all_day'] or 'start_ts' not in item or 'end_ts' not in item
+                or 'dateTime' not in event.get('end', {})
+                or event.get('creator', {}).get('email') != self.user_email
+                or not self.first_day <= int(item['start_day']) <= self.last_day):
+            return
+        start_dt = datetime.fromtimestamp(int(item['start_ts']), KOREA_TZ)
+        end_dt = datetime.fromtimestamp(int(item['end_ts']), KOREA_TZ)
+        self.add_span(start_dt.weekday(), start_dt.hour + start_dt.minute / 60, end_dt.hour + end_dt.minute / 60)
+
+    def add_columns(self, columns, start: int, stop: int):
+        spans = columns.day_spans(start, stop, self.user_email, self.this_week_start.date(), self.this_week_end.date())
+        for day, (first_start, last_end) in spans.items():
+            self.add_span(day, first_start, last_end)
+
+    def add_span(self, day: int, first_start: float, last_end: float):
+        first, last = self.spans.get(day, (24, 0))
+        self.spans[day] = (min(first, first_start), max(last, last_end))
+
+    def result(self) -> dict:
+        daily_times = weekly_day_spans(self.events, self.user_email)
+        for day, (first_start, last_end) in self.spans.items():
+            daily_times[day]['start'] = min(daily_times[day]['start'], first_start)
+            daily_times[day]['end'] = max(daily_times[day]['end'], last_end)
+        return format_weekly_activity(daily_times)
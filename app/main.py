@@ -1,11 +1,43 @@
 # main.py
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.endpoints import login, users, google, calendar
+from app.core.http_client import init_http_client, close_http_client, get_pool_stats
+from app.core.google_auth import access_token_cache, load_client_config
+from app.core.logging_config import get_logging_stats, setup_logging, shutdown_logging
+from app.core.metrics import MetricsMiddleware, bind_routes, register_stats, render_metrics
+from app.core.principal_cache import principal_cache
+from app.core.rate_limit import google_rate_limiter
+from app.core.config import settings
+from app.core.sync_jobs import sync_jobs
+from app.core.sync_scheduler import sync_scheduler
+from app.db.dynamo_client import init_dynamodb, close_dynamodb
+from app.db.event_cache import event_cache
 
 import os
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 공유 리소스 생성 (로그 출력 스레드 - 로그는 큐에 넣고 별도 스레드에서 출력, DynamoDB 세션/커넥션 풀, 구글 API HTTP 커넥션 풀, OAuth 클라이언트 설정, 동기화 작업 워커)
+    setup_logging()
+    init_dynamodb()
+    init_http_client()
+    load_client_config()
+    await sync_jobs.start()
+    if settings.METRICS_ENABLED:
+        bind_routes(app.routes)
+    if settings.SYNC_SCHEDULER_ENABLED:
+        await sync_scheduler.start()
+    yield
+    # 공유 리소스 정리
+    await sync_scheduler.stop()
+    await sync_jobs.stop()
+    await close_http_client()
+    close_dynamodb()
+    shutdown_logging()
+
+app = FastAPI(lifespan=lifespan)
 
 os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 
@@ -15,6 +47,19 @@ app.include_router(users.router, prefix="/api/v1/users")
 app.include_router(google.router, prefix="/api/v1/google")
 app.include_router(calendar.router, prefix="/api/v1/calendar")  # calendar는 /calendar prefix 사용
 
+# 라우트별 요청 지연 히스토그램
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    # 캐시/작업 큐/속도 제한 상태는 수집 시점에 stats()로 읽음
+    register_stats('event_cache', event_cache.stats)
+    register_stats('principal_cache', principal_cache.stats)
+    register_stats('access_token_cache', access_token_cache.stats)
+    register_stats('sync_jobs', sync_jobs.stats)
+    register_stats('sync_scheduler', sync_scheduler.stats)
+    register_stats('google_rate_limiter', google_rate_limiter.stats)
+    register_stats('http_pool', get_pool_stats)
+    register_stats('logging', get_logging_stats)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -25,4 +70,11 @@ app.add_middleware(
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to LookBack API"}
\ No newline at end of file
+    return {"message": "Welcome to LookBack API"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
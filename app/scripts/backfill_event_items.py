@@ -0,0 +1,141 @@
+# backfill_event_items.py
+# 이벤트 단위 테이블의 파생 속성(creator_email, event_key, 정규화된 시각 필드 start_ts/start_day/all_day 등)을
+# 현재 create_event_item 기준으로 다시 채우는 도구 (필드 추가 후 기존 아이템에 한 번 실행)
+# --create-indexes 는 없는 GSI 를 만들고, 프로젝션이 정의와 다른 GSI(예: 정규화 필드가 빠진 creator-start-index)는
+# 삭제 후 다시 만듭니다. DynamoDB는 GSI 프로젝션을 바꿀 수 없기 때문이며,
+# 다시 만드는 동안 해당 인덱스 조회(주간 활동, 갓생 바)는 실패하므로 트래픽이 적을 때 실행합니다.
+#
+# 실행 예시:
+#   python -m app.scripts.backfill_event_items --create-indexes
+#   python -m app.scripts.backfill_event_items --dry-run
+import argparse
+import logging
+import time
+
+from app.db.dynamo_client import get_table
+from app.db.event_items import (
+    EVENT_ITEMS_TABLE,
+    EVENT_ITEMS_TABLE_DEFINITION,
+    create_event_item,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def same_projection(current: dict, expected: dict) -> bool:
+    return (
+        current.get('ProjectionType') == expected.get('ProjectionType')
+        and set(current.get('NonKeyAttributes', [])) == set(expected.get('NonKeyAttributes', []))
+    )
+
+
+def create_missing_indexes():
+    """
+    기존 이벤트 단위 테이블에 EVENT_ITEMS_TABLE_DEFINITION 에 정의된 GSI 중 없는 것을 추가하고,
+    프로젝션이 정의와 다른 GSI는 삭제 후 다시 만듭니다.
+    DynamoDB는 한 번에 하나의 GSI만 만들거나 지울 수 있으므로 하나씩 상태가 바뀔 때까지 기다립니다.
+    """
+    table = get_table(EVENT_ITEMS_TABLE)
+    client = table.meta.client
+    description = client.describe_table(TableName=EVENT_ITEMS_TABLE)['Table']
+    existing = {index['IndexName']: index for index in description.get('GlobalSecondaryIndexes', [])}
+    attribute_types = {
+        attribute['AttributeName']: attribute
+        for attribute in EVENT_ITEMS_TABLE_DEFINITION['AttributeDefinitions']
+    }
+
+    for index in EVENT_ITEMS_TABLE_DEFINITION['GlobalSecondaryIndexes']:
+        current = existing.get(index['IndexName'])
+        if current is not None:
+            if same_projection(current['Projection'], index['Projection']):
+                logger.info("인덱스 %s 이(가) 이미 존재합니다", index['IndexName'])
+                continue
+            logger.info("인덱스 %s 의 프로젝션이 정의와 달라 삭제 후 다시 만듭니다: %s -> %s",
+                        index['IndexName'], current['Projection'], index['Projection'])
+            client.update_table(
+                TableName=EVENT_ITEMS_TABLE,
+                GlobalSecondaryIndexUpdates=[{'Delete': {'IndexName': index['IndexName']}}]
+            )
+            wait_index_deleted(client, index['IndexName'])
+
+        key_names = {key['AttributeName'] for key in index['KeySchema']}
+        client.update_table(
+            TableName=EVENT_ITEMS_TABLE,
+            AttributeDefinitions=[attribute_types[name] for name in key_names],
+            GlobalSecondaryIndexUpdates=[{'Create': index}]
+        )
+        logger.info("인덱스 %s 생성 요청 완료, ACTIVE 대기 중", index['IndexName'])
+        wait_index_active(client, index['IndexName'])
+
+
+def wait_index_active(client, index_name: str, interval: float = 15.0):
+    while True:
+        description = client.describe_table(TableName=EVENT_ITEMS_TABLE)['Table']
+        statuses = {
+            index['IndexName']: index.get('IndexStatus')
+            for index in description.get('GlobalSecondaryIndexes', [])
+        }
+        if statuses.get(index_name) == 'ACTIVE':
+            logger.info("인덱스 %s ACTIVE", index_name)
+            return
+        time.sleep(interval)
+
+
+def wait_index_deleted(client, index_name: str, interval: float = 15.0):
+    while True:
+        description = client.describe_table(TableName=EVENT_ITEMS_TABLE)['Table']
+        names = {index['IndexName'] for index in description.get('GlobalSecondaryIndexes', [])}
+        if index_name not in names:
+            logger.info("인덱스 %s 삭제 완료", index_name)
+            return
+        time.sleep(interval)
+
+
+def backfill(dry_run: bool = False) -> dict:
+    """
+    테이블 전체를 페이지 단위로 스캔하며 파생 속성이 달라진 아이템만 다시 씁니다.
+
+    Args:
+        dry_run (bool): True이면 변경 대상만 집계하고 저장하지 않음
+
+    Returns:
+        dict: 처리 통계 (스캔한 아이템 수, 갱신한 아이템 수)
+    """
+    table = get_table(EVENT_ITEMS_TABLE)
+    stats = {'scanned': 0, 'updated': 0}
+    scan_kwargs = {}
+
+    with table.batch_writer(overwrite_by_pkeys=['user_id', 'start_key']) as batch:
+        while True:
+            response = table.scan(**scan_kwargs)
+            for item in response.get('Items', []):
+                stats['scanned'] += 1
+                rebuilt = create_event_item(item['user_id'], item['calendar_id'], item['event'])
+                # 정렬 키가 바뀌는 경우는 없으므로 같은 키로 덮어쓰기
+                if rebuilt is None or rebuilt['start_key'] != item['start_key'] or rebuilt == item:
+                    continue
+                if not dry_run:
+                    batch.put_item(Item={**item, **rebuilt})
+                stats['updated'] += 1
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    logger.info("백필 완료: %s%s", stats, " (dry-run)" if dry_run else "")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이벤트 단위 테이블 파생 속성 백필")
+    parser.add_argument('--create-indexes', action='store_true', help="정의된 GSI 중 없는 것 추가, 프로젝션이 다른 것은 다시 생성 (creator-start-index, event-key-index)")
+    parser.add_argument('--dry-run', action='store_true', help="저장하지 않고 변경 대상만 집계")
+    args = parser.parse_args()
+
+    if args.create_indexes:
+        create_missing_indexes()
+    backfill(args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# create_tables.py
+# 이벤트 단위 저장소가 사용하는 DynamoDB 테이블을 생성하는 도구
+#
+# 실행 예시:
+#   python -m app.scripts.create_tables
+import logging
+
+from app.db.dynamo_client import get_table
+from app.db.event_items import (
+    EVENT_ITEMS_TABLE_DEFINITION,
+    ROLLUP_TABLE_DEFINITION,
+    SYNC_STATE_TABLE_DEFINITION,
+    WATCH_CHANNEL_TABLE_DEFINITION,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TABLE_DEFINITIONS = [
+    EVENT_ITEMS_TABLE_DEFINITION,
+    SYNC_STATE_TABLE_DEFINITION,
+    ROLLUP_TABLE_DEFINITION,
+    WATCH_CHANNEL_TABLE_DEFINITION,
+]
+
+
+def create_table(definition: dict):
+    """
+    테이블이 없으면 생성하고 사용 가능해질 때까지 기다립니다.
+
+    Args:
+        definition (dict): create_table 인자 (TableName, KeySchema 등)
+    """
+    table_name = definition['TableName']
+    client = get_table(table_name).meta.client
+    if table_name in client.list_tables().get('TableNames', []):
+        logger.info("테이블 %s 이(가) 이미 존재합니다", table_name)
+        return
+
+    client.create_table(**definition)
+    client.get_waiter('table_exists').wait(TableName=table_name)
+    logger.info("테이블 %s 생성 완료", table_name)
+
+
+def main():
+    for definition in TABLE_DEFINITIONS:
+        create_table(definition)
+
+
+if __name__ == '__main__':
+    main()
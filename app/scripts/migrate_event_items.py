@@ -0,0 +1,94 @@
+# migrate_event_items.py
+# (user_id, calendar_id) 단위 blob 테이블을 이벤트 단위 테이블로 옮기는 마이그레이션 도구
+#
+# 실행 예시:
+#   python -m app.scripts.migrate_event_items --create-table
+#   python -m app.scripts.migrate_event_items --dry-run
+#   python -m app.scripts.migrate_event_items --user someone@gmail.com
+import argparse
+import logging
+
+from boto3.dynamodb.conditions import Key
+
+from app.db.dynamo_client import get_table
+from app.db.event_items import (
+    EVENTS_TABLE,
+    EVENT_ITEMS_TABLE,
+    create_event_item,
+)
+from app.scripts.create_tables import TABLE_DEFINITIONS, create_table
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def iter_legacy_items(user_email: str = None):
+    """
+    blob 테이블의 아이템을 페이지 단위로 순회합니다.
+
+    Args:
+        user_email (str, optional): 특정 사용자만 옮길 경우 이메일
+
+    Yields:
+        dict: {'user_id', 'calendar_id', 'events'} 형태의 blob 아이템
+    """
+    table = get_table(EVENTS_TABLE)
+    kwargs = {}
+    if user_email:
+        kwargs['KeyConditionExpression'] = Key('user_id').eq(user_email)
+    operation = table.query if user_email else table.scan
+
+    while True:
+        response = operation(**kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def migrate(user_email: str = None, dry_run: bool = False) -> dict:
+    """
+    blob 아이템의 events 배열을 이벤트 단위 아이템으로 풀어서 저장합니다.
+    같은 키로 다시 쓰기 때문에 여러 번 실행해도 결과가 같습니다.
+
+    Args:
+        user_email (str, optional): 특정 사용자만 옮길 경우 이메일
+        dry_run (bool): True이면 변환만 하고 저장하지 않음
+
+    Returns:
+        dict: 처리 통계 (blob 수, 저장한 이벤트 수, 건너뛴 이벤트 수)
+    """
+    stats = {'blobs': 0, 'written': 0, 'skipped': 0}
+    target = get_table(EVENT_ITEMS_TABLE)
+
+    with target.batch_writer(overwrite_by_pkeys=['user_id', 'start_key']) as batch:
+        for blob in iter_legacy_items(user_email):
+            stats['blobs'] += 1
+            for event in blob.get('events', []):
+                item = create_event_item(blob['user_id'], blob['calendar_id'], event)
+                if item is None:
+                    stats['skipped'] += 1
+                    continue
+                if not dry_run:
+                    batch.put_item(Item=item)
+                stats['written'] += 1
+
+    logger.info("마이그레이션 완료: %s%s", stats, " (dry-run)" if dry_run else "")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="blob 이벤트 테이블을 이벤트 단위 테이블로 마이그레이션")
+    parser.add_argument('--create-table', action='store_true', help="이벤트 단위 테이블 생성")
+    parser.add_argument('--user', help="특정 사용자만 마이그레이션")
+    parser.add_argument('--dry-run', action='store_true', help="저장하지 않고 변환 결과만 집계")
+    args = parser.parse_args()
+
+    if args.create_table:
+        for definition in TABLE_DEFINITIONS:
+            create_table(definition)
+    migrate(args.user, args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# rebuild_rollups.py
+# 대시보드 위젯 집계(lookback-dashboard-rollups)를 다시 만들거나 원본 경로 결과와 비교하는 도구
+#
+# 실행 예시:
+#   python -m app.scripts.rebuild_rollups                       # 모든 사용자 집계 재생성
+#   python -m app.scripts.rebuild_rollups --user someone@gmail.com
+#   python -m app.scripts.rebuild_rollups --check               # 저장된 집계와 원본 경로 결과 비교
+import argparse
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+
+from app.api.v1.endpoints import login  # noqa: F401 (login <-> dynamo 순환 import 순서 보장)
+from app.db import rollups
+from app.db.dynamo import DASHBOARD_WIDGETS, ROLLUP_WIDGETS, compute_dashboard_widgets, refresh_dashboard_rollups
+from app.db.dynamo_client import get_table, iterate_items
+from app.db.event_items import CALENDAR_LIST_TABLE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 동시에 처리할 사용자 수
+CONCURRENCY = 8
+
+
+async def list_users() -> list:
+    """
+    캘린더 리스트 테이블에 있는 모든 사용자 이메일을 반환합니다.
+    """
+    table = get_table(CALENDAR_LIST_TABLE)
+    return [item['user_id'] async for item in iterate_items(table.scan, projection='user_id')]
+
+
+async def check_user(user_email: str, now: datetime) -> list:
+    """
+    사용자의 저장된 집계를 원본 경로로 다시 계산한 결과와 비교합니다.
+
+    Returns:
+        list: 불일치 목록 [{'user', 'widget', 'key', 'reason'}]
+    """
+    mismatches = []
+    try:
+        raw_results = await compute_dashboard_widgets(user_email, ROLLUP_WIDGETS, now)
+    except Exception:
+        raw_results = {}
+    for widget in ROLLUP_WIDGETS:
+        key = rollups.rollup_key(widget, DASHBOARD_WIDGETS[widget][0](now))
+        stored = await rollups.get_rollup(user_email, key)
+        if stored is None:
+            mismatches.append({'user': user_email, 'widget': widget, 'key': key, 'reason': 'missing'})
+        elif widget not in raw_results:
+            mismatches.append({'user': user_email, 'widget': widget, 'key': key, 'reason': 'raw read failed'})
+        # 저장 형식과 같게 맞춘 뒤 비교 (Decimal -> int/float)
+        elif stored != json.loads(rollups.dump_payload(raw_results[widget])):
+            mismatches.append({'user': user_email, 'widget': widget, 'key': key, 'reason': 'differs'})
+    return mismatches
+
+
+async def run(users: list, check: bool) -> dict:
+    now = datetime.now(timezone.utc)
+    users = users or await list_users()
+    limit = asyncio.Semaphore(CONCURRENCY)
+    stats = {'users': len(users), 'rebuilt': 0, 'mismatches': []}
+
+    async def process(user_email: str):
+        async with limit:
+            if check:
+                stats['mismatches'].extend(await check_user(user_email, now))
+            else:
+                await refresh_dashboard_rollups(user_email, now)
+                stats['rebuilt'] += 1
+
+    await asyncio.gather(*(process(user_email) for user_email in users))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 위젯 집계 재생성 / 일관성 검사")
+    parser.add_argument('--user', action='append', default=[], help="특정 사용자만 처리 (여러 번 지정 가능)")
+    parser.add_argument('--check', action='store_true', help="재생성하지 않고 저장된 집계와 원본 경로 결과만 비교")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run(args.user, args.check))
+    for mismatch in stats['mismatches']:
+        logger.warning("집계 불일치: %s", mismatch)
+    logger.info("완료: users=%d rebuilt=%d mismatches=%d", stats['users'], stats['rebuilt'], len(stats['mismatches']))
+    if stats['mismatches']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
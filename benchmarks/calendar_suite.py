@@ -0,0 +1,317 @@
+# calendar_suite.py
+# 대시보드/동기화 경로 전체 벤치마크 (결과는 JSON)
+#
+# 데이터 크기(전체 이벤트 수)마다
+# 1. synthetic_calendar 로 캘린더/이벤트를 만들어 가짜 구글 서버(fake_google)에 올리고
+#    DynamoDB 테이블은 인메모리 대용품(local_dynamo.LocalTable)으로 바꾼 뒤
+# 2. sync     : store_calendar_events 전체 동기화 / 변경 없는 증분 동기화 / 1% 변경 후 증분 동기화
+# 3. dynamo   : app.db.dynamo 의 조회/집계 헬퍼 (이벤트 캐시를 비우고 측정)
+# 4. endpoint : calendar.py 의 엔드포인트를 ASGI 로 호출 (인증 포함, Postgres 대신 인증 캐시에 사용자 등록)
+#               warm = 캐시/집계(rollup)가 있는 평소 경로, cold = 매 요청 전 이벤트 캐시와 집계를 비운 원본 계산 경로
+# 을 측정하고, 케이스별 mean/p50/p95/min/max(ms)를 JSON 으로 출력합니다 (--output 이 있으면 파일로).
+# 케이스마다 --repeat 번 측정하되 --max-seconds 를 넘기면 그만 측정합니다 (첫 호출은 워밍업으로 제외).
+#
+# 실행: python -m benchmarks.calendar_suite --sizes 100 10000 100000 --output bench.json
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+import httpx
+import pytz
+
+from app.api.v1.endpoints import login  # noqa: F401 (login <-> dynamo 순환 import 순서 보장)
+from app.core.config import settings
+from app.core.http_client import close_http_client
+from app.core.principal_cache import principal_cache
+from app.core.security import create_access_token, create_channel_token, decode_token
+from app.db import dynamo, dynamo_client
+from app.db.event_cache import event_cache
+from app.db.event_items import (
+    CALENDAR_LIST_TABLE,
+    EVENT_ITEMS_TABLE_DEFINITION,
+    ROLLUP_TABLE,
+    ROLLUP_TABLE_DEFINITION,
+    SYNC_STATE_TABLE_DEFINITION,
+    WATCH_CHANNEL_TABLE_DEFINITION,
+)
+from app.main import app
+from app.models.user import User
+from benchmarks.fake_google import FakeGoogleCalendar
+from benchmarks.local_dynamo import LocalTable
+from benchmarks.synthetic_calendar import calendar_list, generate_calendars
+
+USER = "bench@example.com"
+API = "/api/v1/calendar"
+
+# (이름, 메서드, 경로, 쿼리) - cold 측정 대상인 대시보드 조회 엔드포인트
+DASHBOARD_ENDPOINTS = [
+    ('dashboard-spendingTime', 'GET', '/dashboard-spendingTime', None),
+    ('dashboard-by-day-events', 'GET', '/dashboard-by-day-events', None),
+    ('dashboard-upcomming-schedule', 'GET', '/dashboard-upcomming-schedule', None),
+    ('dashboard-godLifeBar', 'GET', '/dashboard-godLifeBar', None),
+    ('dashboard-category-dist', 'GET', '/dashboard-category-dist', None),
+    ('dashboard-calendar-schedule', 'GET', '/dashboard-calendar-schedule', None),
+    ('weekly-activity', 'GET', '/weekly-activity', None),
+    ('dashboard', 'GET', '/dashboard', None),
+]
+
+# 실제 구글 OAuth 인증 코드가 있어야 하는 엔드포인트
+SKIPPED_ENDPOINTS = {
+    'dashboard-data': "구글 OAuth 인증 코드 교환(oauth2.googleapis.com)이 필요해 가짜 서버로 측정할 수 없음",
+}
+
+
+def summarize(samples: list) -> dict:
+    ordered = sorted(samples)
+    return {
+        'samples': len(ordered),
+        'mean_ms': round(statistics.mean(ordered) * 1000, 3),
+        'p50_ms': round(ordered[len(ordered) // 2] * 1000, 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        'min_ms': round(ordered[0] * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
+
+
+async def measure(call, repeat: int, max_seconds: float, before=None) -> list:
+    """
+    call() 을 한 번 워밍업한 뒤 repeat 번(또는 max_seconds 까지) 측정합니다.
+    before 가 있으면 매 호출 전에 실행하고 측정 시간에서는 뺍니다.
+    """
+    if before is not None:
+        before()
+    await call()
+    samples = []
+    deadline = time.perf_counter() + max_seconds
+    while len(samples) < repeat and (not samples or time.perf_counter() < deadline):
+        if before is not None:
+            before()
+        started = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def install_tables(calendars: int) -> dict:
+    tables = {
+        definition['TableName']: LocalTable.from_definition(definition)
+        for definition in (EVENT_ITEMS_TABLE_DEFINITION, SYNC_STATE_TABLE_DEFINITION,
+                           ROLLUP_TABLE_DEFINITION, WATCH_CHANNEL_TABLE_DEFINITION)
+    }
+    tables[CALENDAR_LIST_TABLE] = LocalTable('user_id')
+    dynamo_client._tables.update(tables)
+    dynamo.push_to_dynamodb_calendar_list(dynamo.create_dynamodb_data(USER, calendar_list(USER, calendars)))
+    event_cache.clear()
+    return tables
+
+
+def clear_rollups(tables: dict):
+    rollup_table = tables[ROLLUP_TABLE]
+    for key in list(rollup_table.items):
+        rollup_table.delete_item(Key=rollup_table._key_dict(key))
+
+
+def authenticate(user: User) -> dict:
+    # 인증 캐시에 미리 넣어 get_current_user 가 Postgres 를 읽지 않게 함
+    token = create_access_token({'sub': user.email})
+    principal_cache.put(token, decode_token(token), user)
+    return {'Authorization': f"Bearer {token}"}
+
+
+def result(size: int, group: str, name: str, samples: list, **extra) -> dict:
+    return {'size': size, 'group': group, 'name': name, **summarize(samples), **extra}
+
+
+def access_token(run: int) -> str:
+    # 구글 API 사용자별 속도 제한(GOOGLE_RATE_USER_QPS)은 액세스 토큰별로 걸리므로
+    # 연달아 실행하는 동기화가 앞 실행의 버스트를 다 써서 기다리지 않도록 실행마다 다른 토큰 사용
+    return f"fake-access-token-{run}"
+
+
+async def bench_sync(size: int, google: FakeGoogleCalendar, calendars: dict, args) -> list:
+    results = []
+    requests = google.requests
+    started = time.perf_counter()
+    stats = await dynamo.store_calendar_events(USER, access_token(0), full_sync=True)
+    results.append(result(size, 'sync', 'store_calendar_events.full', [time.perf_counter() - started],
+                          upserted=stats['upserted'], google_requests=google.requests - requests))
+
+    samples = []
+    for run in range(args.sync_repeat):
+        started = time.perf_counter()
+        await dynamo.store_calendar_events(USER, access_token(1 + run))
+        samples.append(time.perf_counter() - started)
+    results.append(result(size, 'sync', 'store_calendar_events.incremental_noop', samples))
+
+    # 전체 이벤트의 1%를 바꾼 뒤 증분 동기화
+    changed = 0
+    for calendar_id, events in calendars.items():
+        for event in events[::100]:
+            google.upsert_event(calendar_id, {**event, 'summary': f"{event['summary']} (변경)", 'sequence': 1})
+            changed += 1
+    started = time.perf_counter()
+    stats = await dynamo.store_calendar_events(USER, access_token(1 + args.sync_repeat))
+    results.append(result(size, 'sync', 'store_calendar_events.incremental_changes', [time.perf_counter() - started],
+                          changed=changed, upserted=stats['upserted']))
+    return results
+
+
+async def bench_dynamo(size: int, calendar_ids: list, args) -> list:
+    now = datetime.now(pytz.UTC)
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    widgets = list(dynamo.DASHBOARD_WIDGETS)
+    helpers = [
+        ('query_event_items.month', lambda: dynamo.query_event_items(USER, month_start, month_start + timedelta(days=31))),
+        ('get_user_event_by_calendar', lambda: dynamo.get_user_event_by_calendar(USER, calendar_ids, now)),
+        ('find_one_week_event', lambda: dynamo.find_one_week_event(USER, now)),
+        ('upcomming_event_dict', lambda: dynamo.upcomming_event_dict(USER, now=now)),
+        ('get_weekly_activity_data', lambda: dynamo.get_weekly_activity_data(USER, now)),
+        ('get_weekly_activity_data_per_user', lambda: dynamo.get_weekly_activity_data_per_user(USER, now)),
+        ('get_monthly_activity_data_per_user', lambda: dynamo.get_monthly_activity_data_per_user(USER, now)),
+        ('sum_time_by_calendar', lambda: dynamo.sum_time_by_calendar(USER, now)),
+        ('get_calendar_list_by_user', lambda: dynamo.get_calendar_list_by_user(USER)),
+        ('get_sync_tokens', lambda: dynamo.get_sync_tokens(USER)),
+        ('compute_dashboard_widgets', lambda: dynamo.compute_dashboard_widgets(USER, widgets, now)),
+        ('refresh_dashboard_rollups', lambda: dynamo.refresh_dashboard_rollups(USER, now)),
+        ('load_dashboard', lambda: dynamo.load_dashboard(USER, widgets, now)),
+    ]
+    results = []
+    for name, call in helpers:
+        samples = await measure(call, args.repeat, args.max_seconds, before=event_cache.clear)
+        results.append(result(size, 'dynamo', name, samples))
+    return results
+
+
+async def bench_endpoints(size: int, tables: dict, calendar_ids: list, args) -> list:
+    user = User(email=USER, refresh_token="fake-refresh-token")
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def call(method: str, path: str, params=None, headers=None, expected=(200,)):
+            response = await client.request(method, f"{API}{path}", params=params, headers=headers or auth)
+            if response.status_code not in expected:
+                raise RuntimeError(f"{method} {path}: {response.status_code} {response.text[:200]}")
+            return response
+
+        for name, method, path, params in DASHBOARD_ENDPOINTS:
+            auth = authenticate(user)
+            warm = await measure(lambda: call(method, path, params), args.repeat, args.max_seconds)
+            results.append(result(size, 'endpoint', f"{method} {name}", warm, mode='warm'))
+
+            def reset():
+                event_cache.clear()
+                clear_rollups(tables)
+            cold = await measure(lambda: call(method, path, params), args.repeat, args.max_seconds, before=reset)
+            results.append(result(size, 'endpoint', f"{method} {name}", cold, mode='cold'))
+
+        # 같은 ETag 로 다시 요청 (304)
+        auth = authenticate(user)
+        etag = (await call('GET', '/dashboard')).headers.get('ETag')
+        conditional = await measure(
+            lambda: call('GET', '/dashboard', headers={**auth, 'If-None-Match': etag}, expected=(200, 304)),
+            args.repeat, args.max_seconds
+        )
+        results.append(result(size, 'endpoint', "GET dashboard", conditional, mode='if-none-match'))
+
+        # 작업 등록만 측정 (워커를 띄우지 않으므로 동기화는 실행되지 않음)
+        job_id = (await call('POST', '/sync-events', expected=(202,))).json()['job_id']
+        for name, method, path, expected in [
+            ('sync-calendar', 'POST', '/sync-calendar', (202,)),
+            ('sync-events', 'POST', '/sync-events', (202,)),
+            ('sync-jobs/{job_id}', 'GET', f"/sync-jobs/{job_id}", (200,)),
+        ]:
+            samples = await measure(lambda: call(method, path, expected=expected), args.repeat, args.max_seconds)
+            results.append(result(size, 'endpoint', f"{method} {name}", samples, mode='warm'))
+
+        calendar_id = calendar_ids[-1]
+        webhook_headers = {
+            'X-Goog-Channel-ID': 'bench-channel',
+            'X-Goog-Channel-Token': create_channel_token('bench-channel', USER, calendar_id),
+            'X-Goog-Resource-ID': 'bench-resource',
+            'X-Goog-Resource-URI': f"{settings.GOOGLE_CALENDAR_API_BASE}/calendars/{quote(calendar_id, safe='')}/events?alt=json",
+            'X-Goog-Resource-State': 'exists',
+        }
+        samples = await measure(lambda: call('POST', '/webhook', headers=webhook_headers), args.repeat, args.max_seconds)
+        results.append(result(size, 'endpoint', "POST webhook", samples, mode='warm'))
+
+    for name, reason in SKIPPED_ENDPOINTS.items():
+        results.append({'size': size, 'group': 'endpoint', 'name': f"GET {name}", 'skipped': reason})
+    return results
+
+
+async def run_size(size: int, args) -> list:
+    calendars = generate_calendars(
+        USER, calendars=args.calendars, total_events=size,
+        recurring_share=args.recurring_share, all_day_share=args.all_day_share,
+        span_days=args.span_days, seed=args.seed
+    )
+    calendar_ids = list(calendars)
+    tables = install_tables(args.calendars)
+
+    with FakeGoogleCalendar(calendars) as google:
+        settings.GOOGLE_CALENDAR_API_BASE = google.base_url
+        try:
+            results = await bench_sync(size, google, calendars, args)
+            results += await bench_dynamo(size, calendar_ids, args)
+            results += await bench_endpoints(size, tables, calendar_ids, args)
+        finally:
+            await close_http_client()
+
+    items = len(tables[EVENT_ITEMS_TABLE_DEFINITION['TableName']].items)
+    for entry in results:
+        entry['stored_items'] = items
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10000, 100000], help="전체 이벤트 수")
+    parser.add_argument('--calendars', type=int, default=8)
+    parser.add_argument('--recurring-share', type=float, default=0.1)
+    parser.add_argument('--all-day-share', type=float, default=0.1)
+    parser.add_argument('--span-days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--sync-repeat', type=int, default=3)
+    parser.add_argument('--max-seconds', type=float, default=10.0, help="케이스당 최대 측정 시간")
+    parser.add_argument('--output', help="결과 JSON 파일 (없으면 표준출력)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    report = {
+        'meta': {
+            'started_at': datetime.now(pytz.UTC).isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': vars(args),
+        },
+        'results': [],
+    }
+    for size in args.sizes:
+        report['results'] += asyncio.run(run_size(size, args))
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
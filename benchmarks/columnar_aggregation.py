@@ -0,0 +1,117 @@
+# columnar_aggregation.py
+# 대시보드 위젯 집계를 아이템 단위(dict 순회 + 일정마다 정규화된 시각 필드 비교)로 할 때와
+# NumPy 열 배열(app.db.columnar.EventColumns)로 할 때의 계산 시간을 비교합니다.
+#
+# 사용자 한 명의 이벤트를 N개 만들어 메모리 캐시와 같은 EventSet 으로 만든 뒤
+# - items  : 위젯마다 자기 구간의 아이템을 add()로 하나씩 넘겨 계산 (캐시가 없을 때의 경로)
+# - columns: 위젯마다 자기 구간을 add_columns()로 한 번에 계산 (캐시된 열 배열 사용)
+# - build  : 열 배열 생성 시간 (동기화 세대마다 한 번)
+# 을 측정하고 두 경로의 결과가 같은지 확인합니다.
+#
+# 실행: python -m benchmarks.columnar_aggregation --events 10000 100000
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.db.event_cache import EventSet
+from app.db.event_items import create_event_item, start_key_range
+from app.db.widgets import CategoryWidget, DayEventCountWidget, SpendingTimeWidget, WeeklyActivityWidget
+
+USER = "user@example.com"
+CALENDARS = [USER] + [f"calendar{i}@group.calendar.google.com" for i in range(7)]
+
+
+def make_items(count: int, now: datetime) -> list:
+    # 최근 8주에 고르게 퍼진 일정 (일부는 종일 일정, 일부는 다른 사람이 만든 일정)
+    rng = random.Random(count)
+    items = []
+    for index in range(count):
+        start = (now - timedelta(minutes=rng.randrange(8 * 7 * 24 * 60))).replace(second=0, microsecond=0)
+        calendar_id = rng.choice(CALENDARS)
+        event = {
+            'id': f"evt{index}",
+            'summary': f"일정 {index}",
+            'creator': {'email': USER if rng.random() < 0.7 else calendar_id},
+            'organizer': {'email': calendar_id},
+        }
+        if rng.random() < 0.1:
+            event['start'] = {'date': start.date().isoformat()}
+            event['end'] = {'date': (start.date() + timedelta(days=1)).isoformat()}
+        else:
+            local = start.astimezone(timezone(timedelta(hours=9)))
+            event['start'] = {'dateTime': local.isoformat()}
+            event['end'] = {'dateTime': (local + timedelta(minutes=rng.choice([30, 60, 90, 180]))).isoformat()}
+        items.append(create_event_item(USER, calendar_id, event))
+    return items
+
+
+def build_widgets(now: datetime) -> list:
+    cal_list = [{'id': calendar_id, 'summary': calendar_id.split('@')[0]} for calendar_id in CALENDARS]
+    return [
+        SpendingTimeWidget(cal_list, now),
+        DayEventCountWidget(cal_list, now),
+        CategoryWidget(cal_list, now),
+        WeeklyActivityWidget(USER, now),
+    ]
+
+
+def run_items(events: EventSet, now: datetime) -> list:
+    widgets = build_widgets(now)
+    for widget in widgets:
+        for item in events.select(*start_key_range(*widget.window())):
+            widget.add(item)
+    return [widget.result() for widget in widgets]
+
+
+def run_columns(events: EventSet, now: datetime) -> list:
+    widgets = build_widgets(now)
+    for widget in widgets:
+        start, stop = events.index_range(*start_key_range(*widget.window()))
+        widget.add_columns(events.columns, start, stop)
+    return [widget.result() for widget in widgets]
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # 위젯 집계 중 남기는 로그(항목별 오류 로그 포함)는 측정에서 제외
+    logging.disable(logging.ERROR)
+    now = datetime.now(timezone.utc)
+
+    for count in args.events:
+        items = make_items(count, now)
+
+        started = time.perf_counter()
+        events = EventSet(None, None, items)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        same = run_items(events, now) == run_columns(events, now)
+
+        items_ms = best_of(lambda: run_items(events, now), args.repeat) * 1000
+        columns_ms = best_of(lambda: run_columns(events, now), args.repeat) * 1000
+        print({
+            'events': count,
+            'items_ms': round(items_ms, 2),
+            'columns_ms': round(columns_ms, 2),
+            'speedup': round(items_ms / columns_ms, 1),
+            'build_ms': round(build_ms, 2),
+            'same_result': same,
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# dashboard_concurrency.py
+# 동시 대시보드 요청 50개에 대한 p50/p99 지연시간을 측정합니다.
+#
+# before: boto3 호출을 이벤트 루프에서 직접 실행 (기존 방식)
+# after : run_dynamo 스레드 풀을 통해 실행
+#
+# 실행: python -m benchmarks.dashboard_concurrency --requests 50 --latency-ms 20
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.api.v1.endpoints import login  # noqa: F401 (login <-> dynamo 순환 import 순서 보장)
+from app.db import dynamo, dynamo_client
+
+
+class FakeTable:
+    """네트워크 왕복 시간만큼 블로킹되는 DynamoDB 테이블 대용품"""
+
+    def __init__(self, latency: float, items: list = None, item: dict = None):
+        self.latency = latency
+        self.items = items or []
+        self.item = item
+
+    def query(self, **kwargs):
+        time.sleep(self.latency)
+        return {'Items': self.items}
+
+    def get_item(self, **kwargs):
+        time.sleep(self.latency)
+        return {'Item': self.item} if self.item else {}
+
+
+async def blocking_run(func, *args, **kwargs):
+    # 기존 코드와 동일하게 이벤트 루프 스레드에서 바로 실행
+    return func(*args, **kwargs)
+
+
+async def dashboard_request(user_email: str, arrived: float) -> float:
+    # /dashboard-spendingTime 과 동일한 접근 패턴
+    # 요청 도착 시점부터 측정해야 이벤트 루프 대기 시간이 포함됨
+    cal_list = await dynamo.get_calendar_list_by_user(user_email)
+    for cal in cal_list:
+        await dynamo.get_user_event(user_email, cal['id'])
+    return time.perf_counter() - arrived
+
+
+async def run_round(requests: int) -> list:
+    arrived = time.perf_counter()
+    return await asyncio.gather(*(dashboard_request(f"user{i}@example.com", arrived) for i in range(requests)))
+
+
+def summarize(label: str, latencies: list) -> dict:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    result = {
+        'mode': label,
+        'p50_ms': round(statistics.median(ordered) * 1000, 1),
+        'p99_ms': round(p99 * 1000, 1),
+    }
+    print(result)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--calendars', type=int, default=3)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    dynamo.logger.disabled = True
+    dynamo_client._tables['lookback-calendar-list'] = FakeTable(
+        latency, item={'calendar': [{'id': f'cal{i}', 'summary': f'cal{i}'} for i in range(args.calendars)]}
+    )
+    dynamo_client._tables['lookback-calendar-events'] = FakeTable(latency, items=[{'events': []}])
+
+    original_run = dynamo.run_dynamo
+    dynamo.run_dynamo = blocking_run
+    before = summarize('before', asyncio.run(run_round(args.requests)))
+
+    dynamo.run_dynamo = original_run
+    after = summarize('after', asyncio.run(run_round(args.requests)))
+
+    print(f"p99 개선: {before['p99_ms'] / after['p99_ms']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+# fake_google.py
+# 벤치마크용 로컬 가짜 Google Calendar API 서버
+#
+# 실제 TCP 소켓으로 요청을 받는 스레드 HTTP 서버이므로 앱 코드는 그대로 두고
+# settings.GOOGLE_CALENDAR_API_BASE 만 base_url 로 바꾸면 됩니다.
+# - 캘린더별 지연(latency)을 요청마다 주입
+# - pageToken/maxResults 페이지 나누기, syncToken 증분 조회 및 만료(410) 흉내
+# - 요청 수와 최대 동시 처리 수 기록
+# - events.watch / channels.stop 채널 등록과, 이벤트가 바뀌면 등록된 주소로 보내는 푸시 알림 흉내
+#   (notify 를 주면 HTTP 대신 notify(address, headers) 를 호출 - 예: TestClient 로 바로 전달)
+# - fail_next 로 다음 요청들에 429 / 403 rateLimitExceeded / 5xx 응답 주입 (Retry-After 포함)
+#
+# 사용 예시:
+#   with FakeGoogleCalendar({'a': events}, latency={'a': 0.2}) as google:
+#       settings.GOOGLE_CALENDAR_API_BASE = google.base_url
+import itertools
+import json
+import re
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+DEFAULT_PAGE_SIZE = 250
+MAX_PAGE_SIZE = 2500
+
+_EVENTS_PATH = re.compile(r'^/calendar/v3/calendars/([^/]+)/events$')
+_WATCH_PATH = re.compile(r'^/calendar/v3/calendars/([^/]+)/events/watch$')
+_CALENDAR_LIST_PATH = '/calendar/v3/users/me/calendarList'
+_CHANNEL_STOP_PATH = '/calendar/v3/channels/stop'
+
+
+def make_events(calendar_id: str, count: int, start: datetime = None, creator: str = None) -> list:
+    """
+    한 시간짜리 일정 count개를 30분 간격으로 만듭니다.
+    """
+    start = start or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    events = []
+    for index in range(count):
+        event_start = start + timedelta(minutes=30 * index)
+        events.append({
+            'id': f"{re.sub('[^a-z0-9]', '', calendar_id.lower())}{index}",
+            'status': 'confirmed',
+            'summary': f"일정 {index}",
+            'start': {'dateTime': event_start.isoformat()},
+            'end': {'dateTime': (event_start + timedelta(hours=1)).isoformat()},
+            'creator': {'email': creator or calendar_id},
+            'organizer': {'email': creator or calendar_id},
+        })
+    return events
+
+
+class _Calendar:
+    def __init__(self, events: list):
+        self.version = 0
+        # 이벤트 ID -> (변경된 버전, 이벤트)
+        self.events = {event['id']: (0, event) for event in events}
+
+
+class _Server(ThreadingHTTPServer):
+    # 동시 연결이 많을 때 listen backlog(기본 5)가 넘쳐 SYN 재전송 지연이 생기지 않도록 함
+    request_queue_size = 128
+
+
+class FakeGoogleCalendar:
+    """
+    가짜 Google Calendar API 서버
+
+    Args:
+        calendars (dict): {캘린더 ID: 이벤트 리스트}
+        latency (float | dict): 요청당 지연(초). dict이면 캘린더 ID별 지연
+        page_size (int): maxResults가 없을 때 한 페이지 이벤트 수 (구글 기본값 250)
+        notify: 푸시 알림 전달 함수 notify(address, headers) (없으면 address 로 HTTP POST)
+    """
+
+    def __init__(self, calendars: dict, latency=0.0, page_size: int = DEFAULT_PAGE_SIZE, notify=None):
+        self.calendars = {calendar_id: _Calendar(events) for calendar_id, events in calendars.items()}
+        self.latency = latency
+        self.page_size = page_size
+        self.notify = notify
+        # 채널 ID -> {'calendar_id', 'address', 'token', 'resource_id', 'expiration'}
+        self.channels = {}
+        self.notifications = []
+        self._message_numbers = itertools.count(1)
+        # 주입할 실패 응답 [(status, reason, retry_after)]
+        self._failures = []
+        self.failures_served = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    # 서버 수명 관리
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/calendar/v3"
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 헤더/본문을 나눠 쓰므로 Nagle + delayed ACK 지연(~40ms)이 섞이지 않도록 함
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, body, headers = fake._injected_failure() or (*fake._handle(self.path), {})
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+                status, result, headers = fake._injected_failure() or (*fake._handle_post(self.path, body), {})
+                payload = json.dumps(result).encode() if result is not None else b''
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _Server(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    # 데이터 변경 (증분 동기화 흉내)
+    def upsert_event(self, calendar_id: str, event: dict):
+        with self._lock:
+            calendar = self.calendars[calendar_id]
+            calendar.version += 1
+            calendar.events[event['id']] = (calendar.version, event)
+        self._notify_channels(calendar_id)
+
+    def delete_event(self, calendar_id: str, event_id: str):
+        with self._lock:
+            calendar = self.calendars[calendar_id]
+            calendar.version += 1
+            calendar.events[event_id] = (calendar.version, {'id': event_id, 'status': 'cancelled'})
+        self._notify_channels(calendar_id)
+
+    # 실패 응답 주입 (속도 제한 / 일시 오류 흉내)
+    def fail_next(self, count: int, status: int = 429, reason: str = None, retry_after=None):
+        """
+        다음 count개 요청에 실패 응답을 돌려줍니다.
+
+        Args:
+            status (int): 응답 코드 (429, 403, 503 등)
+            reason (str, optional): error.errors[].reason (예: 'rateLimitExceeded', 'userRateLimitExceeded')
+            retry_after (optional): Retry-After 헤더 값
+        """
+        with self._lock:
+            self._failures.extend([(status, reason, retry_after)] * count)
+
+    def _injected_failure(self):
+        with self._lock:
+            if not self._failures:
+                return None
+            status, reason, retry_after = self._failures.pop(0)
+            self.requests += 1
+            self.failures_served += 1
+        error = {'code': status, 'message': reason or 'Injected failure'}
+        if reason:
+            error['errors'] = [{'domain': 'usageLimits', 'reason': reason}]
+        headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+        return status, {'error': error}, headers
+
+    # 푸시 알림
+    def _notification_headers(self, channel_id: str, channel: dict, state: str) -> dict:
+        return {
+            'X-Goog-Channel-ID': channel_id,
+            'X-Goog-Channel-Token': channel['token'],
+            'X-Goog-Channel-Expiration': time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(channel['expiration'] / 1000)),
+            'X-Goog-Resource-ID': channel['resource_id'],
+            'X-Goog-Resource-URI': f"{self.base_url}/calendars/{quote(channel['calendar_id'], safe='')}/events?alt=json",
+            'X-Goog-Resource-State': state,
+            'X-Goog-Message-Number': str(next(self._message_numbers)),
+        }
+
+    def _send(self, address: str, headers: dict):
+        self.notifications.append((address, headers))
+        if self.notify is not None:
+            self.notify(address, headers)
+            return
+        # 실제 구글처럼 변경 요청과 별개로 비동기 전달 (실패는 무시)
+        def post():
+            try:
+                request = urllib.request.Request(address, data=b'', headers=headers, method='POST')
+                urllib.request.urlopen(request, timeout=5).close()
+            except Exception:
+                pass
+        threading.Thread(target=post, daemon=True).start()
+
+    def _notify_channels(self, calendar_id: str, state: str = 'exists'):
+        with self._lock:
+            targets = [
+                (channel['address'], self._notification_headers(channel_id, channel, state))
+                for channel_id, channel in self.channels.items()
+                if channel['calendar_id'] == calendar_id
+            ]
+        for address, headers in targets:
+            self._send(address, headers)
+
+    # 요청 처리
+    def _delay(self, calendar_id: str = None) -> float:
+        if isinstance(self.latency, dict):
+            return self.latency.get(calendar_id, 0.0)
+        return self.latency
+
+    def _handle(self, path: str):
+        parsed = urlparse(path)
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        match = _EVENTS_PATH.match(parsed.path)
+        calendar_id = unquote(match.group(1)) if match else None
+
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self._delay(calendar_id))
+            if parsed.path == _CALENDAR_LIST_PATH:
+                return 200, {'items': [{'id': calendar_id} for calendar_id in self.calendars]}
+            if calendar_id is None or calendar_id not in self.calendars:
+                return 404, {'error': {'code': 404, 'message': 'Not Found'}}
+            return self._list_events(calendar_id, params)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _handle_post(self, path: str, body: dict):
+        parsed = urlparse(path)
+        with self._lock:
+            self.requests += 1
+        if parsed.path == _CHANNEL_STOP_PATH:
+            with self._lock:
+                channel = self.channels.get(body.get('id'))
+                if channel is None or channel['resource_id'] != body.get('resourceId'):
+                    return 404, {'error': {'code': 404, 'message': 'Channel not found'}}
+                del self.channels[body['id']]
+            return 204, None
+
+        match = _WATCH_PATH.match(parsed.path)
+        calendar_id = unquote(match.group(1)) if match else None
+        if calendar_id is None or calendar_id not in self.calendars:
+            return 404, {'error': {'code': 404, 'message': 'Not Found'}}
+        ttl = int(body.get('params', {}).get('ttl', 7 * 24 * 3600))
+        channel = {
+            'calendar_id': calendar_id,
+            'address': body['address'],
+            'token': body.get('token'),
+            'resource_id': uuid.uuid4().hex,
+            'expiration': int((time.time() + ttl) * 1000),
+        }
+        with self._lock:
+            self.channels[body['id']] = channel
+        # 등록 직후 'sync' 알림
+        self._send(channel['address'], self._notification_headers(body['id'], channel, 'sync'))
+        return 200, {
+            'kind': 'api#channel',
+            'id': body['id'],
+            'resourceId': channel['resource_id'],
+            'resourceUri': f"{self.base_url}/calendars/{quote(calendar_id, safe='')}/events?alt=json",
+            'token': channel['token'],
+            'expiration': str(channel['expiration']),
+        }
+
+    def _list_events(self, calendar_id: str, params: dict):
+        with self._lock:
+            calendar = self.calendars[calendar_id]
+            version = calendar.version
+            entries = sorted(calendar.events.values(), key=lambda entry: entry[1]['id'])
+
+        since = None
+        if 'syncToken' in params:
+            token = params['syncToken']
+            if not token.startswith('sync-') or int(token[5:]) > version:
+                return 410, {'error': {'code': 410, 'message': 'Sync token is no longer valid'}}
+            since = int(token[5:])
+        if since is None:
+            events = [event for _, event in entries if event.get('status') != 'cancelled']
+        else:
+            events = [event for changed, event in entries if changed > since]
+
+        page_size = min(int(params.get('maxResults', self.page_size)), MAX_PAGE_SIZE)
+        offset = int(params.get('pageToken', 0))
+        body = {'items': events[offset:offset + page_size]}
+        if offset + page_size < len(events):
+            body['nextPageToken'] = str(offset + page_size)
+        else:
+            body['nextSyncToken'] = f"sync-{version}"
+        return 200, body
@@ -0,0 +1,295 @@
+# local_dynamo.py
+# 벤치마크용 인메모리 DynamoDB 테이블 대용품
+#
+# boto3 Table 리소스와 같은 메서드 이름/인자를 받아 dynamo_client._tables 에 그대로 끼워 넣을 수 있습니다.
+# 파티션/GSI 별로 정렬된 키 목록을 유지하므로 query 비용은 실제 DynamoDB처럼
+# 테이블 전체 크기가 아니라 조회 범위 크기에 비례하고, scan 은 전체 크기에 비례합니다.
+import bisect
+import copy
+import threading
+import time
+
+
+def _leaves(condition) -> list:
+    expression = condition.get_expression()
+    if expression['operator'] == 'AND':
+        return [leaf for value in expression['values'] for leaf in _leaves(value)]
+    return [condition]
+
+
+def _matches(condition, item: dict) -> bool:
+    expression = condition.get_expression()
+    operator = expression['operator']
+    values = expression['values']
+
+    if operator == 'AND':
+        return all(_matches(value, item) for value in values)
+    if operator == 'OR':
+        return any(_matches(value, item) for value in values)
+    if operator == 'NOT':
+        return not _matches(values[0], item)
+
+    value = item.get(values[0].name)
+    if operator == 'attribute_exists':
+        return value is not None
+    if operator == 'attribute_not_exists':
+        return value is None
+    if value is None:
+        return False
+    if operator == '=':
+        return value == values[1]
+    if operator == '<>':
+        return value != values[1]
+    if operator == '<':
+        return value < values[1]
+    if operator == '<=':
+        return value <= values[1]
+    if operator == '>':
+        return value > values[1]
+    if operator == '>=':
+        return value >= values[1]
+    if operator == 'BETWEEN':
+        return values[1] <= value <= values[2]
+    if operator == 'begins_with':
+        return value.startswith(values[1])
+    if operator == 'IN':
+        return value in values[1]
+    raise NotImplementedError(operator)
+
+
+def _range_bounds(condition):
+    """정렬 키 조건을 (하한, 상한, 하한 포함, 상한 포함) 으로 변환"""
+    if condition is None:
+        return None, None, True, True
+    expression = condition.get_expression()
+    operator = expression['operator']
+    values = expression['values']
+    if operator == '=':
+        return values[1], values[1], True, True
+    if operator == 'BETWEEN':
+        return values[1], values[2], True, True
+    if operator == '>=':
+        return values[1], None, True, True
+    if operator == '>':
+        return values[1], None, False, True
+    if operator == '<=':
+        return None, values[1], True, True
+    if operator == '<':
+        return None, values[1], True, False
+    if operator == 'begins_with':
+        return values[1], values[1] + '\uffff', True, True
+    raise NotImplementedError(operator)
+
+
+class _Index:
+    """해시 키 -> 정렬된 (정렬 키, 테이블 키) 목록"""
+
+    def __init__(self, hash_key: str, range_key: str = None):
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.partitions = {}
+
+    def entry(self, item: dict, table_key: tuple):
+        if self.hash_key not in item:
+            return None, None
+        if self.range_key is not None and self.range_key not in item:
+            return None, None
+        sort_value = item.get(self.range_key, '') if self.range_key else ''
+        return item[self.hash_key], (sort_value, table_key)
+
+    def add(self, item: dict, table_key: tuple):
+        hash_value, entry = self.entry(item, table_key)
+        if hash_value is not None:
+            bisect.insort(self.partitions.setdefault(hash_value, []), entry)
+
+    def remove(self, item: dict, table_key: tuple):
+        hash_value, entry = self.entry(item, table_key)
+        if hash_value is None:
+            return
+        entries = self.partitions.get(hash_value, [])
+        position = bisect.bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            entries.pop(position)
+
+
+class _BatchWriter:
+    def __init__(self, table):
+        self.table = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def put_item(self, Item):
+        self.table.put_item(Item=Item)
+
+    def delete_item(self, Key):
+        self.table.delete_item(Key=Key)
+
+
+class LocalTable:
+    """
+    인메모리 DynamoDB 테이블
+
+    Args:
+        hash_key (str): 파티션 키 이름
+        range_key (str, optional): 정렬 키 이름
+        indexes (dict, optional): {인덱스 이름: (해시 키, 정렬 키)} 형태의 GSI 정의
+        page_size (int): 한 번의 query/scan 이 반환하는 최대 아이템 수 (1MB 페이지 흉내)
+        latency (float): 호출마다 블로킹할 초 단위 지연 (네트워크 왕복 흉내)
+    """
+
+    def __init__(self, hash_key: str, range_key: str = None, indexes: dict = None,
+                 page_size: int = 1000, latency: float = 0.0):
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.page_size = page_size
+        self.latency = latency
+        self.items = {}
+        self.primary = _Index(hash_key, range_key)
+        self.indexes = {name: _Index(*keys) for name, keys in (indexes or {}).items()}
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_definition(cls, definition: dict, **kwargs):
+        """
+        create_table 인자(app.db.event_items 의 *_TABLE_DEFINITION)와 같은 키/GSI 구성의 테이블을 만듭니다.
+        """
+        def keys(schema: list) -> tuple:
+            roles = {key['KeyType']: key['AttributeName'] for key in schema}
+            return roles['HASH'], roles.get('RANGE')
+
+        indexes = {index['IndexName']: keys(index['KeySchema']) for index in definition.get('GlobalSecondaryIndexes', [])}
+        return cls(*keys(definition['KeySchema']), indexes=indexes, **kwargs)
+
+    # 내부 헬퍼
+    def _record(self, operation: str):
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _key(self, item: dict) -> tuple:
+        return item[self.hash_key], item.get(self.range_key) if self.range_key else None
+
+    def _key_dict(self, key: tuple) -> dict:
+        result = {self.hash_key: key[0]}
+        if self.range_key:
+            result[self.range_key] = key[1]
+        return result
+
+    def _all_indexes(self):
+        return [self.primary, *self.indexes.values()]
+
+    @staticmethod
+    def _project(item: dict, projection: str = None) -> dict:
+        if not projection:
+            return copy.deepcopy(item)
+        names = [name.strip() for name in projection.split(',')]
+        return {name: copy.deepcopy(item[name]) for name in names if name in item}
+
+    # boto3 Table 인터페이스
+    def put_item(self, Item, **kwargs):
+        self._record('put_item')
+        with self._lock:
+            key = self._key(Item)
+            if key in self.items:
+                self._remove(key)
+            stored = copy.deepcopy(Item)
+            self.items[key] = stored
+            for index in self._all_indexes():
+                index.add(stored, key)
+        return {}
+
+    def _remove(self, key: tuple):
+        stored = self.items.pop(key)
+        for index in self._all_indexes():
+            index.remove(stored, key)
+        return stored
+
+    def delete_item(self, Key, **kwargs):
+        self._record('delete_item')
+        with self._lock:
+            key = self._key(Key)
+            if key in self.items:
+                self._remove(key)
+        return {}
+
+    def get_item(self, Key, ProjectionExpression=None, **kwargs):
+        self._record('get_item')
+        item = self.items.get(self._key(Key))
+        return {'Item': self._project(item, ProjectionExpression)} if item is not None else {}
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        return _BatchWriter(self)
+
+    def query(self, KeyConditionExpression, IndexName=None, FilterExpression=None,
+              ProjectionExpression=None, Limit=None, ExclusiveStartKey=None,
+              ScanIndexForward=True, **kwargs):
+        self._record('query')
+        index = self.indexes[IndexName] if IndexName else self.primary
+
+        hash_value, range_condition = None, None
+        for leaf in _leaves(KeyConditionExpression):
+            expression = leaf.get_expression()
+            if expression['values'][0].name == index.hash_key and expression['operator'] == '=':
+                hash_value = expression['values'][1]
+            else:
+                range_condition = leaf
+
+        with self._lock:
+            entries = list(index.partitions.get(hash_value, []))
+
+        low, high, low_inclusive, high_inclusive = _range_bounds(range_condition)
+        start = 0 if low is None else (
+            bisect.bisect_left(entries, (low,)) if low_inclusive else bisect.bisect_right(entries, (low, (chr(0x10ffff),)))
+        )
+        end = len(entries) if high is None else (
+            bisect.bisect_right(entries, (high, (chr(0x10ffff),))) if high_inclusive else bisect.bisect_left(entries, (high,))
+        )
+        window = entries[start:end]
+        if not ScanIndexForward:
+            window.reverse()
+
+        if ExclusiveStartKey is not None:
+            last = self._key(ExclusiveStartKey)
+            positions = [i for i, (_, key) in enumerate(window) if key == last]
+            window = window[positions[0] + 1:] if positions else window
+
+        return self._page(window, FilterExpression, ProjectionExpression, Limit, index)
+
+    def scan(self, FilterExpression=None, ProjectionExpression=None, Limit=None,
+             ExclusiveStartKey=None, **kwargs):
+        self._record('scan')
+        with self._lock:
+            keys = list(self.items.keys())
+        window = [(None, key) for key in keys]
+        if ExclusiveStartKey is not None:
+            last = self._key(ExclusiveStartKey)
+            window = window[keys.index(last) + 1:] if last in self.items else window
+        return self._page(window, FilterExpression, ProjectionExpression, Limit, self.primary)
+
+    def _page(self, window: list, filter_expression, projection, limit, index) -> dict:
+        page_limit = min(limit or self.page_size, self.page_size)
+        page = window[:page_limit]
+        result = []
+        for _, key in page:
+            item = self.items.get(key)
+            if item is None:
+                continue
+            if filter_expression is not None and not _matches(filter_expression, item):
+                continue
+            result.append(self._project(item, projection))
+
+        response = {'Items': result, 'Count': len(result), 'ScannedCount': len(page)}
+        if len(window) > page_limit and page:
+            last_key = page[-1][1]
+            last_evaluated = self._key_dict(last_key)
+            stored = self.items.get(last_key, {})
+            for name in (index.hash_key, index.range_key):
+                if name and name in stored:
+                    last_evaluated[name] = stored[name]
+            response['LastEvaluatedKey'] = last_evaluated
+        return response
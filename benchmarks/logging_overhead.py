@@ -0,0 +1,153 @@
+# logging_overhead.py
+# 대시보드 요청 하나가 로깅에 쓰는 시간(요청을 처리하는 스레드 기준)을 비교합니다.
+#
+# - before: 기존 방식 - 핸들러(파일 + 표준출력)가 호출한 스레드에서 바로 쓰고,
+#           위젯 결과/이벤트 리스트를 f-string 으로 통째로 포맷, 요일별 집계는 일정마다 print
+# - after : app.core.logging_config - QueueHandler 로 큐에 넣기만 하고 출력은 QueueListener 스레드,
+#           큰 데이터는 log_payload (길이 제한 + 샘플링), 메시지는 %s 지연 포맷
+# 두 경우 모두 같은 파일과 /dev/null(표준출력 대신)에 씁니다.
+# --level WARNING 으로 실행하면 INFO 로그가 꺼져 있을 때의 비용(f-string 을 미리 포맷하는 비용)을 비교합니다.
+#
+# 실행: python -m benchmarks.logging_overhead --requests 2000 --events 300
+import argparse
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.logging_config import AsyncQueueHandler, JsonFormatter, log_payload
+
+OLD_FORMAT = '[캘린더 API] %(asctime)s - %(levelname)s - %(message)s'
+
+
+def make_payloads(events: int) -> dict:
+    now = datetime.now(timezone.utc)
+    schedule = [
+        {
+            'id': f"event{index}",
+            'summary': f"일정 {index}",
+            'start': {'dateTime': (now + timedelta(hours=index)).isoformat()},
+            'end': {'dateTime': (now + timedelta(hours=index + 1)).isoformat()},
+            'calendar_id': f"calendar{index % 8}@group.calendar.google.com",
+        }
+        for index in range(events)
+    ]
+    return {
+        'upcoming': schedule[:5],
+        'schedule': schedule,
+        'weekly': {'this_week': [{'day': day, 'startTime': 9.0, 'endTime': 18.5} for day in range(7)], 'last_week': []},
+        'categories': [{'category': f"calendar{index}", 'entry_number': index * 3, 'summary': f"분류 {index}"} for index in range(6)],
+        'calendars': {'user_id': 'user@example.com', 'calendar': [{'id': f"calendar{index}", 'summary': f"캘린더 {index}"} for index in range(8)]},
+    }
+
+
+def request_before(logger: logging.Logger, payloads: dict, out):
+    # 기존 핸들러 코드의 로그 호출 (대시보드 위젯 6개 + 캘린더 리스트 변환 + 요일별 집계 print)
+    logger.info(f"사용자 {'user@example.com'}의 대시보드 데이터 요청: {list(payloads)}")
+    logger.info(f"캘린더별 활동 시간 확인 완료:{payloads['categories']}")
+    logger.info(f"곧 다가오는 스케줄: {payloads['upcoming']}")
+    logger.info(f"카테고리 분포 데이터: {json.dumps(payloads['categories'], ensure_ascii=False)}")
+    logger.info(f"전처리된 주간 활동 데이터: {payloads['weekly']}")
+    logger.info(f"[필터링 된 데이터 샘플]\n{payloads['schedule'][:2]}")
+    logger.info(f"Transformed data for DynamoDB: {payloads['calendars']}")
+    counts = [0] * 7
+    for index, _ in enumerate(payloads['schedule'][:100]):
+        counts[index % 7] += 1
+        print(f"요일별 데이터:{counts}", file=out)
+
+
+def request_after(logger: logging.Logger, payloads: dict, out):
+    logger.info("사용자 %s의 대시보드 데이터 요청: %s", 'user@example.com', list(payloads))
+    log_payload(logger, "캘린더별 활동 시간 확인 완료", payloads['categories'])
+    log_payload(logger, "곧 다가오는 스케줄", payloads['upcoming'])
+    log_payload(logger, "카테고리 분포 데이터", payloads['categories'])
+    log_payload(logger, "전처리된 주간 활동 데이터", payloads['weekly'])
+    log_payload(logger, "[필터링 된 데이터 샘플]", payloads['schedule'][:2])
+    log_payload(logger, "Transformed data for DynamoDB", payloads['calendars'])
+    counts = [0] * 7
+    for index, _ in enumerate(payloads['schedule'][:100]):
+        counts[index % 7] += 1
+        logger.debug("요일별 데이터:%s", counts)
+
+
+def make_sinks(directory: str, mode: str, formatter: logging.Formatter) -> list:
+    sinks = [
+        logging.FileHandler(os.path.join(directory, f"{mode}.log"), encoding='utf-8'),
+        logging.StreamHandler(open(os.devnull, 'w')),
+    ]
+    for sink in sinks:
+        sink.setFormatter(formatter)
+    return sinks
+
+
+def run(mode: str, requests: int, payloads: dict, level: int, directory: str) -> dict:
+    logger = logging.getLogger(f"benchmarks.logging_overhead.{mode}")
+    logger.propagate = False
+    logger.setLevel(level)
+    out = open(os.devnull, 'w')
+    listener = None
+
+    if mode == 'before':
+        sinks = make_sinks(directory, mode, logging.Formatter(OLD_FORMAT))
+        for sink in sinks:
+            logger.addHandler(sink)
+        handle = request_before
+    else:
+        sinks = make_sinks(directory, mode, JsonFormatter())
+        log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        logger.addHandler(AsyncQueueHandler(log_queue, settings.LOG_MAX_MESSAGE_CHARS))
+        listener = logging.handlers.QueueListener(log_queue, *sinks)
+        listener.start()
+        handle = request_after
+
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        handle(logger, payloads, out)
+        timings.append(time.perf_counter() - started)
+
+    drain_started = time.perf_counter()
+    if listener is not None:
+        listener.stop()
+    drain_ms = (time.perf_counter() - drain_started) * 1000
+    for handler in list(logger.handlers) + sinks:
+        logger.removeHandler(handler)
+        handler.close()
+    out.close()
+
+    ordered = sorted(timings)
+    return {
+        'mode': mode,
+        'level': logging.getLevelName(level),
+        'mean_us': round(statistics.mean(ordered) * 1e6, 1),
+        'p99_us': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6, 1),
+        'listener_drain_ms': round(drain_ms, 1),
+        'log_bytes': os.path.getsize(os.path.join(directory, f"{mode}.log")),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--events', type=int, default=300, help="월간 일정 수 (요일별 집계 print 는 앞 100개)")
+    parser.add_argument('--level', default='INFO')
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.events)
+    level = logging.getLevelName(args.level)
+    with tempfile.TemporaryDirectory() as directory:
+        before = run('before', args.requests, payloads, level, directory)
+        after = run('after', args.requests, payloads, level, directory)
+    print(before)
+    print(after)
+    print({'speedup': round(before['mean_us'] / after['mean_us'], 1)})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# sync_fanout.py
+# 캘린더별 이벤트 조회 동시 실행 벤치마크
+#
+# 지연이 서로 다른 캘린더 여러 개를 가진 가짜 구글 서버(fake_google)를 띄우고
+# store_calendar_events 전체 동기화 시간을 사용자별 동시 조회 수에 따라 측정합니다.
+# - concurrency=1 : 기존과 같은 순차 조회 (캘린더 지연의 합)
+# - concurrency=N : 동시 조회 (가장 느린 캘린더 지연에 가까워야 함)
+#
+# 실행: python -m benchmarks.sync_fanout --calendars 8 --concurrency 1 4 8
+import argparse
+import asyncio
+import logging
+import time
+
+from app.api.v1.endpoints import login  # noqa: F401 (login <-> dynamo 순환 import 순서 보장)
+from app.core.config import settings
+from app.db import dynamo, dynamo_client
+from app.db.event_items import (
+    CALENDAR_LIST_TABLE,
+    CREATOR_INDEX,
+    EVENT_ITEMS_TABLE,
+    EVENT_KEY_INDEX,
+    SYNC_STATE_TABLE,
+)
+from benchmarks.fake_google import FakeGoogleCalendar, make_events
+from benchmarks.local_dynamo import LocalTable
+
+USER = "bench@example.com"
+
+
+def install_tables(calendar_ids: list):
+    dynamo_client._tables[EVENT_ITEMS_TABLE] = LocalTable(
+        'user_id', 'start_key',
+        indexes={CREATOR_INDEX: ('creator_email', 'start_key'), EVENT_KEY_INDEX: ('event_key', None)}
+    )
+    dynamo_client._tables[SYNC_STATE_TABLE] = LocalTable('user_id', 'calendar_id')
+    calendar_list = LocalTable('user_id')
+    calendar_list.put_item(Item={'user_id': USER, 'calendar': [{'id': calendar_id} for calendar_id in calendar_ids]})
+    dynamo_client._tables[CALENDAR_LIST_TABLE] = calendar_list
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calendars', type=int, default=8)
+    parser.add_argument('--events', type=int, default=50, help="캘린더당 이벤트 수")
+    parser.add_argument('--min-latency', type=float, default=0.05)
+    parser.add_argument('--max-latency', type=float, default=0.4)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    calendar_ids = [f"calendar{index}@example.com" for index in range(args.calendars)]
+    step = (args.max_latency - args.min_latency) / max(1, args.calendars - 1)
+    latency = {calendar_id: args.min_latency + step * index for index, calendar_id in enumerate(calendar_ids)}
+    calendars = {calendar_id: make_events(calendar_id, args.events) for calendar_id in calendar_ids}
+
+    with FakeGoogleCalendar(calendars, latency=latency) as google:
+        settings.GOOGLE_CALENDAR_API_BASE = google.base_url
+        for concurrency in args.concurrency:
+            settings.GOOGLE_FETCH_CONCURRENCY_PER_USER = concurrency
+            install_tables(calendar_ids)
+            google.max_in_flight = 0
+
+            started = time.perf_counter()
+            stats = asyncio.run(dynamo.store_calendar_events(USER, "fake-token", full_sync=True))
+            elapsed = time.perf_counter() - started
+
+            print({
+                'concurrency': concurrency,
+                'calendars': stats['calendars'],
+                'upserted': stats['upserted'],
+                'sync_ms': round(elapsed * 1000, 1),
+                'sum_latency_ms': round(sum(latency.values()) * 1000, 1),
+                'max_latency_ms': round(max(latency.values()) * 1000, 1),
+                'max_in_flight': google.max_in_flight,
+            })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+# synthetic_calendar.py
+# 벤치마크용 합성 Google Calendar 데이터 생성기
+#
+# events.list 응답(singleEvents 없이 조회 - 앱과 같은 방식)에 나오는 모양 그대로 이벤트를 만듭니다.
+# - 캘린더 수, 캘린더당 이벤트 수, 기간(오늘을 가운데로 span_days 일)
+# - 종일 일정 비율: start/end 가 date 인 1~3일짜리 일정
+# - 반복 일정 비율: RRULE 이 붙은 원본 일정, 그 중 일부는 시간이 바뀐 예외 인스턴스(recurringEventId)를 함께 생성
+#   (구글은 singleEvents=false 이면 반복을 펼치지 않으므로 인스턴스를 따로 만들지 않음)
+# - 첫 캘린더는 사용자 기본 캘린더(ID = 사용자 이메일), 나머지는 공유 캘린더이며 일부 일정은 다른 사람이 만든 일정
+# 같은 seed 면 같은 데이터를 만듭니다.
+#
+# 사용 예시:
+#   calendars = generate_calendars("bench@example.com", calendars=8, events_per_calendar=1000)
+#   with FakeGoogleCalendar(calendars) as google: ...
+import random
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+# 일정 제목 후보 (카테고리 분포 위젯이 다양하게 나오도록)
+SUMMARIES = ["회의", "스터디", "운동", "점심 약속", "수업", "과제", "면접", "병원", "여행", "독서", "프로젝트", "동아리"]
+# 반복 규칙 후보 (RRULE, 반복 횟수)
+RECURRENCE_RULES = ["RRULE:FREQ=WEEKLY;COUNT={count}", "RRULE:FREQ=DAILY;COUNT={count}", "RRULE:FREQ=WEEKLY;BYDAY=MO,WE,FR;COUNT={count}"]
+# 반복 일정 중 시간이 바뀐 예외 인스턴스를 함께 만드는 비율
+EXCEPTION_SHARE = 0.3
+
+
+def calendar_ids(user_email: str, calendars: int) -> list:
+    return [user_email] + [f"shared{index}@group.calendar.google.com" for index in range(1, calendars)]
+
+
+def calendar_list(user_email: str, calendars: int) -> dict:
+    """
+    calendarList.list 응답 모양의 캘린더 목록을 만듭니다.
+    """
+    return {
+        'items': [
+            {'id': calendar_id, 'summary': user_email if index == 0 else f"공유 캘린더 {index}", 'description': ''}
+            for index, calendar_id in enumerate(calendar_ids(user_email, calendars))
+        ]
+    }
+
+
+def _timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _event(rng: random.Random, event_id: str, creator: str, start: datetime, all_day: bool, created: datetime) -> dict:
+    summary = rng.choice(SUMMARIES)
+    if all_day:
+        start_date = start.date()
+        end_date = start_date + timedelta(days=rng.randint(1, 3))
+        times = {'start': {'date': start_date.isoformat()}, 'end': {'date': end_date.isoformat()}}
+    else:
+        end = start + timedelta(minutes=30 * rng.randint(1, 6))
+        times = {
+            'start': {'dateTime': start.isoformat(), 'timeZone': 'Asia/Seoul'},
+            'end': {'dateTime': end.isoformat(), 'timeZone': 'Asia/Seoul'},
+        }
+    return {
+        'kind': 'calendar#event',
+        'etag': f"\"{rng.getrandbits(48)}\"",
+        'id': event_id,
+        'status': 'confirmed',
+        'summary': f"{summary} {event_id[-4:]}",
+        'created': _timestamp(created),
+        'updated': _timestamp(created),
+        'creator': {'email': creator},
+        'organizer': {'email': creator},
+        **times,
+        'sequence': 0,
+        'eventType': 'default',
+    }
+
+
+def generate_events(calendar_id: str, count: int, user_email: str, rng: random.Random,
+                    recurring_share: float = 0.1, all_day_share: float = 0.1, span_days: int = 365,
+                    own_share: float = 0.7, now: datetime = None) -> list:
+    """
+    캘린더 하나의 이벤트 count개를 만듭니다 (반복 일정의 예외 인스턴스 포함).
+
+    Args:
+        calendar_id (str): 캘린더 ID (이벤트 ID 접두사로도 사용)
+        count (int): 만들 이벤트 수
+        user_email (str): 사용자 이메일 (기본 캘린더가 아니면 own_share 비율만 사용자가 만든 일정)
+        rng (random.Random): 난수 생성기
+        recurring_share (float): 반복 일정 비율
+        all_day_share (float): 종일 일정 비율
+        span_days (int): 일정이 퍼져 있는 기간 (오늘을 가운데로)
+        own_share (float): 공유 캘린더에서 사용자가 만든 일정 비율
+        now (datetime, optional): 기준 시각
+
+    Returns:
+        list: events.list 의 items 와 같은 모양의 이벤트 리스트
+    """
+    now = (now or datetime.now(KST)).astimezone(KST).replace(minute=0, second=0, microsecond=0)
+    window_start = now - timedelta(days=span_days / 2)
+    prefix = ''.join(char for char in calendar_id.split('@')[0].lower() if char.isalnum())
+    events = []
+    index = 0
+    while len(events) < count:
+        # 7시~22시 사이 30분 단위 시작
+        day = window_start + timedelta(days=rng.randrange(max(1, span_days)))
+        start = day.replace(hour=rng.randint(7, 21), minute=rng.choice((0, 30)))
+        creator = user_email if calendar_id == user_email or rng.random() < own_share else f"colleague{rng.randrange(20)}@example.com"
+        created = start - timedelta(days=rng.randint(1, 60))
+        event_id = f"{prefix}{index:07d}"
+        index += 1
+
+        event = _event(rng, event_id, creator, start, rng.random() < all_day_share, created)
+        if rng.random() >= recurring_share:
+            events.append(event)
+            continue
+
+        event['recurrence'] = [rng.choice(RECURRENCE_RULES).format(count=rng.randint(4, 20))]
+        events.append(event)
+        if len(events) < count and rng.random() < EXCEPTION_SHARE and 'dateTime' in event['start']:
+            # 다음 주 인스턴스 하나를 한 시간 미룬 예외
+            original = datetime.fromisoformat(event['start']['dateTime']) + timedelta(days=7)
+            moved = _event(rng, f"{event_id}_{_timestamp(original).replace('-', '').replace(':', '')[:15]}Z",
+                           creator, original + timedelta(hours=1), False, created)
+            moved['recurringEventId'] = event_id
+            moved['originalStartTime'] = {'dateTime': original.isoformat(), 'timeZone': 'Asia/Seoul'}
+            events.append(moved)
+    return events
+
+
+def generate_calendars(user_email: str, calendars: int = 8, events_per_calendar: int = 100,
+                       recurring_share: float = 0.1, all_day_share: float = 0.1, span_days: int = 365,
+                       seed: int = 0, now: datetime = None, total_events: int = None) -> dict:
+    """
+    사용자 캘린더 여러 개의 이벤트를 만듭니다.
+
+    Args:
+        total_events (int, optional): 전체 이벤트 수 (주면 events_per_calendar 대신 캘린더에 고르게 나눔)
+
+    Returns:
+        dict: {캘린더 ID: 이벤트 리스트} (FakeGoogleCalendar 인자와 같은 모양)
+    """
+    rng = random.Random(seed)
+    ids = calendar_ids(user_email, calendars)
+    if total_events is None:
+        counts = [events_per_calendar] * len(ids)
+    else:
+        counts = [total_events // len(ids) + (1 if index < total_events % len(ids) else 0) for index in range(len(ids))]
+    return {
+        calendar_id: generate_events(
+            calendar_id, count, user_email, rng,
+            recurring_share=recurring_share, all_day_share=all_day_share, span_days=span_days, now=now
+        )
+        for calendar_id, count in zip(ids, counts)
+    }
@@ -0,0 +1,94 @@
+# weekly_activity_scaling.py
+# 사용자 수가 늘어나도 /weekly-activity (갓생지수 포함) 지연시간이 일정한지 확인하는 회귀 벤치마크
+#
+# 인메모리 DynamoDB 대용품(local_dynamo.LocalTable)에 사용자를 채운 뒤
+# - after : /weekly-activity 원본 계산 경로 (creator-start-index GSI 범위 조회)
+#           (엔드포인트 자체는 동기화 때 저장한 집계를 읽으므로 집계가 없을 때의 경로를 측정)
+# - scan  : 기존 방식과 같은 테이블 전체 스캔
+# 두 경로의 평균 지연시간을 사용자 수별로 출력합니다.
+#
+# 실행: python -m benchmarks.weekly_activity_scaling --users 100 1000 10000
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+from app.api.v1.endpoints import login  # noqa: F401 (login <-> dynamo 순환 import 순서 보장)
+from app.db import dynamo, dynamo_client
+from app.db.widgets import summarize_weekly_activity
+from app.db.event_items import CREATOR_INDEX, EVENT_ITEMS_TABLE, create_event_item
+from app.models.user import User
+from benchmarks.local_dynamo import LocalTable
+
+
+def seed(table: LocalTable, users: int, events_per_user: int):
+    week_start = datetime.now(pytz.UTC) - timedelta(days=datetime.now(pytz.UTC).weekday())
+    for u in range(users):
+        email = f"user{u}@example.com"
+        for e in range(events_per_user):
+            start = (week_start + timedelta(days=e % 6, hours=9 + e % 8)).replace(microsecond=0)
+            event = {
+                'id': f"evt{u}-{e}",
+                'summary': f"일정 {e}",
+                'start': {'dateTime': start.isoformat()},
+                'end': {'dateTime': (start + timedelta(hours=1)).isoformat()},
+                'creator': {'email': email},
+                'organizer': {'email': email},
+            }
+            table.put_item(Item=create_event_item(email, email, event))
+
+
+async def weekly_activity(user: User, now: datetime) -> dict:
+    # 메모리 캐시를 거치지 않는 원본 계산 경로 (creator-start-index 범위 조회 + 요일별 집계)
+    raw_data = await dynamo.get_weekly_activity_data(user.email, now)
+    return summarize_weekly_activity(raw_data['events'], user.email)
+
+
+async def time_endpoint(user: User, repeat: int) -> float:
+    now = datetime.now(pytz.UTC)
+    # 스레드 풀 생성 등 첫 호출 비용 제외
+    await weekly_activity(user, now)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await weekly_activity(user, now)
+    return (time.perf_counter() - started) / repeat
+
+
+def time_scan(table: LocalTable, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        kwargs = {}
+        while True:
+            response = table.scan(**kwargs)
+            if 'LastEvaluatedKey' not in response:
+                break
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--events-per-user', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    user = User(email="user0@example.com")
+
+    for users in args.users:
+        table = LocalTable('user_id', 'start_key', indexes={CREATOR_INDEX: ('creator_email', 'start_key')})
+        dynamo_client._tables[EVENT_ITEMS_TABLE] = table
+        seed(table, users, args.events_per_user)
+
+        endpoint_ms = asyncio.run(time_endpoint(user, args.repeat)) * 1000
+        scan_ms = time_scan(table, max(1, args.repeat // 10)) * 1000
+        print({'users': users, 'items': len(table.items),
+               'weekly_activity_ms': round(endpoint_ms, 2), 'full_scan_ms': round(scan_ms, 2)})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# conftest.py
+# app.core.config.Settings 의 필수 값 (테스트는 외부 서비스에 연결하지 않음)
+# DynamoDB 테이블은 dynamo_tables 픽스처의 메모리 테이블(FakeTable)로 바꿔 끼웁니다.
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+for name in ("SECRET_KEY", "DB_PWD", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+    os.environ.setdefault(name, "test")
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _matches(condition, item: dict) -> bool:
+    # boto3 Key/Attr 조건을 아이템 하나에 대해 평가 (테스트에서 쓰는 연산자만)
+    expression = condition.get_expression()
+    operator, values = expression['operator'], expression['values']
+    if operator == 'AND':
+        return all(_matches(value, item) for value in values)
+    if operator == 'OR':
+        return any(_matches(value, item) for value in values)
+    name = values[0].name
+    if name not in item:
+        return False
+    value = item[name]
+    if operator == '=':
+        return value == values[1]
+    if operator == '>=':
+        return value >= values[1]
+    if operator == '<=':
+        return value <= values[1]
+    if operator == 'BETWEEN':
+        return values[1] <= value <= values[2]
+    if operator == 'IN':
+        return value in values[1]
+    raise NotImplementedError(operator)
+
+
+class FakeBatchWriter:
+    def __init__(self, table):
+        self.table = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def put_item(self, Item):
+        self.table.put_item(Item=Item)
+
+    def delete_item(self, Key):
+        self.table.delete_item(Key=Key)
+
+
+class FakeTable:
+    """
+    query / scan / get_item / put_item / batch_writer 만 흉내 내는 DynamoDB 메모리 테이블.
+    숫자는 실제 테이블처럼 Decimal 로 돌려주고, 페이지 크기를 작게 두어 LastEvaluatedKey 경로를 탑니다.
+    """
+
+    def __init__(self, hash_key: str, range_key: str = None, indexes: dict = None, page_size: int = 3):
+        self.key_names = (hash_key, range_key)
+        self.indexes = indexes or {}
+        self.page_size = page_size
+        self.items = {}
+        self.queries = 0
+
+    def _key(self, item: dict) -> tuple:
+        return tuple(item[name] for name in self.key_names if name)
+
+    def get_item(self, Key):
+        item = self.items.get(self._key(Key))
+        return {'Item': copy.deepcopy(item)} if item is not None else {}
+
+    def put_item(self, Item, ConditionExpression=None):
+        key = self._key(Item)
+        if ConditionExpression is not None and key in self.items:
+            raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'exists'}}, 'PutItem')
+        self.items[key] = _deserializer.deserialize(_serializer.serialize(Item))
+
+    def delete_item(self, Key):
+        self.items.pop(self._key(Key), None)
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        return FakeBatchWriter(self)
+
+    def _page(self, rows: list, sort_key: str, FilterExpression=None, Limit=None,
+              ExclusiveStartKey=None, ProjectionExpression=None) -> dict:
+        rows.sort(key=lambda item: item.get(sort_key, '') if sort_key else '')
+        offset = ExclusiveStartKey['offset'] if ExclusiveStartKey else 0
+        size = Limit or self.page_size
+        page = rows[offset:offset + size]
+        if FilterExpression is not None:
+            page = [item for item in page if _matches(FilterExpression, item)]
+        if ProjectionExpression:
+            names = [name.strip() for name in ProjectionExpression.split(',')]
+            page = [{name: item[name] for name in names if name in item} for item in page]
+        response = {'Items': copy.deepcopy(page)}
+        if offset + size < len(rows):
+            response['LastEvaluatedKey'] = {'offset': offset + size}
+        return response
+
+    def query(self, KeyConditionExpression, IndexName=None, **kwargs):
+        self.queries += 1
+        _, sort_key = self.indexes[IndexName] if IndexName else self.key_names
+        rows = [item for item in self.items.values() if _matches(KeyConditionExpression, item)]
+        return self._page(rows, sort_key, **kwargs)
+
+    def scan(self, **kwargs):
+        return self._page(list(self.items.values()), None, **kwargs)
+
+
+@pytest.fixture
+def dynamo_tables(monkeypatch):
+    """
+    app.db.dynamo_client 가 돌려주는 테이블을 메모리 테이블로 바꾸고, 이벤트 메모리 캐시를 비웁니다.
+
+    Returns:
+        dict: {테이블 이름: FakeTable}
+    """
+    # app.db.dynamo 는 login 을 먼저 불러와야 순환 import 가 풀림
+    import app.api.v1.endpoints.login  # noqa: F401
+    from app.db import dynamo_client, event_items
+    from app.db.event_cache import event_cache
+
+    tables = {
+        event_items.EVENT_ITEMS_TABLE: FakeTable('user_id', 'start_key', {
+            event_items.CREATOR_INDEX: ('creator_email', 'start_key'),
+            event_items.EVENT_KEY_INDEX: ('event_key', None),
+        }),
+        event_items.CALENDAR_LIST_TABLE: FakeTable('user_id'),
+        event_items.SYNC_STATE_TABLE: FakeTable('user_id', 'calendar_id'),
+        event_items.ROLLUP_TABLE: FakeTable('user_id', 'rollup_key'),
+        event_items.WATCH_CHANNEL_TABLE: FakeTable('user_id', 'calendar_id'),
+    }
+    executor = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(dynamo_client, '_tables', tables)
+    monkeypatch.setattr(dynamo_client, '_executor', executor)
+    event_cache.clear()
+    yield tables
+    event_cache.clear()
+    executor.shutdown(wait=True)
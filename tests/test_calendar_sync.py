@@ -0,0 +1,285 @@
+# test_calendar_sync.py
+# 이벤트 단위 저장과 syncToken 증분 동기화 (app.db.event_items, app.db.dynamo)
+# 구글 이벤트 페이지는 iter_event_pages 를 바꿔 끼운 가짜 페이지로 흉내 냅니다.
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from app.db.event_items import (
+    CALENDAR_LIST_TABLE,
+    EVENT_ITEMS_TABLE,
+    SYNC_STATE_TABLE,
+    create_event_item,
+    epoch_day,
+    event_time_fields,
+)
+
+USER = 'a@x.com'
+
+
+def timed_event(event_id: str, start: str, end: str, **extra) -> dict:
+    return {'id': event_id, 'start': {'dateTime': start}, 'end': {'dateTime': end}, 'creator': {'email': USER}, **extra}
+
+
+def cancelled(event_id: str) -> dict:
+    return {'id': event_id, 'status': 'cancelled'}
+
+
+class GooglePages:
+    """
+    캘린더별 구글 응답. full[캘린더] 는 전체 조회, changes[(캘린더, syncToken)] 은 증분 조회 결과 (페이지 리스트)
+    expired 에 있는 syncToken 은 HTTP 410, revoked 에 있는 액세스 토큰은 HTTP 401 로 응답합니다.
+    """
+
+    def __init__(self):
+        self.full = {}
+        self.changes = {}
+        self.expired = set()
+        self.revoked = set()
+        self.requests = []
+
+    def __call__(self, client, access_token: str, calendar_id: str, sync_token: str = None):
+        from app.api.v1.endpoints.google import SyncTokenExpiredError, raise_for_status
+
+        self.requests.append((calendar_id, sync_token))
+        pages = self.full[calendar_id] if sync_token is None else self.changes.get((calendar_id, sync_token), [[]])
+
+        async def iterate():
+            if access_token in self.revoked:
+                raise_for_status(httpx.Response(401, request=httpx.Request('GET', 'https://www.googleapis.com/calendar/v3')))
+            if sync_token in self.expired:
+                raise SyncTokenExpiredError(calendar_id)
+            for index, events in enumerate(pages):
+                last = index == len(pages) - 1
+                yield {
+                    'calendar_id': calendar_id,
+                    'events': events,
+                    'next_sync_token': f"{calendar_id}-token-{len(self.requests)}" if last else None,
+                    'full_sync': sync_token is None,
+                }
+
+        return iterate()
+
+
+@pytest.fixture
+def sync(dynamo_tables, monkeypatch):
+    from app.db import dynamo
+
+    google = GooglePages()
+    monkeypatch.setattr(dynamo, 'iter_event_pages', google)
+    return dynamo, dynamo_tables, google
+
+
+def set_calendars(tables: dict, *calendar_ids):
+    tables[CALENDAR_LIST_TABLE].put_item(Item={
+        'user_id': USER,
+        'calendar': [{'id': calendar_id, 'summary': calendar_id, 'description': ''} for calendar_id in calendar_ids]
+    })
+
+
+def stored_events(tables: dict) -> dict:
+    """{(캘린더 ID, 이벤트 ID): [start_key, ...]}"""
+    events = {}
+    for item in tables[EVENT_ITEMS_TABLE].items.values():
+        events.setdefault((item['calendar_id'], item['event_id']), []).append(item['start_key'])
+    return events
+
+
+def sync_tokens(tables: dict) -> dict:
+    return {key[1]: item['sync_token'] for key, item in tables[SYNC_STATE_TABLE].items.items()}
+
+
+def test_event_item_layout():
+    event = timed_event('abc', '2025-01-06T09:30:00+09:00', '2025-01-06T10:00:00+09:00')
+    item = create_event_item(USER, 'primary', event)
+
+    assert item['start_key'] == '2025-01-06T00:30:00Z#primary#abc'
+    assert item['event_key'] == f'{USER}#primary#abc'
+    assert item['creator_email'] == USER
+    assert item['event'] is event
+    assert item['start_ts'] == 1736123400 and item['end_ts'] == 1736125200
+    # 날짜는 적힌 오프셋 기준
+    assert item['start_day'] == item['end_day'] == epoch_day(date(2025, 1, 6))
+    assert item['all_day'] is False
+
+
+def test_all_day_event_fields():
+    fields = event_time_fields({'start': {'date': '2025-01-06'}, 'end': {'date': '2025-01-07'}})
+
+    # 종일 일정의 시각은 KST 자정
+    assert fields['all_day'] is True
+    assert fields['start_ts'] == 1736089200
+    assert fields['end_day'] - fields['start_day'] == 1
+    assert create_event_item(USER, 'primary', {'id': 'x', 'start': {'date': '2025-01-06'}})['start_key'].startswith('2025-01-05T15:00:00Z#')
+    assert create_event_item(USER, 'primary', {'start': {'date': '2025-01-06'}}) is None
+
+
+def test_full_sync_stores_pages_and_sync_token(sync):
+    dynamo, tables, google = sync
+    set_calendars(tables, 'primary')
+    google.full['primary'] = [
+        [timed_event('e1', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z'), timed_event('e2', '2025-01-07T09:00:00Z', '2025-01-07T10:00:00Z')],
+        [timed_event('e3', '2025-01-08T09:00:00Z', '2025-01-08T10:00:00Z'), {'summary': 'ID 없음'}],
+    ]
+    progress = {'calendars_total': 0, 'calendars_done': 0, 'events_written': 0, 'events_deleted': 0}
+
+    stats = asyncio.run(dynamo.store_calendar_events(USER, 'access-token', progress=progress))
+
+    assert stats['calendars'] == 1 and stats['upserted'] == 3
+    assert stats['full_sync_calendars'] == ['primary']
+    assert sorted(event_id for _, event_id in stored_events(tables)) == ['e1', 'e2', 'e3']
+    assert sync_tokens(tables) == {'primary': 'primary-token-1'}
+    assert progress['calendars_done'] == 1 and progress['events_written'] == 3
+    # 저장된 숫자 필드는 DynamoDB 처럼 Decimal
+    assert isinstance(next(iter(tables[EVENT_ITEMS_TABLE].items.values()))['start_ts'], Decimal)
+
+
+def test_incremental_sync_moves_and_deletes_events(sync):
+    dynamo, tables, google = sync
+    set_calendars(tables, 'primary')
+    google.full['primary'] = [[
+        timed_event('keep', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z'),
+        timed_event('move', '2025-01-07T09:00:00Z', '2025-01-07T10:00:00Z'),
+        timed_event('drop', '2025-01-08T09:00:00Z', '2025-01-08T10:00:00Z'),
+    ]]
+    asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+    google.changes[('primary', 'primary-token-1')] = [
+        [timed_event('move', '2025-01-09T09:00:00Z', '2025-01-09T10:00:00Z')],
+        [cancelled('drop'), timed_event('new', '2025-01-10T09:00:00Z', '2025-01-10T10:00:00Z')],
+    ]
+
+    stats = asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+
+    assert google.requests[-1] == ('primary', 'primary-token-1')
+    assert stats['full_sync_calendars'] == []
+    # 시작 시각이 바뀐 이벤트는 이전 키가 지워지고 새 키 하나만 남음
+    assert stored_events(tables) == {
+        ('primary', 'keep'): ['2025-01-06T09:00:00Z#primary#keep'],
+        ('primary', 'move'): ['2025-01-09T09:00:00Z#primary#move'],
+        ('primary', 'new'): ['2025-01-10T09:00:00Z#primary#new'],
+    }
+    assert stats['upserted'] == 2 and stats['deleted'] == 2
+    assert sync_tokens(tables) == {'primary': 'primary-token-2'}
+
+
+def test_expired_sync_token_falls_back_to_full_sync(sync):
+    dynamo, tables, google = sync
+    set_calendars(tables, 'primary')
+    google.full['primary'] = [[timed_event('old', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z')]]
+    asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+    google.expired.add('primary-token-1')
+    google.full['primary'] = [[timed_event('fresh', '2025-01-07T09:00:00Z', '2025-01-07T10:00:00Z')]]
+
+    stats = asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+
+    assert google.requests[-2:] == [('primary', 'primary-token-1'), ('primary', None)]
+    assert stats['full_sync_calendars'] == ['primary'] and stats['deleted'] == 1
+    assert list(stored_events(tables)) == [('primary', 'fresh')]
+    assert sync_tokens(tables) == {'primary': 'primary-token-3'}
+
+
+def test_removed_calendar_data_and_token_are_deleted(sync):
+    dynamo, tables, google = sync
+    set_calendars(tables, 'primary', 'team')
+    google.full['primary'] = [[timed_event('mine', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z')]]
+    google.full['team'] = [[timed_event('theirs', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z')]]
+    asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+    set_calendars(tables, 'primary')
+
+    stats = asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+
+    assert list(stored_events(tables)) == [('primary', 'mine')]
+    assert list(sync_tokens(tables)) == ['primary']
+    assert stats['deleted'] == 1
+
+
+def test_calendar_without_sync_token_is_resynced_without_duplicates(sync):
+    dynamo, tables, google = sync
+    set_calendars(tables, 'primary', 'team')
+    google.full['primary'] = [[timed_event('mine', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z')]]
+    google.full['team'] = [[
+        timed_event('moved', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z'),
+        timed_event('removed', '2025-01-07T09:00:00Z', '2025-01-07T10:00:00Z'),
+    ]]
+    asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+    # team 캘린더의 syncToken 만 없어진 상태 (첫 동기화가 중간에 실패한 경우 등)
+    tables[SYNC_STATE_TABLE].delete_item(Key={'user_id': USER, 'calendar_id': 'team'})
+    google.full['team'] = [[timed_event('moved', '2025-01-08T09:00:00Z', '2025-01-08T10:00:00Z')]]
+
+    stats = asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+
+    assert stats['full_sync_calendars'] == ['team']
+    assert stored_events(tables) == {
+        ('primary', 'mine'): ['2025-01-06T09:00:00Z#primary#mine'],
+        ('team', 'moved'): ['2025-01-08T09:00:00Z#team#moved'],
+    }
+
+
+def test_webhook_sync_only_touches_given_calendars(sync):
+    dynamo, tables, google = sync
+    set_calendars(tables, 'primary', 'team')
+    google.full['primary'] = [[timed_event('mine', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z')]]
+    google.full['team'] = [[timed_event('theirs', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z')]]
+    asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+    google.changes[('team', 'team-token-2')] = [[cancelled('theirs')]]
+    requests = len(google.requests)
+
+    stats = asyncio.run(dynamo.sync_calendar_events(USER, 'access-token', ['team', 'unknown']))
+
+    assert google.requests[requests:] == [('team', 'team-token-2')]
+    assert stats['unknown_calendars'] == ['unknown']
+    assert list(stored_events(tables)) == [('primary', 'mine')]
+
+
+def test_failed_calendar_keeps_sync_token(sync, monkeypatch):
+    dynamo, tables, google = sync
+    set_calendars(tables, 'primary', 'team')
+    google.full['primary'] = [[timed_event('mine', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z')]]
+    google.full['team'] = [[timed_event('theirs', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z')]]
+    asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+    tokens = sync_tokens(tables)
+
+    def failing_pages(client, access_token, calendar_id, sync_token=None):
+        async def iterate():
+            if calendar_id == 'team':
+                raise RuntimeError("구글 API 오류")
+            yield {'calendar_id': calendar_id, 'events': [], 'next_sync_token': 'primary-next', 'full_sync': False}
+        return iterate()
+
+    monkeypatch.setattr(dynamo, 'iter_event_pages', failing_pages)
+    stats = asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+
+    assert stats['failed_calendars'] == ['team'] and stats['calendars'] == 1
+    assert sync_tokens(tables) == {'primary': 'primary-next', 'team': tokens['team']}
+
+
+def test_rejected_access_token_is_dropped_and_sync_retried(sync, monkeypatch):
+    from app.api.v1.endpoints import calendar
+    from app.core.google_auth import access_token_cache
+    from app.core.sync_jobs import SyncJob
+
+    dynamo, tables, google = sync
+    set_calendars(tables, 'primary')
+    google.full['primary'] = [[timed_event('mine', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z')]]
+    # 만료 전에 취소된 토큰이 캐시에 남아 있는 상태
+    access_token_cache.put('refresh-token', {'access_token': 'revoked', 'expires_in': 3600})
+    google.revoked.add('revoked')
+    refreshed = []
+
+    async def request_google_token(refresh_token):
+        refreshed.append(refresh_token)
+        return {'access_token': 'fresh', 'expires_in': 3600}
+
+    monkeypatch.setattr(calendar, 'request_google_token', request_google_token)
+    job = SyncJob('events', USER, credentials={'refresh_token': 'refresh-token'})
+
+    stats = asyncio.run(calendar.run_events_sync_job(job))
+
+    assert refreshed == ['refresh-token']
+    assert stats['calendars'] == 1 and stats['failed_calendars'] == []
+    assert list(stored_events(tables)) == [('primary', 'mine')]
+    assert asyncio.run(access_token_cache.get('refresh-token', request_google_token)) == 'fresh'
+    assert job.progress['calendars_done'] == job.progress['calendars_total'] == 1
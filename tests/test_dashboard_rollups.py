@@ -0,0 +1,150 @@
+# test_dashboard_rollups.py
+# 대시보드 위젯 집계 (app.db.rollups, app.db.dynamo) - 저장/조회, 실패 시 이전 집계가 남지 않는지
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db.event_items import CALENDAR_LIST_TABLE, EVENT_ITEMS_TABLE, ROLLUP_TABLE, create_event_item
+
+USER = 'a@x.com'
+# 2025-01-08 (수) 12:00 KST
+NOW = datetime(2025, 1, 8, 3, 0, tzinfo=timezone.utc)
+CALENDARS = [
+    {'id': USER, 'summary': '업무', 'description': ''},
+    {'id': 'study', 'summary': '공부', 'description': ''},
+]
+
+
+def timed_event(event_id: str, start: str, end: str, organizer: str = USER) -> dict:
+    return {
+        'id': event_id,
+        'summary': event_id,
+        'start': {'dateTime': start},
+        'end': {'dateTime': end},
+        'creator': {'email': USER},
+        'organizer': {'email': organizer, 'displayName': organizer},
+    }
+
+
+def seed(tables: dict, events: dict):
+    # events: {캘린더 ID: [구글 이벤트]}
+    tables[CALENDAR_LIST_TABLE].put_item(Item={'user_id': USER, 'calendar': CALENDARS})
+    for calendar_id, calendar_events in events.items():
+        for event in calendar_events:
+            tables[EVENT_ITEMS_TABLE].put_item(Item=create_event_item(USER, calendar_id, event))
+
+
+def stored_rollups(tables: dict) -> dict:
+    return {key[1]: json.loads(item['data']) for key, item in tables[ROLLUP_TABLE].items.items() if key[0] == USER}
+
+
+@pytest.fixture
+def dashboard(dynamo_tables):
+    from app.db import dynamo
+
+    seed(dynamo_tables, {
+        USER: [
+            timed_event('standup', '2025-01-06T09:00:00+09:00', '2025-01-06T09:30:00+09:00'),
+            timed_event('review', '2025-01-08T14:00:00+09:00', '2025-01-08T16:00:00+09:00'),
+        ],
+        'study': [
+            timed_event('reading', '2025-01-07T20:00:00+09:00', '2025-01-07T21:00:00+09:00', organizer='study'),
+            timed_event('last-week', '2025-01-01T10:00:00+09:00', '2025-01-01T11:00:00+09:00', organizer='study'),
+        ],
+    })
+    return dynamo, dynamo_tables
+
+
+def test_refresh_stores_current_period_rollups(dashboard):
+    dynamo, tables = dashboard
+
+    keys = asyncio.run(dynamo.refresh_dashboard_rollups(USER, NOW))
+
+    assert sorted(keys) == sorted(dynamo.current_rollup_keys(NOW))
+    stored = stored_rollups(tables)
+    assert stored['spending_time#2025-W02'] == {'업무': 150.0, '공부': 60.0}
+    # 원본 경로와 같은 결과
+    computed = asyncio.run(dynamo.compute_dashboard_widgets(USER, dynamo.ROLLUP_WIDGETS, NOW))
+    for widget, payload in computed.items():
+        key = dynamo.rollups.rollup_key(widget, dynamo.DASHBOARD_WIDGETS[widget][0](NOW))
+        assert stored[key] == json.loads(dynamo.rollups.dump_payload(payload))
+
+
+def test_load_dashboard_reads_stored_rollup(dashboard):
+    from app.db.event_cache import event_cache
+
+    dynamo, tables = dashboard
+    asyncio.run(dynamo.refresh_dashboard_rollups(USER, NOW))
+    event_cache.clear()
+    # 저장된 집계를 그대로 돌려주는지 확인하기 위해 값을 바꿔 둠
+    tables[ROLLUP_TABLE].put_item(Item={'user_id': USER, 'rollup_key': 'spending_time#2025-W02', 'data': '{"업무":1}'})
+
+    result = asyncio.run(dynamo.load_dashboard(USER, ['spending_time', 'upcoming'], NOW))
+
+    assert result['spending_time'] == {'업무': 1}
+    assert [event['name'] for event in result['upcoming']] == ['review']
+
+
+def test_too_large_rollup_removes_previous_value(dashboard, monkeypatch):
+    dynamo, tables = dashboard
+    asyncio.run(dynamo.refresh_dashboard_rollups(USER, NOW))
+    assert 'spending_time#2025-W02' in stored_rollups(tables)
+
+    monkeypatch.setattr(dynamo.rollups, 'ROLLUP_MAX_BYTES', 10)
+    dynamo.event_cache.invalidate(USER)
+    asyncio.run(dynamo.refresh_dashboard_rollups(USER, NOW))
+    assert stored_rollups(tables) == {}
+
+    # 조회는 원본 경로로 계산하고, 너무 큰 집계를 다시 넣지 않음
+    dynamo.event_cache.clear()
+    result = asyncio.run(dynamo.load_dashboard(USER, ['spending_time'], NOW))
+    assert result['spending_time'] == {'업무': 150.0, '공부': 60.0}
+    assert stored_rollups(tables) == {}
+
+
+def test_failed_rollup_computation_discards_previous_rollups(dashboard, monkeypatch):
+    dynamo, tables = dashboard
+    asyncio.run(dynamo.refresh_dashboard_rollups(USER, NOW))
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("DynamoDB 조회 실패")
+
+    monkeypatch.setattr(dynamo, 'compute_dashboard_widgets', fail)
+    assert asyncio.run(dynamo.refresh_dashboard_rollups(USER, NOW)) == []
+    assert stored_rollups(tables) == {}
+
+
+def test_failed_sync_discards_current_period_rollups(dashboard, monkeypatch):
+    dynamo, tables = dashboard
+    now = datetime.now(timezone.utc)
+    asyncio.run(dynamo.refresh_dashboard_rollups(USER, now))
+    # 이전 기간 집계는 대시보드가 읽지 않으므로 그대로 둠
+    tables[ROLLUP_TABLE].put_item(Item={'user_id': USER, 'rollup_key': 'spending_time#2000-W01', 'data': '{}'})
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("삭제 실패")
+
+    monkeypatch.setattr(dynamo, 'delete_user_event_items', fail)
+    with pytest.raises(RuntimeError):
+        asyncio.run(dynamo.store_calendar_events(USER, 'access-token'))
+
+    assert list(stored_rollups(tables)) == ['spending_time#2000-W01']
+
+
+def test_rollup_computed_before_sync_is_not_stored(dashboard, monkeypatch):
+    dynamo, tables = dashboard
+    compute = dynamo.compute_dashboard_widgets
+
+    async def compute_during_sync(user_email, widgets, now, cached=None):
+        result = await compute(user_email, widgets, now, cached)
+        # 계산하는 동안 동기화가 끝난 경우
+        dynamo.event_cache.invalidate(user_email)
+        return result
+
+    monkeypatch.setattr(dynamo, 'compute_dashboard_widgets', compute_during_sync)
+    result = asyncio.run(dynamo.load_dashboard(USER, ['spending_time'], NOW))
+
+    assert result['spending_time'] == {'업무': 150.0, '공부': 60.0}
+    assert stored_rollups(tables) == {}
@@ -0,0 +1,69 @@
+# test_event_cache.py
+# 대시보드 이벤트 메모리 캐시 (app.db.event_cache) - 동기화 세대, 바이트 상한, 세대 번호 정리
+import sys
+
+from app.db.event_cache import CachedUser, EventCache
+
+
+def filled(cache: EventCache, user_email: str, payload_bytes: int = 0) -> CachedUser:
+    entry = cache.get(user_email)
+    entry.set_rollup('spending_time#2025-W02', 'x' * payload_bytes)
+    cache.store(user_email, entry)
+    return entry
+
+
+def test_store_and_get_same_generation():
+    cache = EventCache(max_bytes=1_000_000, ttl=60)
+    entry = filled(cache, 'a@x.com')
+
+    assert cache.get('a@x.com') is entry
+    assert cache.contains('a@x.com')
+    assert cache.stats()['hits'] == 1
+
+
+def test_invalidate_rejects_store_of_entry_read_before_sync():
+    cache = EventCache(max_bytes=1_000_000, ttl=60)
+    before = cache.generation('a@x.com')
+    entry = cache.get('a@x.com')
+
+    cache.invalidate('a@x.com')
+    cache.store('a@x.com', entry)
+
+    assert not cache.contains('a@x.com')
+    assert cache.generation('a@x.com') != before
+
+
+def test_evicted_users_do_not_keep_generation_entries():
+    entry_size = sys.getsizeof(CachedUser(0)) + 2000
+    cache = EventCache(max_bytes=entry_size * 3, ttl=60)
+    for index in range(50):
+        filled(cache, f'user{index}@x.com', 1000)
+        cache.invalidate(f'user{index}@x.com')
+        filled(cache, f'user{index}@x.com', 1000)
+
+    stats = cache.stats()
+    assert stats['evictions'] > 0
+    # 캐시에 남은 사용자만 세대 번호를 가짐
+    assert stats['generations'] == stats['entries'] < 10
+
+
+def test_generation_is_not_reused_after_entry_is_dropped():
+    cache = EventCache(max_bytes=1_000_000, ttl=60)
+    filled(cache, 'a@x.com')
+    seen = {cache.generation('a@x.com')}
+    for _ in range(3):
+        cache.clear()
+        filled(cache, 'a@x.com')
+        seen.add(cache.generation('a@x.com'))
+
+    # 세대로 만든 ETag 가 이전 데이터의 ETag 와 같아지지 않음
+    assert len(seen) == 4
+
+
+def test_too_large_entry_is_not_cached():
+    cache = EventCache(max_bytes=10_000, ttl=60)
+    filled(cache, 'a@x.com', 20_000)
+
+    assert not cache.contains('a@x.com')
+    assert cache.stats()['too_large'] == 1
+    assert cache.stats()['generations'] == 0
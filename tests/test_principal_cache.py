@@ -0,0 +1,123 @@
+# test_principal_cache.py
+# 인증 사용자 캐시 (app.core.principal_cache) - single-flight 조회, 사용자 단위 무효화, 토큰 만료
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.core.principal_cache import PrincipalCache
+
+
+def principal(email: str = 'a@x.com', exp: float = None) -> tuple:
+    claims = {'sub': email, 'exp': exp if exp is not None else time.time() + 3600}
+    return claims, SimpleNamespace(email=email)
+
+
+def test_concurrent_lookups_share_one_load():
+    calls = []
+
+    async def scenario():
+        cache = PrincipalCache(maxsize=10, ttl=60)
+
+        async def load(token):
+            calls.append(token)
+            await asyncio.sleep(0.01)
+            return principal()
+
+        results = await asyncio.gather(*(cache.get_or_load('token', load) for _ in range(5)))
+        again = await cache.get_or_load('token', load)
+        return cache, results, again
+
+    cache, results, again = asyncio.run(scenario())
+    assert calls == ['token']
+    assert all(result is results[0] for result in results)
+    assert again == results[0]
+    assert cache.stats() == {'cached': 1, 'hits': 1, 'misses': 5}
+
+
+def test_failed_authentication_is_not_cached():
+    async def scenario():
+        cache = PrincipalCache(maxsize=10, ttl=60)
+
+        async def load(token):
+            return None
+
+        return cache, await cache.get_or_load('token', load)
+
+    cache, result = asyncio.run(scenario())
+    assert result is None
+    assert cache.get('token') is None
+
+
+def test_invalidation_during_load_skips_store():
+    async def scenario():
+        cache = PrincipalCache(maxsize=10, ttl=60)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def load(token):
+            started.set()
+            await release.wait()
+            return principal()
+
+        pending = asyncio.ensure_future(cache.get_or_load('token', load))
+        await started.wait()
+        # 조회 중에 프로필이 바뀌면 읽어 온 (이전) 사용자 정보는 캐시하지 않음
+        cache.invalidate_user('a@x.com')
+        release.set()
+        return cache, await pending
+
+    cache, result = asyncio.run(scenario())
+    assert result is not None
+    assert cache.get('token') is None
+
+
+def test_invalidate_user_drops_all_tokens_of_user():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    cache.put('token-1', *principal('a@x.com'))
+    cache.put('token-2', *principal('a@x.com'))
+    cache.put('token-3', *principal('b@x.com'))
+
+    cache.invalidate_user('a@x.com')
+
+    assert cache.get('token-1') is None and cache.get('token-2') is None
+    assert cache.get('token-3')[1].email == 'b@x.com'
+
+
+def test_expired_token_is_not_stored():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    cache.put('token', *principal(exp=time.time() - 1))
+    assert cache.get('token') is None
+
+
+def test_entry_does_not_outlive_token_exp():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    cache.put('token', *principal(exp=time.time() + 0.05))
+    assert cache.get('token') is not None
+    time.sleep(0.1)
+    assert cache.get('token') is None
+
+
+def test_cancelled_waiter_does_not_cancel_shared_load():
+    async def scenario():
+        cache = PrincipalCache(maxsize=10, ttl=60)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def load(token):
+            started.set()
+            await release.wait()
+            return principal()
+
+        cancelled = asyncio.ensure_future(cache.get_or_load('token', load))
+        waiting = asyncio.ensure_future(cache.get_or_load('token', load))
+        await started.wait()
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(cancelled, waiting, return_exceptions=True)
+        return cache, results
+
+    cache, results = asyncio.run(scenario())
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1][1].email == 'a@x.com'
+    assert cache.get('token') is not None
@@ -0,0 +1,177 @@
+# test_rate_limit.py
+# 구글 API 속도 제한 (app.core.rate_limit) - AIMD 대기열 넘겨주기/취소, Retry-After 반영
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from app.core.rate_limit import AIMDLimiter, GoogleRateLimiter, RetryPolicy, TokenBucket
+
+
+class RecordingLimiter(GoogleRateLimiter):
+    # 재시도 대기 시간을 기록만 하고 기다리지 않음
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delays = []
+
+    async def _wait(self, delay: float):
+        self.counters['retries'] += 1
+        self.delays.append(delay)
+
+
+def make_limiter(max_attempts: int = 3, max_delay: float = 30.0) -> RecordingLimiter:
+    return RecordingLimiter(
+        TokenBucket(rate=1000, capacity=1000),
+        user_rate=1000,
+        user_burst=1000,
+        concurrency=AIMDLimiter(initial=4, minimum=1, maximum=8),
+        retry=RetryPolicy(max_attempts=max_attempts, base_delay=0.01, max_delay=max_delay),
+    )
+
+
+def rate_limited(reason: str, retry_after: str = None) -> httpx.Response:
+    headers = {'Retry-After': retry_after} if retry_after is not None else {}
+    if reason == 'tooManyRequests':
+        return httpx.Response(429, headers=headers)
+    return httpx.Response(403, headers=headers, json={'error': {'errors': [{'reason': reason}]}})
+
+
+def send(limiter: GoogleRateLimiter, responses: list, method: str = 'GET', **kwargs):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses.pop(0)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await limiter.request(client, method, 'https://www.googleapis.com/calendar/v3/test', **kwargs)
+
+    return asyncio.run(scenario()), requests
+
+
+def test_waiters_get_slots_in_arrival_order():
+    async def scenario():
+        limiter = AIMDLimiter(initial=1, minimum=1, maximum=1)
+        await limiter.acquire()
+        order = []
+
+        async def worker(name):
+            await limiter.acquire()
+            order.append(name)
+
+        tasks = [asyncio.ensure_future(worker(name)) for name in 'abc']
+        await asyncio.sleep(0)
+        for _ in range(3):
+            limiter.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order, limiter.in_flight
+
+    order, in_flight = asyncio.run(scenario())
+    assert order == ['a', 'b', 'c']
+    assert in_flight == 1
+
+
+def test_cancelled_waiter_leaves_queue():
+    async def scenario():
+        limiter = AIMDLimiter(initial=1, minimum=1, maximum=1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        queued = len(limiter._waiters)
+        limiter.release()
+        return queued, limiter.in_flight
+
+    queued, in_flight = asyncio.run(scenario())
+    assert queued == 0
+    assert in_flight == 0
+
+
+def test_waiter_cancelled_after_handoff_returns_slot():
+    async def scenario():
+        limiter = AIMDLimiter(initial=1, minimum=1, maximum=1)
+        await limiter.acquire()
+        cancelled = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        next_waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        # 자리를 넘겨받았지만 실행되기 전에 취소 -> 다음 대기자에게 넘어가야 함
+        limiter.release()
+        cancelled.cancel()
+        results = await asyncio.gather(cancelled, next_waiter, return_exceptions=True)
+        return results, limiter.in_flight
+
+    results, in_flight = asyncio.run(scenario())
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1] is None
+    assert in_flight == 1
+
+
+def test_throttle_halves_limit_once_per_cooldown():
+    limiter = AIMDLimiter(initial=8, minimum=1, maximum=16, cooldown=1.0)
+    limiter.on_throttle(now=10.0)
+    limiter.on_throttle(now=10.5)
+    assert limiter.limit == 4
+    limiter.on_throttle(now=11.5)
+    assert limiter.limit == 2
+    limiter.on_success()
+    assert limiter.limit == 2.5
+
+
+def test_bucket_pause_delays_next_token():
+    bucket = TokenBucket(rate=10, capacity=10)
+    bucket.pause(2.0, now=bucket.updated)
+    assert abs(bucket.reserve(now=bucket.updated) - 2.1) < 1e-9
+
+
+def test_retry_after_seconds_and_http_date():
+    assert RetryPolicy.retry_after(httpx.Response(429, headers={'Retry-After': '3'})) == 3.0
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+    assert 55 < RetryPolicy.retry_after(httpx.Response(429, headers={'Retry-After': later})) <= 60
+    assert RetryPolicy.retry_after(httpx.Response(429)) is None
+
+
+def test_rate_limited_response_waits_retry_after_and_pauses_project_bucket():
+    limiter = make_limiter()
+    response, requests = send(limiter, [rate_limited('rateLimitExceeded', '2'), httpx.Response(200, json={})])
+
+    assert response.status_code == 200
+    assert len(requests) == 2
+    assert limiter.delays and limiter.delays[0] >= 2.0
+    # 같은 할당량을 쓰는 다음 요청도 Retry-After 동안은 토큰을 받지 못함
+    assert limiter.project_bucket.tokens < 0
+    assert limiter.counters['throttled'] == 1 and limiter.counters['retries'] == 1
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_user_rate_limit_pauses_only_user_bucket():
+    limiter = make_limiter()
+    headers = {'Authorization': 'Bearer user-token'}
+    response, _ = send(limiter, [rate_limited('userRateLimitExceeded', '1'), httpx.Response(200, json={})], headers=headers)
+
+    assert response.status_code == 200
+    assert limiter._user_buckets['Bearer user-token'].tokens < 0
+    assert limiter.project_bucket.tokens > 0
+
+
+def test_retry_after_longer_than_max_delay_is_not_retried():
+    limiter = make_limiter(max_delay=5.0)
+    response, requests = send(limiter, [rate_limited('tooManyRequests', '60')])
+
+    assert response.status_code == 429
+    assert len(requests) == 1
+    assert limiter.counters['gave_up'] == 1
+
+
+def test_server_error_retried_only_for_idempotent_requests():
+    limiter = make_limiter()
+    response, requests = send(limiter, [httpx.Response(503), httpx.Response(200, json={})])
+    assert response.status_code == 200 and len(requests) == 2
+
+    limiter = make_limiter()
+    response, requests = send(limiter, [httpx.Response(503)], method='POST')
+    assert response.status_code == 503 and len(requests) == 1
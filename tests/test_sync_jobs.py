@@ -0,0 +1,262 @@
+# test_sync_jobs.py
+# 동기화 작업 큐 (app.core.sync_jobs) - 대기 중 작업 합치기, 사용자별 순차 실행, 실패 기록
+import asyncio
+
+import pytest
+
+from app.core.sync_jobs import (
+    FAILED,
+    QUEUED,
+    SUCCEEDED,
+    InMemorySyncJobBackend,
+    SyncJobBackend,
+    SyncJobManager,
+)
+
+
+def make_manager(workers: int = 2) -> SyncJobManager:
+    return SyncJobManager(InMemorySyncJobBackend(retention=60, max_records=100), workers=workers)
+
+
+async def wait_finished(*jobs, timeout: float = 2.0):
+    async def poll():
+        while any(job.status not in (SUCCEEDED, FAILED) for job in jobs):
+            await asyncio.sleep(0.001)
+    await asyncio.wait_for(poll(), timeout)
+
+
+async def noop(job):
+    return {}
+
+
+def test_backend_requires_all_methods():
+    class PartialBackend(SyncJobBackend):
+        async def enqueue(self, job):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialBackend()
+
+
+def test_submit_returns_queued_job_for_same_user_and_kind():
+    async def scenario():
+        manager = make_manager()
+        manager.register('events', noop)
+        manager.register('calendar', noop)
+        first = await manager.submit('events', 'a@x.com', {'calendar_ids': ['c1']}, {'refresh_token': 'old'})
+        second = await manager.submit('events', 'a@x.com', {'calendar_ids': ['c2', 'c1'], 'full_sync': True}, {'refresh_token': 'new'})
+        other_user = await manager.submit('events', 'b@x.com')
+        other_kind = await manager.submit('calendar', 'a@x.com')
+        return manager, first, second, other_user, other_kind
+
+    manager, first, second, other_user, other_kind = asyncio.run(scenario())
+    assert second is first
+    assert first.status == QUEUED
+    # 목록 옵션은 합집합, 전체 동기화 요청은 대기 중인 작업에 반영
+    assert first.options == {'calendar_ids': ['c1', 'c2'], 'full_sync': True}
+    assert first.credentials == {'refresh_token': 'new'}
+    assert other_user is not first and other_kind is not first
+    assert manager.backend.pending() == 3
+
+
+def test_submit_after_job_started_queues_new_job():
+    async def scenario():
+        manager = make_manager()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def handler(job):
+            started.set()
+            await release.wait()
+            return {}
+
+        manager.register('events', handler)
+        await manager.start()
+        try:
+            running = await manager.submit('events', 'a@x.com')
+            await asyncio.wait_for(started.wait(), 1)
+            queued = await manager.submit('events', 'a@x.com')
+            release.set()
+            await wait_finished(running, queued)
+            return running, queued
+        finally:
+            await manager.stop()
+
+    running, queued = asyncio.run(scenario())
+    assert queued is not running
+    assert running.status == SUCCEEDED and queued.status == SUCCEEDED
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(make_manager().submit('unknown', 'a@x.com'))
+
+
+def test_same_user_jobs_run_one_at_a_time():
+    async def scenario():
+        manager = make_manager(workers=4)
+        active = {}
+        peak = {}
+
+        async def handler(job):
+            active[job.user_email] = active.get(job.user_email, 0) + 1
+            peak[job.user_email] = max(peak.get(job.user_email, 0), active[job.user_email])
+            await asyncio.sleep(0.01)
+            active[job.user_email] -= 1
+            return {}
+
+        for kind in ('calendar', 'events', 'calendar_events'):
+            manager.register(kind, handler)
+        await manager.start()
+        try:
+            jobs = [await manager.submit(kind, email) for email in ('a@x.com', 'b@x.com') for kind in ('calendar', 'events', 'calendar_events')]
+            await wait_finished(*jobs)
+            return peak, manager.stats()
+        finally:
+            await manager.stop()
+
+    peak, stats = asyncio.run(scenario())
+    assert peak == {'a@x.com': 1, 'b@x.com': 1}
+    # 끝난 사용자의 락은 정리
+    assert stats['running_users'] == 0
+
+
+def test_waiting_user_jobs_do_not_hold_workers():
+    async def scenario():
+        manager = make_manager(workers=2)
+        release = asyncio.Event()
+        started = []
+
+        async def handler(job):
+            started.append((job.user_email, job.kind))
+            if job.user_email == 'a@x.com':
+                await release.wait()
+            return {}
+
+        for kind in ('calendar', 'events', 'calendar_events'):
+            manager.register(kind, handler)
+        await manager.start()
+        try:
+            first = await manager.submit('calendar', 'a@x.com')
+            waiting = [await manager.submit(kind, 'a@x.com') for kind in ('events', 'calendar_events')]
+            other = await manager.submit('events', 'b@x.com')
+            # a 의 작업이 끝나지 않아도 b 의 작업은 남은 워커에서 실행됨
+            await wait_finished(other)
+            statuses = [job.status for job in waiting]
+            # 시작 전인 작업에는 같은 요청이 계속 합쳐짐
+            merged = await manager.submit('events', 'a@x.com', {'full_sync': True})
+            release.set()
+            await wait_finished(first, *waiting)
+            return started, statuses, merged is waiting[0], waiting[0].options
+        finally:
+            await manager.stop()
+
+    started, statuses, merged, options = asyncio.run(scenario())
+    assert statuses == [QUEUED, QUEUED]
+    assert merged and options == {'full_sync': True}
+    assert started == [('a@x.com', 'calendar'), ('b@x.com', 'events'), ('a@x.com', 'events'), ('a@x.com', 'calendar_events')]
+
+
+def test_stop_marks_queued_jobs_failed():
+    async def scenario():
+        manager = make_manager(workers=1)
+        started = asyncio.Event()
+
+        async def handler(job):
+            started.set()
+            await asyncio.sleep(10)
+
+        manager.register('events', handler)
+        manager.register('calendar', handler)
+        await manager.start()
+        running = await manager.submit('events', 'a@x.com')
+        waiting = await manager.submit('calendar', 'a@x.com')
+        queued = await manager.submit('events', 'b@x.com')
+        await asyncio.wait_for(started.wait(), 1)
+        await manager.stop()
+        return running, waiting, queued, await manager.get(queued.id)
+
+    running, waiting, queued, stored = asyncio.run(scenario())
+    assert running.status == FAILED
+    assert waiting.status == FAILED and queued.status == FAILED
+    assert queued.error == "서버 종료로 실행되지 않았습니다" and queued.finished_at is not None
+    assert stored is queued
+
+
+def test_handler_error_marks_job_failed():
+    async def scenario():
+        manager = make_manager()
+
+        async def handler(job):
+            job.progress['calendars_done'] = 1
+            raise RuntimeError("DynamoDB 저장 실패")
+
+        manager.register('events', handler)
+        await manager.start()
+        try:
+            job = await manager.submit('events', 'a@x.com')
+            await wait_finished(job)
+            return job, await manager.get(job.id)
+        finally:
+            await manager.stop()
+
+    job, stored = asyncio.run(scenario())
+    assert job.status == FAILED
+    assert job.error == "DynamoDB 저장 실패"
+    assert job.result is None and job.finished_at is not None
+    assert stored is job
+
+
+def test_stop_marks_running_job_failed():
+    async def scenario():
+        manager = make_manager()
+        started = asyncio.Event()
+
+        async def handler(job):
+            started.set()
+            await asyncio.sleep(10)
+
+        manager.register('events', handler)
+        await manager.start()
+        job = await manager.submit('events', 'a@x.com')
+        await asyncio.wait_for(started.wait(), 1)
+        await manager.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == FAILED
+    assert job.error == "서버 종료로 중단되었습니다"
+
+
+def test_failed_job_backs_off_scheduler():
+    from app.core.sync_scheduler import SyncScheduler
+
+    async def scenario():
+        manager = make_manager()
+
+        async def handler(job):
+            raise RuntimeError("구글 API 오류")
+
+        async def load_users():
+            return {'a@x.com': 'refresh'}
+
+        manager.register('events', handler)
+        scheduler = SyncScheduler(
+            manager, load_users, min_interval=10, max_interval=1000, initial_interval=100,
+            jitter=0, max_inflight=4, tick=1, user_refresh=10000
+        )
+        await manager.start()
+        try:
+            await scheduler.run_once(now=0)
+            assert await scheduler.run_once(now=200) == 1
+            job = await manager.get(scheduler.schedules['a@x.com'].job_id)
+            await wait_finished(job)
+            await scheduler.run_once(now=300)
+            return job, scheduler.schedules['a@x.com']
+        finally:
+            await manager.stop()
+
+    job, schedule = asyncio.run(scenario())
+    assert job.status == FAILED
+    assert schedule.interval == 200
+    assert schedule.next_run == 500
@@ -0,0 +1,210 @@
+# test_widgets.py
+# 대시보드 위젯 집계기 (app.db.widgets) - 정규화 필드 / 이전 아이템 / 열 배열 경로가 기존 함수와 같은 결과를 내는지
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db.event_cache import EventSet
+from app.db.event_items import CALENDAR_LIST_TABLE, EVENT_ITEMS_TABLE, create_event_item, start_key_range
+from app.db.widgets import (
+    CalendarScheduleWidget,
+    CategoryWidget,
+    DayEventCountWidget,
+    SpendingTimeWidget,
+    UpcomingWidget,
+    WeeklyActivityWidget,
+    count_category_distribution,
+    filter_this_week,
+    find_uppcoming_events,
+    process_dated_event,
+    summarize_weekly_activity,
+)
+
+USER = 'a@x.com'
+# 2025-01-08 (수) 12:00 KST
+NOW = datetime(2025, 1, 8, 3, 0, tzinfo=timezone.utc)
+CALENDARS = [
+    {'id': USER, 'summary': '업무', 'description': ''},
+    {'id': 'study', 'summary': '공부', 'description': ''},
+]
+NORMALIZED_FIELDS = ('start_ts', 'end_ts', 'start_day', 'end_day', 'all_day')
+
+
+def timed_event(event_id: str, start: str, end: str, organizer: str = USER, creator: str = USER) -> dict:
+    return {
+        'id': event_id,
+        'summary': event_id,
+        'start': {'dateTime': start},
+        'end': {'dateTime': end},
+        'creator': {'email': creator},
+        'organizer': {'email': organizer, 'displayName': organizer},
+    }
+
+
+def all_day_event(event_id: str, start: str, end: str, organizer: str = USER) -> dict:
+    return {
+        'id': event_id,
+        'summary': event_id,
+        'start': {'date': start},
+        'end': {'date': end},
+        'creator': {'email': USER},
+        'organizer': {'email': organizer, 'displayName': organizer},
+    }
+
+
+EVENTS = {
+    USER: [
+        timed_event('standup', '2025-01-06T09:00:00+09:00', '2025-01-06T09:30:00+09:00'),
+        # KST 로는 이번주 월요일이지만 UTC 로는 지난주 일요일
+        timed_event('early', '2025-01-06T07:00:00+09:00', '2025-01-06T08:00:00+09:00'),
+        timed_event('utc', '2025-01-07T01:00:00Z', '2025-01-07T02:00:00Z'),
+        timed_event('review', '2025-01-08T14:00:00+09:00', '2025-01-08T16:00:00+09:00'),
+        # 자정에 끝나는 일정
+        timed_event('late', '2025-01-09T23:00:00+09:00', '2025-01-10T00:00:00+09:00'),
+        all_day_event('offsite', '2025-01-09', '2025-01-10'),
+        timed_event('past', '2025-01-02T10:00:00+09:00', '2025-01-02T11:00:00+09:00'),
+        timed_event('next-week', '2025-01-15T10:00:00+09:00', '2025-01-15T11:00:00+09:00'),
+    ],
+    'study': [
+        timed_event('reading', '2025-01-07T20:00:00+09:00', '2025-01-07T21:00:00+09:00', organizer='study'),
+        timed_event('seminar', '2025-01-10T10:00:00+09:00', '2025-01-10T12:00:00+09:00', organizer='study', creator='b@x.com'),
+        all_day_event('trip', '2025-01-03', '2025-01-06', organizer='study'),
+        timed_event('last-week', '2025-01-01T10:00:00+09:00', '2025-01-01T11:00:00+09:00', organizer='study'),
+    ],
+}
+
+
+def event_items(normalized: bool = True) -> list:
+    items = [
+        create_event_item(USER, calendar_id, event)
+        for calendar_id, events in EVENTS.items()
+        for event in events
+    ]
+    if not normalized:
+        # 시각 필드를 저장하기 전에 동기화된 이전 아이템
+        items = [{key: value for key, value in item.items() if key not in NORMALIZED_FIELDS} for item in items]
+    return sorted(items, key=lambda item: item['start_key'])
+
+
+def source_items(widget, items: list) -> list:
+    if widget.source == 'creator':
+        return [item for item in items if item.get('creator_email') == widget.user_email]
+    return items
+
+
+def feed(widget, items: list):
+    # app.db.dynamo._feed_widgets_from 처럼 위젯 구간에 시작하는 아이템만 start_key 순으로 넘김
+    lower, upper = start_key_range(*widget.window())
+    for item in source_items(widget, items):
+        if (lower is None or item['start_key'] >= lower) and (upper is None or item['start_key'] <= upper):
+            widget.add(item)
+    return widget.result()
+
+
+def feed_columns(widget, items: list):
+    # 메모리 캐시 경로: 열 배열로 한 번에 집계 (add_columns 가 없는 위젯은 아이템 단위)
+    events = EventSet(None, None, source_items(widget, items))
+    start, stop = events.index_range(*start_key_range(*widget.window()))
+    if hasattr(widget, 'add_columns'):
+        widget.add_columns(events.columns, start, stop)
+    else:
+        for index in range(start, stop):
+            widget.add(events.items[index])
+    return widget.result()
+
+
+PATHS = {
+    'normalized': lambda widget: feed(widget, event_items()),
+    'legacy': lambda widget: feed(widget, event_items(normalized=False)),
+    'columns': lambda widget: feed_columns(widget, event_items()),
+    'columns-legacy': lambda widget: feed_columns(widget, event_items(normalized=False)),
+}
+
+
+@pytest.fixture(params=list(PATHS))
+def path(request):
+    return PATHS[request.param]
+
+
+def test_spending_time_matches_filter_this_week(path):
+    expected = {calendar['summary']: filter_this_week(EVENTS[calendar['id']], NOW) for calendar in CALENDARS}
+
+    assert path(SpendingTimeWidget(CALENDARS, NOW)) == expected
+    assert expected == {'업무': 330.0, '공부': 180.0}
+
+
+def test_day_event_count_counts_last_week_by_start_date(path):
+    assert path(DayEventCountWidget(CALENDARS, NOW)) == {
+        'Monday': 0, 'Tuesday': 0, 'Wednesday': 1, 'Thursday': 1, 'Friday': 1, 'Saturday': 0, 'Sunday': 0,
+    }
+
+
+@pytest.mark.parametrize('k', [1, 3, 5, 10])
+def test_upcoming_matches_find_uppcoming_events(path, k):
+    expected = find_uppcoming_events(list(EVENTS.values()), NOW, k)
+
+    assert path(UpcomingWidget(CALENDARS, NOW, k)) == expected
+
+
+def test_categories_match_count_category_distribution(path):
+    widget = CategoryWidget(CALENDARS, NOW)
+    # 기존 경로: 이번주(UTC)에 시작하는 시간 지정 일정
+    weekly_events = [
+        event
+        for events in EVENTS.values()
+        for event in events
+        if widget.this_week_start <= datetime.fromisoformat(event['start'].get('dateTime', '1970-01-01T00:00:00+00:00').replace('Z', '+00:00')) <= widget.this_week_end
+    ]
+    expected = count_category_distribution(CALENDARS, weekly_events)
+
+    assert path(widget) == expected
+    assert [(entry['category'], entry['entry_number']) for entry in expected] == [(USER, 4), ('study', 2)]
+
+
+def test_weekly_activity_matches_summarize_weekly_activity(path):
+    widget = WeeklyActivityWidget(USER, NOW)
+    # 기존 경로: 사용자가 만든 일정 중 시작 날짜가 이번주(UTC 월~토)인 일정
+    created = []
+    for item in source_items(widget, event_items()):
+        processed, event_date = process_dated_event(item['event'])
+        if processed is not None and widget.week_start <= event_date <= widget.week_end:
+            created.append(processed)
+    expected = summarize_weekly_activity(created, USER)
+
+    assert path(widget) == expected
+    assert [day['day'] for day in expected['this_week']] == [0, 1, 2, 3]
+
+
+def test_calendar_schedule_matches_process_dated_event(path):
+    widget = CalendarScheduleWidget(CALENDARS, NOW)
+    expected = []
+    for item in event_items():
+        processed, event_date = process_dated_event(item['event'])
+        if processed is not None and widget.month_start <= event_date <= widget.month_end:
+            expected.append(processed)
+
+    assert path(widget)['events'] == expected
+    # 원본 아이템은 바꾸지 않음
+    assert all('date' not in event['start'] for events in EVENTS.values() for event in events if 'dateTime' in event['start'])
+
+
+def test_dashboard_from_cache_matches_dynamodb_path(dynamo_tables):
+    from app.db import dynamo
+    from app.db.event_cache import event_cache
+
+    dynamo_tables[CALENDAR_LIST_TABLE].put_item(Item={'user_id': USER, 'calendar': CALENDARS})
+    for item in event_items():
+        dynamo_tables[EVENT_ITEMS_TABLE].put_item(Item=item)
+
+    widgets = list(dynamo.DASHBOARD_WIDGETS)
+    cached = asyncio.run(dynamo.compute_dashboard_widgets(USER, widgets, NOW))
+    assert event_cache.get(USER).sources['events'] is not None
+
+    # 캐시 없이 DynamoDB 를 범위 조회하는 경로
+    aggregators = dynamo.build_widgets(USER, CALENDARS, widgets, NOW)
+    asyncio.run(dynamo.feed_widgets(USER, list(aggregators.values())))
+    uncached = {widget: aggregator.result() for widget, aggregator in aggregators.items()}
+
+    assert dynamo.rollups.dump_payload(cached) == dynamo.rollups.dump_payload(uncached)
+    assert cached['spending_time'] == {'업무': 330.0, '공부': 180.0}